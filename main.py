@@ -1,52 +1,461 @@
+import argparse
+import secrets
+import uuid
 from pathlib import Path
 
-from src.storage.csv_storage import CsvFleetRepository, CsvGameStateRepository
-# from src.placement.player_setup import ConsoleFleetInput
-from src.placement.bot_setup import RandomFleetGenerator
-from src.validators.fleet_validator import validate_fleet_or_raise
-from src.engine.game_manager import GameManager
-from src.gameplay import run_cli_game
+from src.domain import GameMeta
+from src.ruleset import CLASSIC, RULESETS, Ruleset, get_ruleset
+from src.storage.csv_storage import (
+    CsvFleetRepository, CsvGameMetaRepository, CsvGameStateRepository, SparseCsvGameStateRepository,
+)
+# Placement, validation and rendering are imported lazily where they are used:
+# a warm resume in fast-start mode never needs them.
 
 
 DATA_DIR = Path("data")
 PLAYER_SHIPS = DATA_DIR / "player_ships.csv"
 BOT_SHIPS = DATA_DIR / "bot_ships.csv"
 GAME_STATE = DATA_DIR / "game_state.csv"
+GAME_META = DATA_DIR / "game_meta.csv"
+RESUME_CACHE = DATA_DIR / "resume.snapshot"
+# Persisted turns between fast-start snapshot writes (the snapshot is also written on exit)
+SNAPSHOT_EVERY = 25
+ARCHIVE_DIR = DATA_DIR / "archive"
 
 
 def ensure_dirs():
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     Path("outputs").mkdir(parents=True, exist_ok=True)
 
-def main():
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sea Battle")
+    parser.add_argument(
+        "--fast-start", action="store_true",
+        help="resume from a cached, already validated snapshot when the saved files are unchanged",
+    )
+    parser.add_argument(
+        "--ruleset", default=CLASSIC.name, choices=sorted(RULESETS),
+        help="game variant for a new game (resumed games keep their recorded ruleset)",
+    )
+    parser.add_argument(
+        "--hints", action="store_true",
+        help="show a shot-suggestion heat map on the enemy board",
+    )
+    parser.add_argument(
+        "--replay", type=int, metavar="TURN",
+        help="rebuild the saved game at TURN from its recorded seeds and moves, render it and exit",
+    )
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="with --replay: fail if the seeded bot does not reproduce the recorded shots",
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true",
+        help="play against a bot that learns where you place ships from your earlier games",
+    )
+    parser.add_argument(
+        "--adversarial", action="store_true",
+        help="place the bot fleet from the searched layout library (see --build-fleet-library)",
+    )
+    parser.add_argument(
+        "--build-fleet-library", type=int, metavar="LAYOUTS",
+        help="search LAYOUTS hard-to-sink bot layouts for --ruleset, add them to the library and exit",
+    )
+    parser.add_argument(
+        "--build-opening-book", type=int, metavar="SHOTS",
+        help="precompute the bot's moves for the fog boards of its first SHOTS shots on --ruleset and exit",
+    )
+    parser.add_argument(
+        "--book-entries", type=int, default=50_000,
+        help="with --build-opening-book: most positions kept (the likeliest ones)",
+    )
+    parser.add_argument(
+        "--spectate", type=int, metavar="PORT",
+        help="stream the game live to spectators on 127.0.0.1:PORT (clients send 'text' or 'binary')",
+    )
+    parser.add_argument(
+        "--archive-codec", default="zlib", choices=["zlib", "lzma"],
+        help="compression of the archive finished games are added to",
+    )
+    parser.add_argument(
+        "--list-archive", action="store_true",
+        help="list the archived games (id, ruleset, turns) and exit",
+    )
+    parser.add_argument(
+        "--jsonl", action="store_true",
+        help="headless mode: JSON-lines requests on stdin, responses on stdout (see src/headless.py)",
+    )
+    parser.add_argument(
+        "--simulate", type=int, metavar="GAMES",
+        help="run a checkpointed bot simulation batch of GAMES games (resumes from --checkpoint) and exit",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="with --simulate: master seed of the batch",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="with --simulate: worker processes (games are shared with them through shared memory)",
+    )
+    parser.add_argument(
+        "--checkpoint", type=Path, default=Path("outputs") / "simulation.ckpt",
+        help="with --simulate: checkpoint file",
+    )
+    return parser.parse_args(argv)
+
+
+def saved_ruleset(meta_repo) -> Ruleset:
+    """Ruleset of the saved game; games saved before rulesets were recorded are classic."""
+    if not GAME_META.exists():
+        return CLASSIC
+    return Ruleset.from_meta(meta_repo.load())
+
+
+def state_repository(ruleset: Ruleset):
+    """Full-board rows on normal boards, per-turn deltas on sparse (large) boards."""
+    repo_class = SparseCsvGameStateRepository if ruleset.sparse else CsvGameStateRepository
+    return repo_class(GAME_STATE, board_size=ruleset.board_size)
+
+
+def prior_store(ruleset: Ruleset):
+    from src.storage.prior_store import PlacementPriorStore
+
+    return PlacementPriorStore(DATA_DIR / f"placement_prior_{ruleset.name}.bin")
+
+
+def opening_book_path(ruleset: Ruleset) -> Path:
+    return DATA_DIR / f"opening_book_{ruleset.name}.bin"
+
+
+def build_opening_book(shots: int, entries: int, ruleset: Ruleset) -> None:
+    from src.engine.opening_book import OpeningBook, OpeningBookBuilder
+
+    book, max_cells = OpeningBookBuilder(ruleset, depth=shots, max_entries=entries).build()
+    path = opening_book_path(ruleset)
+    OpeningBook.write(path, ruleset, book, depth=shots, max_cells=max_cells)
+    print(f"{len(book)} positions in {path}")
+
+
+def load_opening_book(ruleset: Ruleset, adaptive: bool = False):
+    """The memory-mapped opening book of `ruleset`, or None when none was built (the adaptive bot plays without)."""
+    path = opening_book_path(ruleset)
+    if adaptive or ruleset.sparse or not path.exists():
+        return None
+    from src.engine.opening_book import OpeningBook
+
+    return OpeningBook.open(path, ruleset)
+
+
+def recorded_opening_book(meta, ruleset: Ruleset, adaptive: bool = False):
+    """
+    The opening book a saved game was played with (`meta.opening_book`), or None.
+    A book rebuilt since then has another id: the bot goes on without a book rather than
+    answering the rest of the game from different moves.
+    """
+    if meta is None or not meta.opening_book:
+        return None
+    book = load_opening_book(ruleset, adaptive)
+    if book is not None and book.book_id != meta.opening_book:
+        print(f"The opening book changed since this game started ({meta.opening_book} -> {book.book_id}); "
+              "the bot continues without one.")
+        return None
+    return book
+
+
+def create_bot_brain(ruleset: Ruleset, seed, adaptive: bool, opening_book=None):
+    """
+    Standard BotBrain (playing `opening_book`, see load_opening_book), or the adaptive one
+    aiming with the stored placement prior (not on sparse boards).
+    """
+    from src.engine.bot_brain import BotBrain
+
+    if not adaptive:
+        return BotBrain(seed=seed, ruleset=ruleset, opening_book=opening_book)
+    if ruleset.sparse:
+        print("The adaptive bot is not available on sparse boards; using the standard bot.")
+        return BotBrain(seed=seed, ruleset=ruleset)
+
+    from src.engine.adaptive_bot import AdaptiveBotBrain
+
+    return AdaptiveBotBrain(prior_store(ruleset).load(ruleset), seed=seed, ruleset=ruleset)
+
+
+def learn_player_fleet(manager, player_repo) -> None:
+    """After a finished game, add the player's fleet to the adaptive bot's prior."""
+    if manager.ruleset.sparse or manager.is_game_over().winner is None:
+        return
+    prior_store(manager.ruleset).record_game(player_repo, manager.ruleset)
+
+
+def run_simulation(games: int, seed: int, checkpoint: Path, ruleset: Ruleset, workers: int = 1) -> None:
+    from src.simulation.batch import SimulationBatch
+
+    batch = SimulationBatch(games, seed, checkpoint_path=checkpoint, ruleset=ruleset, workers=workers)
+    stats = batch.run()
+    print(f"{stats.games} games: {stats.mean:.2f} shots on average "
+          f"(sd {stats.stdev:.2f}, min {stats.min_shots}, max {stats.max_shots})")
+
+
+def fleet_library_repository(ruleset: Ruleset):
+    from src.storage.csv_storage import CsvFleetLibraryRepository
+
+    return CsvFleetLibraryRepository(DATA_DIR / f"fleet_library_{ruleset.name}.csv")
+
+
+def build_fleet_library(layouts: int, ruleset: Ruleset) -> None:
+    from src.placement.adversarial import AdversarialPlacementSearch
+
+    repo = fleet_library_repository(ruleset)
+    library = repo.load() if repo.file_path.exists() else []
+    library = AdversarialPlacementSearch(ruleset).build_library(layouts, library=library)
+    repo.save(library)
+    print(f"{len(library)} layouts in {repo.file_path}, best: {library[0].score:.2f} shots to sink")
+
+
+def bot_fleet_generator(ruleset: Ruleset, seed: int, adversarial: bool):
+    """Blind random placement, or a lookup in the searched layout library."""
+    from src.placement.bot_setup import LibraryFleetGenerator, RandomFleetGenerator
+
+    if adversarial:
+        repo = fleet_library_repository(ruleset)
+        if repo.file_path.exists():
+            return LibraryFleetGenerator(repo.load(), seed=seed, ruleset=ruleset)
+        print(f"No fleet library at {repo.file_path} (see --build-fleet-library); placing the bot fleet randomly.")
+    return RandomFleetGenerator(seed=seed, ruleset=ruleset)
+
+
+def recorded_bot_fleet(meta: GameMeta):
+    """The bot fleet `meta` says the game started with: its library layout, or generated from fleet_seed."""
+    from src.placement.bot_setup import LibraryFleetGenerator, RandomFleetGenerator
+
+    ruleset = Ruleset.from_meta(meta)
+    if not meta.fleet_library:
+        return RandomFleetGenerator(seed=meta.fleet_seed, ruleset=ruleset).generate()
+    repo = fleet_library_repository(ruleset)
+    generator = LibraryFleetGenerator(repo.load() if repo.file_path.exists() else [], ruleset=ruleset)
+    if generator.library_id != meta.fleet_library:
+        raise ValueError(f"Bot fleet came from fleet library {meta.fleet_library}, which is not available to verify against")
+    return generator.fleet_for(meta.fleet_layout, meta.fleet_transform)
+
+
+def start_spectator_server(manager, port: int):
+    from src.ui.spectator import SpectatorServer
+
+    server = SpectatorServer(manager, port=port)
+    server.start()
+    print(f"Spectators: connect to 127.0.0.1:{server.port} and send a 'text' or 'binary' line.")
+    return server
+
+
+def archive_finished_game(manager, meta, codec: str) -> None:
+    """
+    Appends a finished game's files to the archive. Done as the game ends, while the files on disk
+    (player_ships.csv included) still are the ones it was played with.
+    """
+    if meta is None or manager.is_game_over().winner is None:
+        return  # unfinished (it can still be resumed), or saved before games had ids
+    from src.storage.game_archive import GameArchive
+
+    paths = {path.name: path for path in (GAME_META, PLAYER_SHIPS, BOT_SHIPS, GAME_STATE)}
+    GameArchive(ARCHIVE_DIR, codec=codec).append_files(meta.game_id, paths)
+
+
+def list_archive() -> None:
+    from src.storage.game_archive import GameArchive
+
+    games = 0
+    for game in GameArchive(ARCHIVE_DIR).iter_games():
+        print(f"{game.game_id}  {game.meta().ruleset:<10}  {game.state().turn_number} turns")
+        games += 1
+    print(f"{games} archived games in {ARCHIVE_DIR}")
+
+
+def load_resumed_game(meta, player_repo, bot_repo, state_repo, ruleset: Ruleset, bot_brain, fast_start: bool):
+    """
+    GameManager of the saved game, with `bot_brain` brought to where the bot stood after the last saved turn.
+
+    A brain seeded from `meta` is fast-forwarded through the recorded turns (ReplayEngine), so its RNG,
+    targeting and hunt index match the record and the rest of the game stays reproducible. Games saved
+    before seeds were recorded (no meta) continue with `bot_brain` as it is.
+    """
+    from src.engine.game_manager import GameManager
+
+    cache = None
+    if fast_start:
+        cache = resume_snapshot_cache()
+        cached = cache.load()
+        if cached is not None:
+            player_fleet, bot_fleet, state, brain_state = cached
+            bot_brain.restore_state(brain_state)
+            return GameManager.from_loaded_state(player_fleet, bot_fleet, state, bot_brain=bot_brain, ruleset=ruleset)
+
+    from src.validators.fleet_validator import validate_fleet_or_raise
+
+    player_fleet = player_repo.load()
+    bot_fleet = bot_repo.load()
+    state = state_repo.load()
+
+    validate_fleet_or_raise(player_fleet, ruleset)
+    validate_fleet_or_raise(bot_fleet, ruleset)
+
+    if meta is None:
+        manager = GameManager.from_loaded_state(player_fleet, bot_fleet, state, bot_brain=bot_brain, ruleset=ruleset)
+    else:
+        from src.engine.replay import ReplayEngine
+
+        turns = state.turn_history
+        engine = ReplayEngine(meta, player_fleet, bot_fleet, turns, snapshot_every=len(turns) + 1,
+                              bot_brain=bot_brain)
+        engine.seek(len(turns))
+        manager = engine.manager
+
+    if cache is not None:
+        save_resume_snapshot(manager)
+    return manager
+
+
+def resume_snapshot_cache():
+    """
+    The fast-start snapshot, keyed by every file the resumed game is built from.
+    The meta is one of them: it picks the ruleset, seeds and opening book the cached brain state belongs to.
+    """
+    from src.storage.snapshot_cache import ResumeSnapshotCache
+
+    return ResumeSnapshotCache(RESUME_CACHE, [GAME_META, PLAYER_SHIPS, BOT_SHIPS, GAME_STATE])
+
+
+def save_resume_snapshot(manager) -> None:
+    """
+    Refresh the fast-start snapshot so the next process resumes warm.
+    Only called when the manager holds exactly what the CSV files record.
+    """
+    if not all(path.exists() for path in (GAME_META, PLAYER_SHIPS, BOT_SHIPS, GAME_STATE)):
+        return
+    resume_snapshot_cache().save(
+        (manager.player_fleet, manager.bot_fleet, manager.state, manager.bot_brain.snapshot_state())
+    )
+
+
+class ResumeSnapshotWriter:
+    """
+    Keeps the fast-start snapshot close to the saved files without pickling the game on every turn:
+    it is written every `every` persisted turns and once more on exit. The exit write is skipped
+    when the game was interrupted mid-turn (shots that were never persisted), so the snapshot
+    never gets ahead of the files it is keyed by.
+    """
+
+    def __init__(self, every: int = SNAPSHOT_EVERY):
+        self.every = every
+        self._persisted = None  # progress after the last persisted turn
+        self._written = None
+
+    def turn_saved(self, manager) -> None:
+        self._persisted = self._progress(manager)
+        if manager.state.turn_number % self.every == 0:
+            self._write(manager)
+
+    def close(self, manager) -> None:
+        progress = self._progress(manager)
+        if self._persisted == progress and self._written != progress:
+            self._write(manager)
+
+    def _write(self, manager) -> None:
+        save_resume_snapshot(manager)
+        self._written = self._progress(manager)
+
+    @staticmethod
+    def _progress(manager):
+        state = manager.state
+        return state.turn_number, len(state.player_view.shots), len(state.bot_view.shots)
+
+
+def run_replay(turn: int, verify: bool, meta_repo, player_repo, bot_repo, state_repo) -> None:
+    from src.engine.replay import ReplayEngine
+    from src.ui.console_renderer import ConsoleRenderer
+
+    meta = meta_repo.load()
+    if verify:
+        # Ships compared as cell sets: the fleet CSV does not keep the order of a ship's cells
+        recorded = [ship.cell_set() for ship in recorded_bot_fleet(meta).ships]
+        if recorded != [ship.cell_set() for ship in bot_repo.load().ships]:
+            raise ValueError("bot_ships.csv is not the fleet recorded in game_meta.csv")
+    opening_book = load_opening_book(Ruleset.from_meta(meta)) if meta.opening_book else None
+    engine = ReplayEngine.from_repositories(meta_repo, player_repo, bot_repo, state_repo, verify=verify,
+                                            opening_book=opening_book)
+    state = engine.seek(turn)
+    ConsoleRenderer(engine.manager.ruleset).render(state, engine.manager.player_fleet)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.jsonl:
+        from src.headless import run_jsonl
+
+        run_jsonl()
+        return
+
     ensure_dirs()
 
+    if args.build_fleet_library is not None:
+        build_fleet_library(args.build_fleet_library, get_ruleset(args.ruleset))
+        return
+
+    if args.build_opening_book is not None:
+        build_opening_book(args.build_opening_book, args.book_entries, get_ruleset(args.ruleset))
+        return
+
+    if args.list_archive:
+        list_archive()
+        return
+
+    if args.simulate is not None:
+        run_simulation(args.simulate, args.seed, args.checkpoint, get_ruleset(args.ruleset), args.workers)
+        return
+
     player_repo = CsvFleetRepository(PLAYER_SHIPS)
     bot_repo = CsvFleetRepository(BOT_SHIPS)
-    state_repo = CsvGameStateRepository(GAME_STATE)
+    meta_repo = CsvGameMetaRepository(GAME_META)
+
+    if args.replay is not None:
+        state_repo = state_repository(saved_ruleset(meta_repo))
+        run_replay(args.replay, args.verify, meta_repo, player_repo, bot_repo, state_repo)
+        return
 
     resume_available = GAME_STATE.exists() and PLAYER_SHIPS.exists() and BOT_SHIPS.exists()
-    
+
     if resume_available:
         answer = input("Resume saved game? (y/n): ").strip().lower()
     else:
         answer = "n"
 
+    from src.engine.game_manager import GameManager
+    from src.gameplay import run_cli_game
+
     if answer == "y":
-        player_fleet = player_repo.load()
-        bot_fleet = bot_repo.load()
-        state = state_repo.load()
-
-        validate_fleet_or_raise(player_fleet)
-        validate_fleet_or_raise(bot_fleet)
-
-        manager = GameManager.from_loaded_state(
-            player_fleet=player_fleet,
-            bot_fleet=bot_fleet,
-            loaded_state=state,
-        )
+        ruleset = saved_ruleset(meta_repo)
+        state_repo = state_repository(ruleset)
+        meta = meta_repo.load() if GAME_META.exists() else None
+        # The bot continues from the recorded seed, so the shots after a resume can be replayed too
+        bot_brain = create_bot_brain(ruleset, seed=meta.bot_seed if meta is not None else None,
+                                     adaptive=args.adaptive,
+                                     opening_book=recorded_opening_book(meta, ruleset, args.adaptive))
+        manager = load_resumed_game(meta, player_repo, bot_repo, state_repo, ruleset, bot_brain,
+                                    fast_start=args.fast_start)
         print("Loaded saved game.")
-        run_cli_game(manager, state_repo=state_repo, resume=True)
+        spectators = start_spectator_server(manager, args.spectate) if args.spectate is not None else None
+        snapshots = ResumeSnapshotWriter() if args.fast_start else None
+        try:
+            run_cli_game(manager, state_repo=state_repo, resume=True, show_hints=args.hints,
+                         on_turn_saved=snapshots.turn_saved if snapshots is not None else None)
+            archive_finished_game(manager, meta, args.archive_codec)
+            if args.adaptive:
+                learn_player_fleet(manager, player_repo)
+        finally:
+            if snapshots is not None:
+                snapshots.close(manager)
+            if spectators is not None:
+                spectators.stop()
         return
 
     # NEW GAME (player fleet must be loaded from CSV)
@@ -55,19 +464,60 @@ def main():
         print("Format: ship_id,row,col (see README).")
         return
 
+    from src.placement.bot_setup import LibraryFleetGenerator
+    from src.validators.fleet_validator import validate_fleet_or_raise
+
+    ruleset = get_ruleset(args.ruleset)
+    state_repo = state_repository(ruleset)
+
     player_fleet = player_repo.load()
-    validate_fleet_or_raise(player_fleet)
+    validate_fleet_or_raise(player_fleet, ruleset)
     # bot_repo.save(bot_fleet)
-    
-    bot_fleet = RandomFleetGenerator().generate()
-    validate_fleet_or_raise(bot_fleet)
+
+    # Seeds, rules and the bot's opening book are recorded so the game can be replayed exactly
+    opening_book = load_opening_book(ruleset, args.adaptive)
+    meta = GameMeta(
+        game_id=uuid.uuid4().hex,
+        bot_seed=secrets.randbits(32),
+        fleet_seed=secrets.randbits(32),
+        ruleset=ruleset.name,
+        board_size=ruleset.board_size,
+        ship_sizes=list(ruleset.ship_sizes),
+        allow_touching=ruleset.allow_touching,
+        salvo=ruleset.salvo,
+        opening_book=opening_book.book_id if opening_book is not None else "",
+    )
+    generator = bot_fleet_generator(ruleset, meta.fleet_seed, args.adversarial)
+    bot_fleet = generator.generate()
+    validate_fleet_or_raise(bot_fleet, ruleset)
+    if isinstance(generator, LibraryFleetGenerator) and generator.last_pick is not None:
+        meta.fleet_library = generator.library_id
+        meta.fleet_layout, meta.fleet_transform = generator.last_pick
+    meta_repo.save(meta)
     bot_repo.save(bot_fleet)
 
-    manager = GameManager(player_fleet=player_fleet, bot_fleet=bot_fleet)
+    manager = GameManager(
+        player_fleet=player_fleet,
+        bot_fleet=bot_fleet,
+        bot_brain=create_bot_brain(ruleset, seed=meta.bot_seed, adaptive=args.adaptive, opening_book=opening_book),
+        ruleset=ruleset,
+    )
 
     # Start a fresh game_state.csv for a new game
     state_repo.init_new(manager.state)
-    run_cli_game(manager, state_repo=state_repo, resume=False)
+    spectators = start_spectator_server(manager, args.spectate) if args.spectate is not None else None
+    snapshots = ResumeSnapshotWriter() if args.fast_start else None
+    try:
+        run_cli_game(manager, state_repo=state_repo, resume=False, show_hints=args.hints,
+                     on_turn_saved=snapshots.turn_saved if snapshots is not None else None)
+        archive_finished_game(manager, meta, args.archive_codec)
+        if args.adaptive:
+            learn_player_fleet(manager, player_repo)
+    finally:
+        if snapshots is not None:
+            snapshots.close(manager)
+        if spectators is not None:
+            spectators.stop()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,224 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.domain import Coordinate, Fleet, ShotOutcome, TurnSide, coordinate_table, moves_of
+from src.ruleset import CLASSIC, RULESETS, Ruleset
+from src.storage.base import FleetRepository, GameStateRepository
+from src.storage.csv_storage import CsvFleetRepository, CsvGameStateRepository, SparseCsvGameStateRepository
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, see require_numpy()
+    np = None
+
+MAP_NAMES = ("occupancy", "first_hit", "misses", "sunk_turn_sum", "sunk_count")
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError(
+            "Heat-map analytics need NumPy: install it with `poetry install -E analytics` (or `pip install numpy`)."
+        )
+    return np
+
+
+class HeatMaps:
+    """
+    Per-cell counters over a corpus of fleets and games, one flat int64 array of
+    board_size^2 cells (row-major) per map:
+    - occupancy: fleets with a ship on the cell
+    - first_hit: games whose first hit landed on the cell
+    - misses: misses on the cell
+    - sunk_turn_sum / sunk_count: turn at which the ship covering the cell was sunk
+    Partial results (e.g. from parallel workers) combine with merge().
+    """
+
+    def __init__(self, board_size: int, maps: Optional[Dict[str, "np.ndarray"]] = None,
+                 fleets: int = 0, games: int = 0):
+        require_numpy()
+        self.board_size = board_size
+        area = board_size * board_size
+        self.maps = {name: np.zeros(area, dtype=np.int64) for name in MAP_NAMES}
+        for name, values in (maps or {}).items():
+            if name not in self.maps or values.shape != (area,):
+                raise ValueError(f"Bad heat map {name!r} for a {board_size}x{board_size} board")
+            self.maps[name] = values.astype(np.int64, copy=False)
+        self.fleets = fleets
+        self.games = games
+
+    def merge(self, other: "HeatMaps") -> "HeatMaps":
+        """Adds `other` into this one (in place) and returns self."""
+        if other.board_size != self.board_size:
+            raise ValueError(f"Cannot merge {other.board_size}x{other.board_size} maps into {self.board_size}x{self.board_size}")
+        for name in MAP_NAMES:
+            self.maps[name] += other.maps[name]
+        self.fleets += other.fleets
+        self.games += other.games
+        return self
+
+    @classmethod
+    def merged(cls, parts: Iterable["HeatMaps"]) -> "HeatMaps":
+        parts = iter(parts)
+        first = next(parts, None)
+        if first is None:
+            raise ValueError("Nothing to merge")
+        result = cls(first.board_size, {name: values.copy() for name, values in first.maps.items()},
+                     fleets=first.fleets, games=first.games)
+        for part in parts:
+            result.merge(part)
+        return result
+
+    def grid(self, name: str) -> "np.ndarray":
+        """A map as a (board_size, board_size) view."""
+        return self.maps[name].reshape(self.board_size, self.board_size)
+
+    def mean_sunk_turn(self) -> "np.ndarray":
+        """Average sinking turn per cell (NaN where no ship was ever sunk)."""
+        counts = self.maps["sunk_count"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, self.maps["sunk_turn_sum"] / counts, np.nan)
+
+    def cells(self, name: str) -> Dict[Coordinate, float]:
+        """Non-zero cells of a map ("mean_sunk_turn" is accepted as well)."""
+        values = self.mean_sunk_turn() if name == "mean_sunk_turn" else self.maps[name]
+        table = coordinate_table(self.board_size)
+        return {table.from_index(int(index)): float(values[index])
+                for index in np.flatnonzero(np.nan_to_num(values))}
+
+    def save(self, path: str | Path) -> None:
+        """Compressed .npz: the maps plus board size and corpus counts."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with Path(path).open("wb") as file:
+            np.savez_compressed(file, counts=np.array([self.board_size, self.fleets, self.games]), **self.maps)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "HeatMaps":
+        require_numpy()
+        with np.load(Path(path)) as data:
+            board_size, fleets, games = (int(value) for value in data["counts"])
+            return cls(board_size, {name: data[name] for name in MAP_NAMES}, fleets=fleets, games=games)
+
+    def render(self, name: str = "occupancy", renderer=None) -> None:
+        """Prints a map through the console renderer's heat-map board."""
+        if renderer is None:
+            from src.ui.console_renderer import ConsoleRenderer
+
+            renderer = ConsoleRenderer(_ruleset_for(self.board_size))
+        renderer.render_heat_map(f"{name} ({self.fleets} fleets, {self.games} games)", self.cells(name))
+
+
+class HeatMapAggregator:
+    """
+    Streaming accumulation of HeatMaps from fleets and game logs.
+
+    Cell indices are buffered in plain lists and folded into the arrays with
+    np.bincount every `batch_size` entries, so memory stays bounded by the batch
+    and the maps, not by the corpus. `actor` selects whose shots are analyzed
+    ("bot" by default: where bots waste shots).
+    """
+
+    def __init__(self, ruleset: Ruleset = CLASSIC, actor: str = "bot", batch_size: int = 65_536):
+        require_numpy()
+        if actor not in ("player", "bot"):
+            raise ValueError(f"Unknown actor: {actor}")
+        self.ruleset = ruleset
+        self.actor = actor
+        self.batch_size = batch_size
+        self._maps = HeatMaps(ruleset.board_size)
+        self._pending: Dict[str, List[int]] = {name: [] for name in MAP_NAMES if name != "sunk_turn_sum"}
+        self._sunk_turns: List[int] = []  # weights for the pending sunk_count indices
+        self._buffered = 0
+
+    def add_fleet(self, fleet: Fleet) -> None:
+        size = self.ruleset.board_size
+        occupancy = self._pending["occupancy"]
+        for ship in fleet.ships:
+            occupancy.extend(cell.row * size + cell.col for cell in ship.cells)
+        self._maps.fleets += 1
+        self._buffer(self.ruleset.fleet_cells)
+
+    def add_fleets(self, fleets: Iterable[Fleet]) -> None:
+        for fleet in fleets:
+            self.add_fleet(fleet)
+
+    def add_fleet_repository(self, repo: FleetRepository) -> None:
+        self.add_fleet(repo.load())
+
+    def add_game(self, turns: Sequence[Tuple[TurnSide, TurnSide]], defender_fleet: Optional[Fleet] = None) -> None:
+        """
+        One game's turn history. With the defender's fleet, sunk-turn counts cover
+        every cell of a sunk ship; without it only the sinking shot's cell.
+        """
+        size = self.ruleset.board_size
+        ship_cells: Dict[Coordinate, List[Coordinate]] = {}
+        if defender_fleet is not None:
+            ship_cells = {cell: ship.cells for ship in defender_fleet.ships for cell in ship.cells}
+
+        side_index = 0 if self.actor == "player" else 1
+        first_hit_seen = False
+        added = 0
+        for turn_number, turn in enumerate(turns, start=1):
+            for move in moves_of(turn[side_index]):
+                index = move.target.row * size + move.target.col
+                if move.outcome == ShotOutcome.MISS:
+                    self._pending["misses"].append(index)
+                    added += 1
+                    continue
+                if not first_hit_seen:
+                    self._pending["first_hit"].append(index)
+                    first_hit_seen = True
+                    added += 1
+                if move.outcome == ShotOutcome.SUNK:
+                    for cell in ship_cells.get(move.target, (move.target,)):
+                        self._pending["sunk_count"].append(cell.row * size + cell.col)
+                        self._sunk_turns.append(turn_number)
+                        added += 1
+        self._maps.games += 1
+        self._buffer(added)
+
+    def add_game_repository(self, state_repo: GameStateRepository, defender_repo: Optional[FleetRepository] = None) -> None:
+        fleet = defender_repo.load() if defender_repo is not None else None
+        self.add_game(state_repo.load().turn_history, fleet)
+
+    def add_fleet_file(self, path: str | Path) -> None:
+        self.add_fleet_repository(CsvFleetRepository(path))
+
+    def add_game_file(self, path: str | Path, defender_fleet_path: Optional[str | Path] = None) -> None:
+        """A game_state.csv log (delta format on sparse boards), optionally with the defender's fleet file."""
+        repo_class = SparseCsvGameStateRepository if self.ruleset.sparse else CsvGameStateRepository
+        defender_repo = CsvFleetRepository(defender_fleet_path) if defender_fleet_path is not None else None
+        self.add_game_repository(repo_class(path, board_size=self.ruleset.board_size), defender_repo)
+
+    def result(self) -> HeatMaps:
+        """The maps so far (pending entries are folded in first). Aggregation can continue afterwards."""
+        self._flush()
+        return self._maps
+
+    def _buffer(self, added: int) -> None:
+        self._buffered += added
+        if self._buffered >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        area = self.ruleset.board_size ** 2
+        maps = self._maps.maps
+        for name, pending in self._pending.items():
+            if pending:
+                maps[name] += np.bincount(np.asarray(pending, dtype=np.int64), minlength=area)
+        if self._sunk_turns:
+            maps["sunk_turn_sum"] += np.bincount(
+                np.asarray(self._pending["sunk_count"], dtype=np.int64),
+                weights=np.asarray(self._sunk_turns, dtype=np.float64),
+                minlength=area,
+            ).astype(np.int64)
+        for pending in self._pending.values():
+            pending.clear()
+        self._sunk_turns.clear()
+        self._buffered = 0
+
+
+def _ruleset_for(board_size: int) -> Ruleset:
+    for ruleset in RULESETS.values():
+        if ruleset.board_size == board_size:
+            return ruleset
+    return Ruleset(name=f"{board_size}x{board_size}", board_size=board_size, ship_sizes=(1,))
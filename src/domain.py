@@ -1,11 +1,14 @@
+from array import array
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 BOARD_SIZE = 10
 
 
-@dataclass(frozen=True, order=True)
+@dataclass(frozen=True, order=True, slots=True)
 class Coordinate:
     row: int
     col: int
@@ -13,24 +16,71 @@ class Coordinate:
     def is_inside(self, size: int = BOARD_SIZE) -> bool:
         return 0 <= self.row < size and 0 <= self.col < size
 
-    def neighbors_8(self) -> List["Coordinate"]:
-        # 8-directional neighbors (including diagonals)
-        result: List[Coordinate] = []
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-                result.append(Coordinate(self.row + dr, self.col + dc))
-        return result
 
-    def neighbors_4(self) -> List["Coordinate"]:
-        # 4-directional neighbors (up, down, left, right)
-        return [
-            Coordinate(self.row - 1, self.col),
-            Coordinate(self.row + 1, self.col),
-            Coordinate(self.row, self.col - 1),
-            Coordinate(self.row, self.col + 1),
-        ]
+# 4-directional neighbours (up, down, left, right) and 8-directional ones (including diagonals, row by row)
+_STEPS_4 = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_STEPS_8 = tuple((dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+
+
+class CoordinateTable:
+    """
+    Interned Coordinates of one board size (see coordinate_table()).
+
+    Every cell is created once and shared, together with its on-board 4- and
+    8-neighbours, so hot loops stop allocating Coordinates. The table is filled
+    lazily: large boards only pay for the cells that are actually touched.
+    Neighbours are only built here, always on-board and interned.
+    """
+    __slots__ = ("size", "_cells", "_near4", "_near8")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._cells: Dict[int, Coordinate] = {}
+        self._near4: Dict[int, Tuple[Coordinate, ...]] = {}
+        self._near8: Dict[int, Tuple[Coordinate, ...]] = {}
+
+    def at(self, row: int, col: int) -> Coordinate:
+        return self.from_index(row * self.size + col)
+
+    def from_index(self, index: int) -> Coordinate:
+        cell = self._cells.get(index)
+        if cell is None:
+            cell = self._cells[index] = Coordinate(index // self.size, index % self.size)
+        return cell
+
+    def index(self, cell: Coordinate) -> int:
+        return cell.row * self.size + cell.col
+
+    def all_cells(self) -> Tuple[Coordinate, ...]:
+        """Every cell in row-major order (O(area): dense boards only)."""
+        return tuple(self.from_index(index) for index in range(self.size * self.size))
+
+    def neighbors_4(self, cell: Coordinate) -> Tuple[Coordinate, ...]:
+        index = cell.row * self.size + cell.col
+        near = self._near4.get(index)
+        if near is None:
+            near = self._near4[index] = self._around(cell, _STEPS_4)
+        return near
+
+    def neighbors_8(self, cell: Coordinate) -> Tuple[Coordinate, ...]:
+        index = cell.row * self.size + cell.col
+        near = self._near8.get(index)
+        if near is None:
+            near = self._near8[index] = self._around(cell, _STEPS_8)
+        return near
+
+    def _around(self, cell: Coordinate, steps: Tuple[Tuple[int, int], ...]) -> Tuple[Coordinate, ...]:
+        size = self.size
+        return tuple(
+            self.at(cell.row + dr, cell.col + dc) for dr, dc in steps
+            if 0 <= cell.row + dr < size and 0 <= cell.col + dc < size
+        )
+
+
+@lru_cache(maxsize=None)
+def coordinate_table(size: int = BOARD_SIZE) -> CoordinateTable:
+    """The process-wide interned table for a board size."""
+    return CoordinateTable(size)
 
 
 class ShotOutcome(Enum):
@@ -45,7 +95,7 @@ class FogCell(Enum):
     HIT = "x"
 
 
-@dataclass
+@dataclass(slots=True)
 class Ship:
     # Ship is represented by its occupied cells
     cells: List[Coordinate]
@@ -58,7 +108,7 @@ class Ship:
         return set(self.cells)
 
 
-@dataclass
+@dataclass(slots=True)
 class Fleet:
     ships: List[Ship]
 
@@ -75,30 +125,55 @@ class Fleet:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
+class ScoredFleet:
+    """A fleet layout with its score (e.g. average shots hunters needed to sink it)."""
+    fleet: Fleet
+    score: float
+
+
+@dataclass(slots=True)
 class FogBoard:
     """
     This board stores only the information discovered by shots:
     - miss/hit/sunk on specific cells
+    - the cells of each sunk ship (ships that may touch cannot be told apart from the cells alone)
     Unknown cells are not stored.
     """
     size: int = BOARD_SIZE
     shots: Dict[Coordinate, ShotOutcome] = field(default_factory=dict)
+    sunk_ships: List[Tuple[Coordinate, ...]] = field(default_factory=list, compare=False)
+    # Undo log shared with GameState while a snapshot is open (see GameState.snapshot)
+    journal: Optional[List["JournalEntry"]] = field(default=None, repr=False, compare=False)
 
     def has_been_shot(self, cell: Coordinate) -> bool:
         return cell in self.shots
 
     def set_miss(self, cell: Coordinate) -> None:
         if cell.is_inside(self.size) and cell not in self.shots:
-            self.shots[cell] = ShotOutcome.MISS
+            self._write(cell, ShotOutcome.MISS)
 
     def set_hit(self, cell: Coordinate) -> None:
         if cell.is_inside(self.size):
-            self.shots[cell] = ShotOutcome.HIT
+            self._write(cell, ShotOutcome.HIT)
 
     def set_sunk(self, cell: Coordinate) -> None:
         if cell.is_inside(self.size):
-            self.shots[cell] = ShotOutcome.SUNK
+            self._write(cell, ShotOutcome.SUNK)
+
+    def mark_sunk(self, cells: Iterable[Coordinate]) -> None:
+        """Marks one sunk ship: its cells become SUNK and are remembered as one ship."""
+        ship = tuple(cell for cell in cells if cell.is_inside(self.size))
+        for cell in ship:
+            self._write(cell, ShotOutcome.SUNK)
+        if self.journal is not None:
+            self.journal.append((self.sunk_ships, len(self.sunk_ships), None))
+        self.sunk_ships.append(ship)
+
+    def _write(self, cell: Coordinate, outcome: ShotOutcome) -> None:
+        if self.journal is not None:
+            self.journal.append((self.shots, cell, self.shots.get(cell)))
+        self.shots[cell] = outcome
 
     def symbol_at(self, cell: Coordinate) -> str:
         outcome = self.shots.get(cell)
@@ -114,49 +189,289 @@ class FogBoard:
         100 chars: row-major order, symbols:
         '?' unknown, 'o' miss, 'x' hit/sunk
         """
-        chars: List[str] = []
-        for r in range(self.size):
-            for c in range(self.size):
-                chars.append(self.symbol_at(Coordinate(r, c)))
-        return "".join(chars)
-    
+        chars = bytearray(FogCell.UNKNOWN.value * (self.size * self.size), "ascii")
+        miss, hit = ord(FogCell.MISS.value), ord(FogCell.HIT.value)
+        for cell, outcome in self.shots.items():
+            chars[cell.row * self.size + cell.col] = miss if outcome == ShotOutcome.MISS else hit
+        return chars.decode("ascii")
+
     @staticmethod
     def decode_100(encoded: str, size: int = BOARD_SIZE) -> "FogBoard":
         if len(encoded) != size * size:
             raise ValueError("Bad encoded board length")
         board = FogBoard(size=size)
-        i = 0
-        for r in range(size):
-            for c in range(size):
-                ch = encoded[i]
-                i += 1
-                cell = Coordinate(r, c)
-                if ch == FogCell.MISS.value:
-                    board.shots[cell] = ShotOutcome.MISS
-                elif ch == FogCell.HIT.value:
-                    board.shots[cell] = ShotOutcome.HIT
+        table = coordinate_table(size)
+        for index, ch in enumerate(encoded):
+            if ch == FogCell.MISS.value:
+                board.shots[table.from_index(index)] = ShotOutcome.MISS
+            elif ch == FogCell.HIT.value:
+                board.shots[table.from_index(index)] = ShotOutcome.HIT
         return board
 
 
-@dataclass
+@dataclass(slots=True)
 class Move:
     actor: str  # "player" or "bot"
     target: Coordinate
     outcome: ShotOutcome
 
 
-@dataclass
+# One side of a turn: a single Move, or all the Moves of a salvo
+TurnSide = Union[Move, Tuple[Move, ...]]
+
+
+def moves_of(side: TurnSide) -> Tuple[Move, ...]:
+    """The shots of one side of a turn, whether it was a single shot or a salvo."""
+    return side if isinstance(side, tuple) else (side,)
+
+
+_OUTCOME_CODES = {ShotOutcome.MISS: 0, ShotOutcome.HIT: 1, ShotOutcome.SUNK: 2}
+_CODE_OUTCOMES = {code: outcome for outcome, code in _OUTCOME_CODES.items()}
+
+
+class TurnHistory(Sequence):
+    """
+    Turn history packed into arrays: 4 bytes per shot and 9 per turn instead of a Move object each
+    (a single-shot turn takes 17 bytes, about a tenth of a list of two-Move tuples).
+    - shots: cell index (row * size + col) << 2 | outcome code, player shots then bot shots per turn
+    - starts / splits: offset of each turn's first player / first bot shot
+    - salvo_sides: bit 0 / bit 1 set when the player / bot side is a salvo tuple
+    Behaves like the list of (player side, bot side) tuples it replaces: Moves are
+    rebuilt on access around the interned Coordinates of coordinate_table(size).
+    Supports append, indexing, len, iteration and `del history[n:]`.
+    """
+    __slots__ = ("size", "_cells", "_shots", "_starts", "_splits", "_salvo_sides")
+
+    def __init__(self, turns: Iterable[Tuple[TurnSide, TurnSide]] = (), size: int = BOARD_SIZE):
+        self.size = size
+        self._cells = coordinate_table(size)
+        self._shots = array("I" if size * size < 1 << 30 else "Q")
+        self._starts = array("I")
+        self._splits = array("I")
+        self._salvo_sides = array("B")
+        for turn in turns:
+            self.append(turn)
+
+    def append(self, turn: Tuple[TurnSide, TurnSide]) -> None:
+        player_side, bot_side = turn
+        self._starts.append(len(self._shots))
+        self._pack(player_side)
+        self._splits.append(len(self._shots))
+        self._pack(bot_side)
+        self._salvo_sides.append(isinstance(player_side, tuple) | isinstance(bot_side, tuple) << 1)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("turn history index out of range")
+        start, split = self._starts[index], self._splits[index]
+        end = self._starts[index + 1] if index + 1 < len(self) else len(self._shots)
+        flags = self._salvo_sides[index]
+        return (
+            self._unpack("player", start, split, flags & 1),
+            self._unpack("bot", split, end, flags & 2),
+        )
+
+    def __iter__(self) -> Iterator[Tuple[TurnSide, TurnSide]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __delitem__(self, index) -> None:
+        if not isinstance(index, slice) or index.step not in (None, 1) or index.stop is not None:
+            # Anything but truncation is rare: rebuild
+            turns = list(self)
+            del turns[index]
+            self.__init__(turns, self.size)
+            return
+        keep = index.indices(len(self))[0]
+        if keep < len(self):
+            del self._shots[self._starts[keep]:]
+            del self._starts[keep:]
+            del self._splits[keep:]
+            del self._salvo_sides[keep:]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TurnHistory):
+            return (self.size == other.size and self._shots == other._shots and self._starts == other._starts
+                    and self._splits == other._splits and self._salvo_sides == other._salvo_sides)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TurnHistory({list(self)!r})"
+
+    def _pack(self, side: TurnSide) -> None:
+        size = self.size
+        for move in moves_of(side):
+            self._shots.append((move.target.row * size + move.target.col) << 2 | _OUTCOME_CODES[move.outcome])
+
+    def _unpack(self, actor: str, start: int, end: int, salvo: int) -> TurnSide:
+        cell = self._cells.from_index
+        moves = tuple(
+            Move(actor=actor, target=cell(code >> 2), outcome=_CODE_OUTCOMES[code & 3])
+            for code in self._shots[start:end]
+        )
+        return moves if salvo else moves[0]
+
+
+# Game events, published by GameManager on its EventBus (src/engine/events.py).
+# They live here so that storage and UI can consume them without depending on the engine.
+
+@dataclass(frozen=True)
+class ShotFired:
+    """A shot was resolved. Followed by ShotHit or ShipSunk unless it missed."""
+    actor: str  # "player" or "bot"
+    target: Coordinate
+    outcome: ShotOutcome
+
+
+@dataclass(frozen=True)
+class ShotHit:
+    actor: str
+    target: Coordinate
+
+
+@dataclass(frozen=True)
+class ShipSunk:
+    actor: str
+    cells: Tuple[Coordinate, ...]
+    # Cells newly marked as misses around the ship (empty when ships may touch)
+    auto_misses: Tuple[Coordinate, ...]
+
+
+@dataclass(frozen=True)
+class TurnCommitted:
+    turn_number: int
+    # One Move per shot: several in salvo games
+    player_moves: Tuple[Move, ...]
+    bot_moves: Tuple[Move, ...]
+
+
+@dataclass(frozen=True)
+class GameOver:
+    winner: str
+
+
+GameEvent = Union[ShotFired, ShotHit, ShipSunk, TurnCommitted, GameOver]
+
+
+def fog_changes(event: GameEvent) -> List[Tuple[str, Coordinate, ShotOutcome]]:
+    """(actor, cell, new outcome) for every cell the event changed on the shooter's fog board."""
+    if isinstance(event, ShotFired) and event.outcome != ShotOutcome.SUNK:
+        return [(event.actor, event.target, event.outcome)]
+    if isinstance(event, ShipSunk):
+        return ([(event.actor, cell, ShotOutcome.SUNK) for cell in event.cells]
+                + [(event.actor, cell, ShotOutcome.MISS) for cell in event.auto_misses])
+    return []
+
+
+# (container, key, previous value): a dict entry to restore (or list item to drop), or a set member to discard
+JournalEntry = Tuple[Any, Any, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class StateSnapshot:
+    journal_mark: int
+    turn_number: int
+    history_length: int
+
+
+@dataclass(slots=True)
 class GameState:
     """
     Stores both fog-of-war boards and move history.
     - player_view: what the player knows about bot's board
     - bot_view: what the bot knows about player's board
+
+    snapshot()/restore() give cheap branching: while a snapshot is open every
+    change is written to an undo log, so restoring costs O(changes since snapshot).
     """
     turn_number: int = 0
     player_view: FogBoard = field(default_factory=FogBoard)
     bot_view: FogBoard = field(default_factory=FogBoard)
-    # One entry per turn: (player_move, bot_move)
-    turn_history: List[Tuple[Move, Move]] = field(default_factory=list)
+    # One entry per turn: (player side, bot side), see TurnSide / moves_of()
+    turn_history: TurnHistory = field(default_factory=TurnHistory)
+
+    _journal: Optional[List[JournalEntry]] = field(default=None, init=False, repr=False, compare=False)
+    _open_snapshots: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Shots are packed by cell index: the history must use the board size
+        if self.turn_history.size != self.player_view.size:
+            self.turn_history = TurnHistory(self.turn_history, size=self.player_view.size)
 
     def advance_turn(self) -> None:
         self.turn_number += 1
+
+    def snapshot(self) -> StateSnapshot:
+        if self._journal is None:
+            self._journal = []
+            self.player_view.journal = self._journal
+            self.bot_view.journal = self._journal
+        self._open_snapshots += 1
+        return StateSnapshot(
+            journal_mark=len(self._journal),
+            turn_number=self.turn_number,
+            history_length=len(self.turn_history),
+        )
+
+    def restore(self, snapshot: StateSnapshot) -> None:
+        """Undo everything done after the snapshot. The snapshot stays valid."""
+        if self._journal is None or snapshot.journal_mark > len(self._journal):
+            raise ValueError("Snapshot is not open on this state")
+        journal = self._journal
+        while len(journal) > snapshot.journal_mark:
+            container, key, previous = journal.pop()
+            if isinstance(container, set):
+                container.discard(key)
+            elif previous is None:
+                del container[key]
+            else:
+                container[key] = previous
+        del self.turn_history[snapshot.history_length:]
+        self.turn_number = snapshot.turn_number
+
+    def release(self, snapshot: StateSnapshot) -> None:
+        """Close a snapshot. Journaling stops once no snapshot is open."""
+        if self._open_snapshots <= 0:
+            raise ValueError("No open snapshot to release")
+        self._open_snapshots -= 1
+        if self._open_snapshots == 0:
+            self._journal = None
+            self.player_view.journal = None
+            self.bot_view.journal = None
+
+    def record_set_add(self, container: Set[Any], key: Any) -> None:
+        """Journal a set insertion made outside of the fog boards (e.g. hit sets)."""
+        if self._journal is not None and key not in container:
+            self._journal.append((container, key, None))
+
+
+@dataclass(slots=True)
+class GameMeta:
+    """
+    Everything needed to reproduce a game besides the recorded moves:
+    RNG seeds, the rules the game was played with and where the bot fleet came from.
+    """
+    game_id: str
+    bot_seed: int
+    fleet_seed: int
+    ruleset: str = "classic"
+    board_size: int = BOARD_SIZE
+    ship_sizes: List[int] = field(default_factory=list)
+    allow_touching: bool = False
+    salvo: bool = False
+    # Id of the bot's opening book ("" = played without one)
+    opening_book: str = ""
+    # Bot fleet taken from a layout library (--adversarial): library id, layout index, board symmetry.
+    # "" = the fleet was generated from fleet_seed
+    fleet_library: str = ""
+    fleet_layout: int = 0
+    fleet_transform: int = 0
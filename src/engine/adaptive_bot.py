@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional, Sequence
+
+from src.domain import Coordinate, FogBoard, ShotOutcome
+from src.engine.bot_brain import BotBrain, TargetingState
+from src.placement.prior import PlacementPrior
+from src.engine.placements import remaining_ship_sizes
+from src.ruleset import CLASSIC, Ruleset
+
+
+class AdaptiveBotBrain(BotBrain):
+    """
+    BotBrain that aims with a placement prior learned from earlier opponents.
+
+    Hunting and the choice between follow-up cells both pick the unshot cell with
+    the largest prior-weighted placement density: placements of the remaining ship
+    sizes that avoid misses and sunk ships (and, while finishing a ship, pass
+    through all of its hits), each weighted by how often opponents used it.
+    One pass over the placement table per shot; the endgame solver still takes
+    over when few placements are left.
+    """
+
+    def __init__(self, prior: PlacementPrior, seed: Optional[int] = None, ruleset: Ruleset = CLASSIC,
+                 endgame_threshold: int = 12):
+        if ruleset.sparse:
+            raise ValueError(f"The adaptive bot is not available on sparse boards ({ruleset.board_size}x{ruleset.board_size})")
+        super().__init__(seed=seed, ruleset=ruleset, endgame_threshold=endgame_threshold)
+        self.prior = prior
+        self._weights = {size: prior.weights(size) for size in prior.counts}
+
+    def _random_unshot(self, bot_view: FogBoard) -> Coordinate:
+        target = self._densest(self._prior_density(bot_view))
+        return target if target is not None else super()._random_unshot(bot_view)
+
+    def _targeted_unshot(self, bot_view: FogBoard, state: TargetingState) -> Optional[Coordinate]:
+        options = self._targeted_options(bot_view, state)
+        if not options:
+            return None
+        density = self._prior_density(bot_view, through=state.hit_cells)
+        target = self._densest({cell: density[cell] for cell in options if cell in density})
+        return target if target is not None else self.rng.choice(options)
+
+    def _prior_density(self, bot_view: FogBoard, through: Sequence[Coordinate] = ()) -> Dict[Coordinate, float]:
+        shots = bot_view.shots
+        remaining = remaining_ship_sizes(bot_view, self.ruleset.ship_sizes)
+        density: Dict[Coordinate, float] = {}
+        for size in set(remaining):
+            if size < len(through):
+                continue
+            copies = remaining.count(size)
+            for placement, weight in zip(self.ruleset.placements(size), self._weights[size]):
+                if any(shots.get(cell) in (ShotOutcome.MISS, ShotOutcome.SUNK) for cell in placement):
+                    continue
+                if through and not all(cell in placement for cell in through):
+                    continue
+                for cell in placement:
+                    if cell not in shots:
+                        density[cell] = density.get(cell, 0.0) + copies * weight
+        return density
+
+    def _densest(self, density: Dict[Coordinate, float]) -> Optional[Coordinate]:
+        if not density:
+            return None
+        best = max(density.values())
+        ties: List[Coordinate] = sorted(cell for cell, weight in density.items() if weight == best)
+        return self.rng.choice(ties)
@@ -1,8 +1,14 @@
 import random
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
-from src.domain import Coordinate, FogBoard, ShotOutcome
+from src.domain import Coordinate, FogBoard, ShotOutcome, coordinate_table
+from src.engine.endgame import EndgameSolver
+from src.engine.hunt_index import HuntIndex
+from src.engine.opening_book import OpeningBook
+from src.engine.placements import remaining_ship_sizes
+from src.engine.sampling import UnshotSampler
+from src.ruleset import CLASSIC, Ruleset
 
 
 @dataclass
@@ -14,86 +20,237 @@ class TargetingState:
 class BotBrain:
     """
     Bot behavior:
-    1) Random untested shots.
+    1) Random untested shots on the hunt lattice of the shortest ship still afloat
+       (see HuntIndex; every other cell while no 1-deck ship is left, every third ...).
     2) After first hit: try adjacent (4-dir) cells.
     3) After second hit: lock axis and extend in both directions.
-    Reset after SUNK.
+    Hits are kept in one cluster per ship (a hit joins a cluster it extends, else starts
+    its own), so hits on two ships never share an axis. After SUNK only the sunk ship's
+    hits are dropped: hits left over on a ship it touched are targeted next.
+    4) Endgame: with few ships and few consistent placements left, play the exact solver.
+    On sparse (large) boards random shots come from an O(1) sampler and the endgame
+    solver is off: its placement tables grow with the board area.
+    Salvo games: choose_salvo() picks all shots of a turn together.
+    With an opening book, fog boards it covers (the first shots of a game) are answered
+    by one lookup instead.
     """
 
-    def __init__(self, seed: Optional[int] = None):
+    def __init__(self, seed: Optional[int] = None, ruleset: Ruleset = CLASSIC,
+                 endgame_threshold: int = 12, opening_book: Optional[OpeningBook] = None):
         self.rng = random.Random(seed)
-        self.targeting: Optional[TargetingState] = None
+        self.ruleset = ruleset
+        self.opening_book = opening_book
+        # Hit clusters of ships not sunk yet, in the order they were found
+        self.clusters: List[TargetingState] = []
+        self.endgame: Optional[EndgameSolver] = None
+        self.sampler: Optional[UnshotSampler] = None
+        if ruleset.sparse:
+            self.sampler = UnshotSampler(ruleset.board_size, self.rng)
+        elif endgame_threshold > 0:
+            self.endgame = EndgameSolver(ruleset, threshold=endgame_threshold)
+        self.hunt = HuntIndex(ruleset, self.rng, sampler=self.sampler)
 
     def choose_next_shot(self, bot_view: FogBoard) -> Coordinate:
-        if self.targeting is None:
-            return self._random_unshot(bot_view)
+        if self.opening_book is not None:
+            options = self.opening_book.lookup(bot_view)
+            if options:
+                return self.rng.choice(options)
 
-        target = self._targeted_unshot(bot_view, self.targeting)
-        if target is not None:
-            return target
+        if self.endgame is not None:
+            target = self.endgame.best_shot(bot_view)
+            if target is not None:
+                return target
+
+        for cluster in self.clusters:
+            target = self._targeted_unshot(bot_view, cluster)
+            if target is not None:
+                return target
 
         return self._random_unshot(bot_view)
 
-    def on_shot_result(self, target: Coordinate, outcome: ShotOutcome) -> None:
+    def choose_salvo(self, bot_view: FogBoard, count: int) -> List[Coordinate]:
+        """
+        `count` distinct unshot targets, chosen jointly:
+        - all follow-up cells of the ships being finished go in together;
+        - the other shots greedily cover as many distinct possible ship placements as they can,
+          so two shots of one salvo do not probe the same placement.
+        A salvo of one is an ordinary shot.
+        """
+        count = min(count, bot_view.size * bot_view.size - len(bot_view.shots))
+        if count <= 0:
+            return []
+        if count == 1:
+            return [self.choose_next_shot(bot_view)]
+
+        chosen: List[Coordinate] = []
+        if self.clusters:
+            options = list(dict.fromkeys(
+                cell for cluster in self.clusters for cell in self._targeted_options(bot_view, cluster)
+            ))
+            if len(options) > count:
+                options = self.rng.sample(options, count)
+            chosen.extend(options)
+
+        if len(chosen) < count and not self.ruleset.sparse:
+            chosen.extend(self._coverage_targets(bot_view, count - len(chosen), set(chosen)))
+
+        while len(chosen) < count:
+            if self.sampler is not None:
+                cell = self.sampler.sample(bot_view)
+                if cell is None:
+                    break
+                if cell not in chosen:
+                    chosen.append(cell)
+                continue
+            taken = set(chosen)
+            free = [cell for cell in self.ruleset.cells() if not bot_view.has_been_shot(cell) and cell not in taken]
+            chosen.extend(self.rng.sample(free, count - len(chosen)))
+        return chosen
+
+    def _coverage_targets(self, bot_view: FogBoard, count: int, taken: Set[Coordinate]) -> List[Coordinate]:
+        shots = bot_view.shots
+        uncovered = [
+            placement
+            for size in sorted(set(remaining_ship_sizes(bot_view, self.ruleset.ship_sizes)))
+            for placement in self.ruleset.placements(size)
+            if not any(shots.get(cell) in (ShotOutcome.MISS, ShotOutcome.SUNK) or cell in taken
+                       for cell in placement)
+        ]
+
+        chosen: List[Coordinate] = []
+        for _ in range(count):
+            weights: Dict[Coordinate, int] = {}
+            for placement in uncovered:
+                for cell in placement:
+                    if cell not in shots:
+                        weights[cell] = weights.get(cell, 0) + 1
+            if not weights:
+                break
+            best = max(weights.values())
+            cell = self.rng.choice(sorted(cell for cell, weight in weights.items() if weight == best))
+            chosen.append(cell)
+            uncovered = [placement for placement in uncovered if cell not in placement]
+        return chosen
+
+    def snapshot_state(self) -> tuple:
+        """Small copy of the brain's mutable state (RNG, targeting, hunt lattice, sampler pool in sparse mode)."""
+        clusters = [TargetingState(hit_cells=list(c.hit_cells), axis=c.axis) for c in self.clusters]
+        sampler = self.sampler.save() if self.sampler is not None else None
+        return self.rng.getstate(), clusters, sampler, self.hunt.save()
+
+    def restore_state(self, saved: tuple) -> None:
+        rng_state, clusters, sampler, hunt = saved
+        self.rng.setstate(rng_state)
+        if sampler is not None:
+            self.sampler.load(sampler)
+        self.hunt.load(hunt)
+        self.clusters = [TargetingState(hit_cells=list(c.hit_cells), axis=c.axis) for c in clusters]
+
+    def on_shot_result(self, target: Coordinate, outcome: ShotOutcome,
+                       sunk_cells: Sequence[Coordinate]) -> None:
+        """
+        `sunk_cells`: for SUNK, the cells of the ship that sank (as in the ShipSunk event), else ().
+        Its length is what leaves the hunt lattice: touching wrecks on the board cannot tell it.
+        """
+        self.hunt.remove(target)
         if outcome == ShotOutcome.MISS:
             return
         if outcome == ShotOutcome.SUNK:
-            self.targeting = None
+            self.hunt.sunk(len(sunk_cells))
+            self._drop_sunk_hits(set(sunk_cells) | {target})
             return
 
-        if self.targeting is None:
-            self.targeting = TargetingState(hit_cells=[target], axis=None)
+        self._add_hit(target)
+
+    def _add_hit(self, target: Coordinate) -> None:
+        """
+        Files a hit under the ship it belongs to:
+        - it joins every cluster it extends (next to one of its hits, and on its axis once locked);
+          two clusters it bridges on one line are merged;
+        - a hit that extends no cluster starts its own.
+        """
+        joined = [cluster for cluster in self.clusters if _extends(cluster, target)]
+        if not joined:
+            self.clusters.append(TargetingState(hit_cells=[target], axis=None))
             return
 
-        self.targeting.hit_cells.append(target)
+        cluster = joined[0]
+        for other in joined[1:]:
+            merged = cluster.hit_cells + other.hit_cells + [target]
+            if _line_axis(merged) is not None:
+                cluster.hit_cells.extend(other.hit_cells)
+                self.clusters.remove(other)
+        cluster.hit_cells.append(target)
+        if cluster.axis is None:
+            cluster.axis = _line_axis(cluster.hit_cells)
 
-        if self.targeting.axis is None and len(self.targeting.hit_cells) >= 2:
-            a, b = self.targeting.hit_cells[-2], self.targeting.hit_cells[-1]
-            if a.row == b.row:
-                self.targeting.axis = "h"
-            elif a.col == b.col:
-                self.targeting.axis = "v"
+    def _drop_sunk_hits(self, sunk: Set[Coordinate]) -> None:
+        """Keeps targeting the hits that are not part of the sunk ship (ships that may touch)."""
+        left = [cell for cluster in self.clusters for cell in cluster.hit_cells if cell not in sunk]
+        self.clusters = []
+        for cell in left:
+            self._add_hit(cell)
 
     def _random_unshot(self, bot_view: FogBoard) -> Coordinate:
-        candidates: List[Coordinate] = []
-        for r in range(10):
-            for c in range(10):
-                cell = Coordinate(r, c)
-                if not bot_view.has_been_shot(cell):
-                    candidates.append(cell)
+        target = self.hunt.sample(bot_view)
+        if target is not None:
+            return target
+
+        # Lattice exhausted (e.g. hits left over from a ship the targeting lost track of)
+        if self.sampler is not None:
+            return self.sampler.sample(bot_view) or Coordinate(0, 0)
+        shots = bot_view.shots
+        candidates = [cell for cell in self.ruleset.cells() if cell not in shots]
         return self.rng.choice(candidates) if candidates else Coordinate(0, 0)
 
     def _targeted_unshot(self, bot_view: FogBoard, state: TargetingState) -> Optional[Coordinate]:
+        options = self._targeted_options(bot_view, state)
+        return self.rng.choice(options) if options else None
+
+    def _targeted_options(self, bot_view: FogBoard, state: TargetingState) -> List[Coordinate]:
+        table = coordinate_table(self.ruleset.board_size)
         if state.axis is None:
             last = state.hit_cells[-1]
-            options = [c for c in last.neighbors_4() if c.is_inside() and not bot_view.has_been_shot(c)]
-            return self.rng.choice(options) if options else None
+            return [c for c in table.neighbors_4(last) if not bot_view.has_been_shot(c)]
 
         hits = state.hit_cells
+        options: List[Coordinate] = []
         if state.axis == "h":
             row = hits[0].row
             cols = [c.col for c in hits if c.row == row]
-            left_col, right_col = min(cols), max(cols)
-            left = Coordinate(row, left_col - 1)
-            right = Coordinate(row, right_col + 1)
-            candidates = []
-            if left.is_inside() and not bot_view.has_been_shot(left):
-                candidates.append(left)
-            if right.is_inside() and not bot_view.has_been_shot(right):
-                candidates.append(right)
-            return self.rng.choice(candidates) if candidates else None
-
-        if state.axis == "v":
+            options = self._open_cells(bot_view, (row, min(cols) - 1), (row, max(cols) + 1))
+        elif state.axis == "v":
             col = hits[0].col
             rows = [c.row for c in hits if c.col == col]
-            top_row, bottom_row = min(rows), max(rows)
-            up = Coordinate(top_row - 1, col)
-            down = Coordinate(bottom_row + 1, col)
-            candidates = []
-            if up.is_inside() and not bot_view.has_been_shot(up):
-                candidates.append(up)
-            if down.is_inside() and not bot_view.has_been_shot(down):
-                candidates.append(down)
-            return self.rng.choice(candidates) if candidates else None
+            options = self._open_cells(bot_view, (min(rows) - 1, col), (max(rows) + 1, col))
+        if options or not self.ruleset.allow_touching:
+            return options
+
+        # Both ends are closed but nothing sank: the hits span touching ships, try across the line
+        return list(dict.fromkeys(c for hit in hits for c in table.neighbors_4(hit) if not bot_view.has_been_shot(c)))
+
+    def _open_cells(self, bot_view: FogBoard, *positions: Tuple[int, int]) -> List[Coordinate]:
+        """Interned on-board cells at (row, col) `positions` that were not shot yet, in order."""
+        size = self.ruleset.board_size
+        cells = [self.ruleset.cell_at(r, c) for r, c in positions if 0 <= r < size and 0 <= c < size]
+        return [cell for cell in cells if not bot_view.has_been_shot(cell)]
+
+
+def _extends(cluster: TargetingState, cell: Coordinate) -> bool:
+    hits = cluster.hit_cells
+    if cluster.axis == "h" and cell.row != hits[0].row:
+        return False
+    if cluster.axis == "v" and cell.col != hits[0].col:
+        return False
+    return any(abs(hit.row - cell.row) + abs(hit.col - cell.col) == 1 for hit in hits)
+
 
+def _line_axis(cells: Sequence[Coordinate]) -> Optional[str]:
+    """"h"/"v" if `cells` (two or more) lie on one row/column, else None."""
+    if len(cells) < 2:
         return None
+    if len({cell.row for cell in cells}) == 1:
+        return "h"
+    if len({cell.col for cell in cells}) == 1:
+        return "v"
+    return None
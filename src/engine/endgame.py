@@ -0,0 +1,215 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+from src.domain import Coordinate, FogBoard, coordinate_table
+from src.engine.placements import Configuration, consistent_configurations, remaining_ship_sizes, shot_masks
+from src.ruleset import Ruleset
+
+# Root positions: (expected shots to finish, best cell, configuration count)
+SolverEntry = Tuple[float, Optional[Coordinate], int]
+# Sub-positions: (expected shots, best cell bit, nodes the search of the sub-position cost)
+SubEntry = Tuple[float, Optional[int], int]
+# A configuration as one bitmask per ship (bit index = row * board_size + col)
+MaskConfiguration = Tuple[int, ...]
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class EndgameSolver:
+    """
+    Exact endgame play for the last remaining ships.
+
+    Once the fog board admits at most `threshold` configurations of the remaining
+    ships, the shot that minimizes the expected number of shots to sink them all is
+    computed exactly (configurations are equally likely) with branch and bound.
+
+    Results are memoized by fog-board state (root positions) and by the
+    configuration set + relevant shots as bitmasks (sub-positions). The cache is shared by all
+    solvers in the process, so positions repeated across games are free.
+    If a position needs more than `node_budget` sub-positions, the solver gives
+    up and the caller falls back to its heuristics, and skips positions with as many
+    configurations from then on. Cached sub-positions are charged what they cost when
+    first searched and cached root positions go through the same skip check, so whether
+    a position is solved (and the shot chosen) does not depend on what earlier games
+    left in the cache.
+    Positions with more than `max_open_cells` unshot cells under the configurations
+    are not tried at all: on the classic fleet almost all of them blow the budget,
+    and the abandoned searches were most of the solver's cost.
+    """
+
+    _cache: "OrderedDict[Hashable, Union[SolverEntry, SubEntry]]" = OrderedDict()
+    cache_size: int = 500_000
+
+    def __init__(self, ruleset: Ruleset, threshold: int = 12, max_ships: int = 2,
+                 node_budget: int = 1_000, max_open_cells: int = 6):
+        self.ruleset = ruleset
+        self.ship_sizes = tuple(sorted(ruleset.ship_sizes, reverse=True))
+        self.threshold = threshold
+        self.max_ships = max_ships
+        self.node_budget = node_budget
+        self.max_open_cells = max_open_cells
+        self._nodes_used = 0
+        # Configuration count of the last position that blew the budget
+        self._failed_at: Optional[int] = None
+
+    def best_shot(self, view: FogBoard) -> Optional[Coordinate]:
+        """Returns None when the position is not an endgame (or is too large to solve)."""
+        remaining = remaining_ship_sizes(view, self.ship_sizes)
+        if not remaining or len(remaining) > self.max_ships:
+            return None
+
+        # The configurations and the solution only depend on which cells are open hits and which are closed.
+        # Solvers with other limits would not have solved the same positions, so the limits are part of the key.
+        limits = (self.threshold, self.node_budget, self.max_open_cells)
+        fog_key = ("fog", self.ruleset, limits, shot_masks(view), tuple(remaining))
+        cached = self._lookup(fog_key)
+        if cached is not None:
+            # This solver's own budget history applies to cached positions too
+            return None if self._gave_up_on(cached[2]) else cached[1]
+
+        configs = consistent_configurations(view, remaining, self.ruleset, limit=self.threshold)
+        if not configs or self._gave_up_on(len(configs)):
+            return None
+        if _open_cell_count(view, configs) > self.max_open_cells:
+            return None
+
+        self._nodes_used = 0
+        try:
+            expected, shot = self._solve_position(view, configs)
+        except _BudgetExceeded:
+            self._failed_at = len(configs)
+            return None
+        self._remember(fog_key, (expected, shot, len(configs)))
+        return shot
+
+    def _gave_up_on(self, configurations: int) -> bool:
+        """Positions at least as large as one that blew the budget are left to the heuristics."""
+        return self._failed_at is not None and configurations >= self._failed_at
+
+    def _solve_position(self, view: FogBoard, configs: List[Configuration]) -> Tuple[float, Optional[Coordinate]]:
+        size = view.size
+        shot_mask = 0
+        for cell in view.shots:
+            shot_mask |= 1 << (cell.row * size + cell.col)
+        # Sub-positions only need bitmasks: one int per ship, one for all shots.
+        # Sorted, so equal configuration sets are always searched in the same order.
+        mask_configs = sorted(
+            tuple(sum(1 << (cell.row * size + cell.col) for cell in ship) for ship in config)
+            for config in configs
+        )
+        expected, bit = self._solve(shot_mask, mask_configs)
+        if bit is None:
+            return expected, None
+        return expected, coordinate_table(size).from_index(bit.bit_length() - 1)
+
+    def _solve(self, shot_mask: int, configs: List[MaskConfiguration]) -> Tuple[float, Optional[int]]:
+        union = 0
+        for config in configs:
+            for ship in config:
+                union |= ship
+        open_cells = union & ~shot_mask
+        if not open_cells:
+            return 0.0, None
+
+        # Shots outside the cells any configuration uses cannot change the answer
+        key = ("configs", frozenset(configs), shot_mask & union)
+        cached = self._lookup(key)
+        if cached is not None:
+            self._charge(cached[2])
+            return cached[0], cached[1]
+
+        nodes_before = self._nodes_used
+        self._charge(1)
+
+        total = len(configs)
+        lower_bound = self._lower_bound(configs, shot_mask)
+
+        # Two cells lying in the same ship of every configuration are interchangeable
+        partitions: Dict[tuple, Tuple[int, Dict[tuple, List[MaskConfiguration]]]] = {}
+        remaining = open_cells
+        while remaining:
+            bit = remaining & -remaining
+            remaining ^= bit
+            signature = tuple(self._ship_index(config, bit) for config in configs)
+            if signature in partitions:
+                continue
+            groups: Dict[tuple, List[MaskConfiguration]] = {}
+            for config in configs:
+                groups.setdefault(self._outcome_key(config, bit, shot_mask), []).append(config)
+            partitions[signature] = (bit, groups)
+
+        # Most likely hits first: they usually give the best bound early
+        ordered = sorted(
+            partitions.values(),
+            key=lambda item: (-sum(len(g) for k, g in item[1].items() if k[0] != "miss"), item[0]),
+        )
+
+        best: Tuple[float, Optional[int]] = (float("inf"), None)
+        for bit, groups in ordered:
+            child_mask = shot_mask | bit
+            children = [(len(group) / total, group) for group in groups.values()]
+            optimistic = 1.0 + sum(p * self._lower_bound(group, child_mask) for p, group in children)
+            if optimistic >= best[0]:
+                continue
+
+            expected = 1.0
+            for p, group in children:
+                expected += p * self._solve(child_mask, group)[0]
+                if expected >= best[0]:
+                    break
+            if expected < best[0]:
+                best = (expected, bit)
+                if best[0] <= lower_bound + 1e-9:
+                    break
+
+        self._remember(key, (best[0], best[1], self._nodes_used - nodes_before))
+        return best
+
+    def _charge(self, nodes: int) -> None:
+        self._nodes_used += nodes
+        if self._nodes_used > self.node_budget:
+            raise _BudgetExceeded()
+
+    @staticmethod
+    def _lower_bound(configs: List[MaskConfiguration], shot_mask: int) -> float:
+        # Whatever the order, every unshot cell of the true configuration must be fired at
+        unshot = 0
+        for config in configs:
+            for ship in config:
+                unshot += (ship & ~shot_mask).bit_count()
+        return unshot / len(configs)
+
+    @staticmethod
+    def _ship_index(config: MaskConfiguration, bit: int) -> int:
+        for index, ship in enumerate(config):
+            if ship & bit:
+                return index
+        return -1
+
+    @staticmethod
+    def _outcome_key(config: MaskConfiguration, bit: int, shot_mask: int) -> tuple:
+        # Sinking also marks the ship's surroundings, but no configuration consistent
+        # with the sunk ship uses those cells, so only the shot cell itself matters
+        for ship in config:
+            if ship & bit:
+                if ship & ~shot_mask == bit:
+                    return ("sunk", ship)
+                return ("hit",)
+        return ("miss",)
+
+    def _lookup(self, key: Hashable) -> Optional[Union[SolverEntry, SubEntry]]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+        return cached
+
+    def _remember(self, key: Hashable, entry: Union[SolverEntry, SubEntry]) -> None:
+        self._cache[key] = entry
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _open_cell_count(view: FogBoard, configs: List[Configuration]) -> int:
+    return len({cell for config in configs for ship in config for cell in ship if cell not in view.shots})
@@ -0,0 +1,65 @@
+from typing import Callable, List, Union
+
+from src.domain import GameEvent
+
+
+EventHandler = Callable[[GameEvent], None]
+BatchHandler = Callable[[List[GameEvent]], None]
+
+
+class EventBus:
+    """
+    Synchronous publish/subscribe for game events.
+    - subscribe(): handler gets each event as it is published
+    - subscribe_batch(): handler gets the buffered events at every flush()
+      (GameManager flushes once per committed turn)
+    While muted (e.g. during lookahead branches that will be rolled back) events are dropped.
+    """
+
+    def __init__(self):
+        self._handlers: List[EventHandler] = []
+        self._batch_handlers: List[BatchHandler] = []
+        self._pending: List[GameEvent] = []
+        self._muted = 0
+
+    @property
+    def active(self) -> bool:
+        """False when nobody would receive an event: publishers can skip building it."""
+        return not self._muted and bool(self._handlers or self._batch_handlers)
+
+    def subscribe(self, handler: EventHandler) -> None:
+        self._handlers.append(handler)
+
+    def subscribe_batch(self, handler: BatchHandler) -> None:
+        self._batch_handlers.append(handler)
+
+    def unsubscribe(self, handler: Union[EventHandler, BatchHandler]) -> None:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+        elif handler in self._batch_handlers:
+            self._batch_handlers.remove(handler)
+        else:
+            raise ValueError("Handler is not subscribed")
+
+    def publish(self, event: GameEvent) -> None:
+        if self._muted:
+            return
+        for handler in self._handlers:
+            handler(event)
+        if self._batch_handlers:
+            self._pending.append(event)
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        for handler in self._batch_handlers:
+            handler(batch)
+
+    def mute(self) -> None:
+        self._muted += 1
+
+    def unmute(self) -> None:
+        if self._muted <= 0:
+            raise ValueError("Event bus is not muted")
+        self._muted -= 1
@@ -1,8 +1,15 @@
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional, Set
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
-from src.domain import Coordinate, Fleet, GameState, Move, ShotOutcome, FogBoard
+from src.domain import (
+    Coordinate, Fleet, GameOver, GameState, Move, Ship, ShipSunk, ShotFired, ShotHit, ShotOutcome, FogBoard,
+    StateSnapshot, TurnCommitted, TurnSide, coordinate_table, moves_of,
+)
 from src.engine.bot_brain import BotBrain
+from src.engine.events import EventBus
+from src.engine.hints import ShotHint, shared_hinter
+from src.ruleset import CLASSIC, Ruleset
 
 
 @dataclass
@@ -10,24 +17,46 @@ class GameResult:
     winner: Optional[str] = None  # "player", "bot", or None
 
 
+@dataclass(frozen=True)
+class GameSnapshot:
+    state: StateSnapshot
+    bot_brain: Optional[tuple] = None
+
+
 class GameManager:
     """
     Pure game logic. No printing, no input reading, no CSV knowledge.
+    Every change is published on `events` (see src/engine/events.py), so renderers,
+    repositories and metrics can follow the game incrementally.
     """
 
-    def __init__(self, player_fleet: Fleet, bot_fleet: Fleet, bot_brain: Optional[BotBrain] = None):
+    def __init__(self, player_fleet: Fleet, bot_fleet: Fleet, bot_brain: Optional[BotBrain] = None,
+                 ruleset: Ruleset = CLASSIC):
+        self.ruleset = ruleset
         self.player_fleet = player_fleet
         self.bot_fleet = bot_fleet
 
-        self.state = GameState()
+        self.state = GameState(
+            player_view=FogBoard(size=ruleset.board_size),
+            bot_view=FogBoard(size=ruleset.board_size),
+        )
         self.player_hits_on_bot: Set[Coordinate] = set()
         self.bot_hits_on_player: Set[Coordinate] = set()
 
-        self.bot_brain = bot_brain or BotBrain()
+        # cell -> ship lookups, so resolving a shot does not walk the whole fleet
+        self._player_ship_at = self._index_ships(player_fleet)
+        self._bot_ship_at = self._index_ships(bot_fleet)
+        # Fallback scan position: every cell before it is known to be shot on that view
+        self._scan_view: Optional[FogBoard] = None
+        self._scan_from = 0
+
+        self.bot_brain = bot_brain or BotBrain(ruleset=ruleset)
+        self.events = EventBus()
 
     @classmethod
-    def from_loaded_state(cls, player_fleet: Fleet, bot_fleet: Fleet, loaded_state: GameState) -> "GameManager":
-        manager = cls(player_fleet=player_fleet, bot_fleet=bot_fleet)
+    def from_loaded_state(cls, player_fleet: Fleet, bot_fleet: Fleet, loaded_state: GameState,
+                          bot_brain: Optional[BotBrain] = None, ruleset: Ruleset = CLASSIC) -> "GameManager":
+        manager = cls(player_fleet=player_fleet, bot_fleet=bot_fleet, bot_brain=bot_brain, ruleset=ruleset)
         manager.state = loaded_state
 
         manager.player_hits_on_bot = {
@@ -42,86 +71,227 @@ class GameManager:
         return manager
 
     def is_game_over(self) -> GameResult:
-        bot_cells = self.bot_fleet.occupied_cells()
-        player_cells = self.player_fleet.occupied_cells()
+        # Hit sets only ever hold fleet cells, so comparing sizes is enough
+        bot_cells = len(self._bot_ship_at)
+        player_cells = len(self._player_ship_at)
 
-        if bot_cells and self.player_hits_on_bot.issuperset(bot_cells):
+        if bot_cells and len(self.player_hits_on_bot) >= bot_cells:
             return GameResult(winner="player")
-        if player_cells and self.bot_hits_on_player.issuperset(player_cells):
+        if player_cells and len(self.bot_hits_on_player) >= player_cells:
             return GameResult(winner="bot")
         return GameResult(winner=None)
 
     def apply_player_shot(self, target: Coordinate) -> ShotOutcome:
-        if self.state.player_view.has_been_shot(target):
-            raise ValueError("This cell was already shot/marked by the player.")
-        return self._resolve_shot(
-            target=target,
-            defender_fleet=self.bot_fleet,
-            shooter_hits=self.player_hits_on_bot,
-            shooter_view=self.state.player_view,
-        )
+        return self.apply_shots([target])[0]
+
+    def apply_bot_shot(self, target: Optional[Coordinate] = None) -> tuple[Coordinate, ShotOutcome]:
+        """
+        Bot shot chosen by the BotBrain.
+        A forced target (used by replay) skips the choice, the brain is still notified.
+        """
+        if target is None:
+            target = self.choose_bot_target()
+
+        outcome = self.apply_shots([target], actor="bot")[0]
+        self.bot_brain.on_shot_result(target, outcome, self._sunk_cells(target, outcome))
+        return target, outcome
+
+    def salvo_size(self, actor: str) -> int:
+        """Shots `actor` fires this turn: 1, or one per surviving ship of theirs in salvo games."""
+        if not self.ruleset.salvo:
+            return 1
+        if actor == "player":
+            fleet, enemy_hits = self.player_fleet, self.bot_hits_on_player
+        else:
+            fleet, enemy_hits = self.bot_fleet, self.player_hits_on_bot
+        return sum(1 for ship in fleet.ships if not all(cell in enemy_hits for cell in ship.cells))
+
+    def apply_shots(self, targets: Sequence[Coordinate], actor: str = "player") -> List[ShotOutcome]:
+        """
+        Resolves a whole salvo in one pass; a single shot is a salvo of one.
+        Outcomes are in firing order: the shot that completes a ship reports SUNK,
+        earlier hits on the same ship report HIT.
+        """
+        if actor == "player":
+            defender_ships, shooter_hits, shooter_view = self._bot_ship_at, self.player_hits_on_bot, self.state.player_view
+        else:
+            defender_ships, shooter_hits, shooter_view = self._player_ship_at, self.bot_hits_on_player, self.state.bot_view
 
-    def apply_bot_shot(self) -> tuple[Coordinate, ShotOutcome]:
+        if len(targets) > self.salvo_size(actor):
+            raise ValueError(f"Too many shots: {len(targets)}, allowed {self.salvo_size(actor)}.")
+        if len(set(targets)) != len(targets):
+            raise ValueError("A salvo cannot target the same cell twice.")
+        for target in targets:
+            if shooter_view.has_been_shot(target):
+                raise ValueError(f"This cell was already shot/marked by the {actor}.")
+
+        return self._resolve_salvo(actor, targets, defender_ships, shooter_hits, shooter_view)
+
+    def apply_bot_salvo(self, targets: Optional[Sequence[Coordinate]] = None) -> List[Tuple[Coordinate, ShotOutcome]]:
+        """Bot salvo chosen jointly by the BotBrain (or forced, for replay); the brain is notified of every shot."""
+        if targets is None:
+            targets = self.choose_bot_salvo()
+        outcomes = self.apply_shots(targets, actor="bot")
+        for target, outcome in zip(targets, outcomes):
+            self.bot_brain.on_shot_result(target, outcome, self._sunk_cells(target, outcome))
+        return list(zip(targets, outcomes))
+
+    def _sunk_cells(self, bot_target: Coordinate, outcome: ShotOutcome) -> Tuple[Coordinate, ...]:
+        """Cells of the player ship a bot shot sank (the ShipSunk cells), or () for other outcomes."""
+        if outcome != ShotOutcome.SUNK:
+            return ()
+        return tuple(self._player_ship_at[bot_target].cells)
+
+    def suggest_player_shots(self, k: int = 3) -> List[ShotHint]:
+        """Top-k cells for the player's next shot, with estimated hit probabilities."""
+        return self._player_hinter().suggest(self.state.player_view, k)
+
+    def player_heat_map(self) -> Dict[Coordinate, float]:
+        return self._player_hinter().heat_map(self.state.player_view)
+
+    def _player_hinter(self):
+        return shared_hinter(self.ruleset)
+
+    def choose_bot_target(self) -> Coordinate:
         target = self.bot_brain.choose_next_shot(self.state.bot_view)
         if self.state.bot_view.has_been_shot(target):
             target = self._find_first_unshot_cell(self.state.bot_view)
+        return target
 
-        outcome = self._resolve_shot(
-            target=target,
-            defender_fleet=self.player_fleet,
-            shooter_hits=self.bot_hits_on_player,
-            shooter_view=self.state.bot_view,
-        )
-        self.bot_brain.on_shot_result(target, outcome)
-        return target, outcome
+    def choose_bot_salvo(self) -> List[Coordinate]:
+        return self.bot_brain.choose_salvo(self.state.bot_view, self.salvo_size("bot"))
 
     def commit_turn(self, player_target: Coordinate, player_outcome: ShotOutcome,
                     bot_target: Coordinate, bot_outcome: ShotOutcome) -> None:
-        self.state.advance_turn()
-        self.state.turn_history.append((
+        self._commit(
             Move(actor="player", target=player_target, outcome=player_outcome),
             Move(actor="bot", target=bot_target, outcome=bot_outcome),
-        ))
+        )
 
-    def _resolve_shot(self, target: Coordinate, defender_fleet: Fleet,
-                      shooter_hits: Set[Coordinate], shooter_view: FogBoard) -> ShotOutcome:
-        defender_cells = defender_fleet.occupied_cells()
+    def commit_salvo_turn(self, player_shots: Sequence[Tuple[Coordinate, ShotOutcome]],
+                          bot_shots: Sequence[Tuple[Coordinate, ShotOutcome]]) -> None:
+        """Records a salvo turn: each side is stored as a tuple of Moves."""
+        self._commit(
+            tuple(Move(actor="player", target=target, outcome=outcome) for target, outcome in player_shots),
+            tuple(Move(actor="bot", target=target, outcome=outcome) for target, outcome in bot_shots),
+        )
 
-        if target in defender_cells:
-            shooter_hits.add(target)
-            ship = defender_fleet.find_ship_containing(target)
-            if ship is None:
-                shooter_view.set_hit(target)
-                return ShotOutcome.HIT
+    def _commit(self, player_side: TurnSide, bot_side: TurnSide) -> None:
+        self.state.advance_turn()
+        self.state.turn_history.append((player_side, bot_side))
+
+        if self.events.active:
+            self.events.publish(TurnCommitted(self.state.turn_number, moves_of(player_side), moves_of(bot_side)))
+            winner = self.is_game_over().winner
+            if winner is not None:
+                self.events.publish(GameOver(winner))
+        self.events.flush()
+
+    def snapshot(self, include_bot_brain: bool = True) -> GameSnapshot:
+        """
+        Branch point for lookahead search.
+        Changes made after it are undo-logged; restore() rolls them back in O(changes).
+        Snapshots nest and must be released in reverse order of creation.
+        No events are published until the snapshot is released.
+        """
+        self.events.mute()
+        return GameSnapshot(
+            state=self.state.snapshot(),
+            bot_brain=self.bot_brain.snapshot_state() if include_bot_brain else None,
+        )
+
+    def restore(self, snapshot: GameSnapshot) -> None:
+        self.state.restore(snapshot.state)
+        self._scan_view = None
+        if snapshot.bot_brain is not None:
+            self.bot_brain.restore_state(snapshot.bot_brain)
+
+    def release(self, snapshot: GameSnapshot) -> None:
+        self.state.release(snapshot.state)
+        self.events.unmute()
 
-            ship_cells = ship.cell_set()
-            if ship_cells.issubset(shooter_hits):
-                for cell in ship_cells:
-                    shooter_view.set_sunk(cell)
-                self._mark_surrounding_as_miss(shooter_view, ship_cells)
-                return ShotOutcome.SUNK
+    @contextmanager
+    def branch(self, include_bot_brain: bool = True) -> Iterator["GameManager"]:
+        """Explore hypothetical moves; everything is rolled back on exit."""
+        snapshot = self.snapshot(include_bot_brain=include_bot_brain)
+        try:
+            yield self
+        finally:
+            self.restore(snapshot)
+            self.release(snapshot)
 
+    def _resolve_salvo(self, actor: str, targets: Sequence[Coordinate], defender_ships: Dict[Coordinate, Ship],
+                       shooter_hits: Set[Coordinate], shooter_view: FogBoard) -> List[ShotOutcome]:
+        outcomes: List[ShotOutcome] = []
+        # Ships hit by this salvo (keyed by identity, ships are not hashable) and their last shot
+        struck: Dict[int, Ship] = {}
+        last_shot: Dict[int, int] = {}
+        for index, target in enumerate(targets):
+            ship = defender_ships.get(target)
+            if ship is None:
+                shooter_view.set_miss(target)
+                outcomes.append(ShotOutcome.MISS)
+                continue
+            self.state.record_set_add(shooter_hits, target)
+            shooter_hits.add(target)
             shooter_view.set_hit(target)
-            return ShotOutcome.HIT
+            outcomes.append(ShotOutcome.HIT)
+            struck[id(ship)] = ship
+            last_shot[id(ship)] = index
 
-        shooter_view.set_miss(target)
-        return ShotOutcome.MISS
+        # One sunk sweep for every ship the salvo finished, then one neighbour-marking pass
+        sunk = [ship for ship in struck.values() if all(cell in shooter_hits for cell in ship.cells)]
+        sunk_cells: Set[Coordinate] = set()
+        for ship in sunk:
+            shooter_view.mark_sunk(ship.cells)
+            sunk_cells.update(ship.cells)
+            outcomes[last_shot[id(ship)]] = ShotOutcome.SUNK
+        auto_misses = self._mark_surrounding_as_miss(shooter_view, sunk_cells) if sunk else set()
 
-    @staticmethod
-    def _mark_surrounding_as_miss(shooter_view: FogBoard, ship_cells: Set[Coordinate]) -> None:
+        if self.events.active:
+            self._publish_salvo(actor, targets, outcomes, sunk, auto_misses)
+        return outcomes
+
+    def _publish_salvo(self, actor: str, targets: Sequence[Coordinate], outcomes: List[ShotOutcome],
+                       sunk: List[Ship], auto_misses: Set[Coordinate]) -> None:
+        for target, outcome in zip(targets, outcomes):
+            self.events.publish(ShotFired(actor, target, outcome))
+            if outcome == ShotOutcome.HIT:
+                self.events.publish(ShotHit(actor, target))
+        unclaimed = set(auto_misses)
+        for ship in sunk:
+            around = {near for cell in ship.cells for near in self.ruleset.exclusion_zone(cell)} & unclaimed
+            unclaimed -= around
+            self.events.publish(ShipSunk(actor, tuple(ship.cells), tuple(sorted(around))))
+
+    def _mark_surrounding_as_miss(self, shooter_view: FogBoard, ship_cells: Set[Coordinate]) -> Set[Coordinate]:
+        """Returns the cells that were newly marked."""
+        # Only meaningful when ships may not touch: then no ship can be next to a sunk one
+        marked: Set[Coordinate] = set()
         for ship_cell in ship_cells:
-            for near in ship_cell.neighbors_8():
-                if not near.is_inside():
-                    continue
-                if near in ship_cells:
+            for near in self.ruleset.exclusion_zone(ship_cell):
+                if near in ship_cells or shooter_view.has_been_shot(near):
                     continue
                 shooter_view.set_miss(near)
+                marked.add(near)
+        return marked
 
-    @staticmethod
-    def _find_first_unshot_cell(board_view: FogBoard) -> Coordinate:
-        for r in range(10):
-            for c in range(10):
-                cell = Coordinate(r, c)
-                if not board_view.has_been_shot(cell):
-                    return cell
+    def _find_first_unshot_cell(self, board_view: FogBoard) -> Coordinate:
+        # Row-major scan resumed where the last one stopped: cells are only ever added
+        # to a view, so the cursor stays valid until the view is swapped or rolled back
+        if board_view is not self._scan_view:
+            self._scan_view = board_view
+            self._scan_from = 0
+        table = coordinate_table(self.ruleset.board_size)
+        area = self.ruleset.board_size ** 2
+        for index in range(self._scan_from, area):
+            cell = table.from_index(index)
+            if not board_view.has_been_shot(cell):
+                self._scan_from = index
+                return cell
+        self._scan_from = area
         return Coordinate(0, 0)
+
+    @staticmethod
+    def _index_ships(fleet: Fleet) -> Dict[Coordinate, Ship]:
+        return {cell: ship for ship in fleet.ships for cell in ship.cells}
@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from src.domain import Coordinate, FogBoard, ShotOutcome, coordinate_table
+from src.engine.placements import remaining_ship_sizes
+from src.ruleset import Ruleset
+
+# Placements through a known (unsunk) hit are far more likely to be the real ship
+HIT_WEIGHT = 50
+
+_CELL_CODES = {ShotOutcome.MISS: 1, ShotOutcome.HIT: 2, ShotOutcome.SUNK: 3}
+
+
+@dataclass(frozen=True)
+class ShotHint:
+    cell: Coordinate
+    probability: float  # estimated chance that the cell holds a ship
+
+
+@lru_cache(maxsize=None)
+def _cover_masks(ruleset: Ruleset, size: int) -> Tuple[int, ...]:
+    """For every cell index: bitmask over placement indices of placements covering it."""
+    board_size = ruleset.board_size
+    masks = [0] * (board_size * board_size)
+    for index, placement in enumerate(ruleset.placements(size)):
+        for cell in placement:
+            masks[cell.row * board_size + cell.col] |= 1 << index
+    return tuple(masks)
+
+
+class ShotHinter:
+    """
+    Suggests shots from placement density.
+
+    For every remaining ship size, the placements that avoid misses and sunk ships are
+    counted per cell (as bitmask popcounts over precomputed cover tables); placements
+    through open hits are weighted up. Rankings are kept in an LRU cache keyed by
+    the encoded fog board and the ships still afloat, so positions shared by many
+    games are served from memory.
+    """
+
+    def __init__(self, ruleset: Ruleset, cache_size: int = 4096):
+        if ruleset.sparse:
+            raise ValueError(f"Shot hints are not available on sparse boards ({ruleset.board_size}x{ruleset.board_size})")
+        self.ruleset = ruleset
+        self.ship_sizes = tuple(sorted(ruleset.ship_sizes, reverse=True))
+        self.cache_size = cache_size
+        # (encoded fog, remaining ship sizes) -> (cell indices best first, probability per cell index)
+        self._cache: "OrderedDict[Tuple[bytes, Tuple[int, ...]], Tuple[List[int], Dict[int, float]]]" = OrderedDict()
+
+    def suggest(self, view: FogBoard, k: int = 3) -> List[ShotHint]:
+        ordered, probabilities = self._ranking(view)
+        table = coordinate_table(view.size)
+        return [
+            ShotHint(cell=table.from_index(index), probability=probabilities[index])
+            for index in ordered[:k]
+        ]
+
+    def heat_map(self, view: FogBoard) -> Dict[Coordinate, float]:
+        """Estimated hit probability for every unknown cell."""
+        _, probabilities = self._ranking(view)
+        table = coordinate_table(view.size)
+        return {table.from_index(index): p for index, p in probabilities.items()}
+
+    def _ranking(self, view: FogBoard) -> Tuple[List[int], Dict[int, float]]:
+        # Sunk ships come from the board's records: touching ships are not merged
+        key = (self._encode(view), tuple(remaining_ship_sizes(view, self.ship_sizes)))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        ranking = self._compute(view.size, *key)
+        self._cache[key] = ranking
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return ranking
+
+    @staticmethod
+    def _encode(view: FogBoard) -> bytes:
+        size = view.size
+        codes = bytearray(size * size + 1)
+        codes[-1] = size
+        for cell, outcome in view.shots.items():
+            codes[cell.row * size + cell.col] = _CELL_CODES[outcome]
+        return bytes(codes)
+
+    def _compute(self, size: int, codes: bytes, remaining: Tuple[int, ...]) -> Tuple[List[int], Dict[int, float]]:
+        area = size * size
+        unknown = [index for index in range(area) if not codes[index]]
+        blocked = [index for index in range(area) if codes[index] in (1, 3)]
+        hits = [index for index in range(area) if codes[index] == 2]
+
+        weights = dict.fromkeys(unknown, 0)
+        for ship_size in set(remaining):
+            count = remaining.count(ship_size)
+            covers = _cover_masks(self.ruleset, ship_size)
+
+            valid = (1 << len(self.ruleset.placements(ship_size))) - 1
+            for index in blocked:
+                valid &= ~covers[index]
+            through_hits = 0
+            for index in hits:
+                through_hits |= covers[index]
+            through_hits &= valid
+
+            for index in unknown:
+                cover = covers[index]
+                weight = (valid & cover).bit_count()
+                if through_hits:
+                    weight += HIT_WEIGHT * (through_hits & cover).bit_count()
+                weights[index] += count * weight
+
+        total = sum(weights.values())
+        scale = max(sum(remaining) - len(hits), 0) / total if total else 0.0
+        ordered = sorted(unknown, key=lambda index: (-weights[index], index))
+        return ordered, {index: min(1.0, weight * scale) for index, weight in weights.items()}
+
+
+@lru_cache(maxsize=None)
+def shared_hinter(ruleset: Ruleset) -> ShotHinter:
+    """One hinter (and cache) per ruleset for the whole process."""
+    return ShotHinter(ruleset)
@@ -0,0 +1,106 @@
+import random
+from typing import Dict, List, Optional, Tuple
+
+from src.domain import Coordinate, FogBoard, coordinate_table
+from src.engine.sampling import UnshotSampler
+from src.ruleset import Ruleset
+
+# Sparse boards: lattice draws tried per hunt shot before any unshot cell is accepted
+_SPARSE_ATTEMPTS = 64
+
+
+class HuntIndex:
+    """
+    Hunt-mode candidates: unshot cells of the lattice (row + col) % length == offset,
+    where `length` is the shortest ship still afloat. A straight ship of at least that
+    length always crosses the lattice, so no other cell has to be tried while hunting.
+
+    - remove(cell): every shot result, O(1)
+    - sunk(size): when the last ship of the minimum length sinks the lattice gets
+      sparser; it is rebuilt once per length change, on the residue class with the
+      fewest unshot cells
+    - sample(view): O(1) draw from a swap-remove pool (cells shot without the bot
+      being told, like the misses marked around sunk ships, are dropped lazily)
+    On sparse boards there is no pool: lattice cells are drawn by rejection from the
+    brain's UnshotSampler.
+    """
+
+    def __init__(self, ruleset: Ruleset, rng: random.Random, sampler: Optional[UnshotSampler] = None):
+        self.ruleset = ruleset
+        self.rng = rng
+        self.sampler = sampler
+        self.remaining: List[int] = sorted(ruleset.ship_sizes)
+        self.length = 0  # lattice the pool was built for; 0 = not built yet
+        self.offset = 0
+        self._cells: List[int] = []
+        self._position: Dict[int, int] = {}
+
+    def sunk(self, size: int) -> None:
+        if size in self.remaining:
+            self.remaining.remove(size)
+
+    def remove(self, cell: Coordinate) -> None:
+        position = self._position.pop(cell.row * self.ruleset.board_size + cell.col, None)
+        if position is not None:
+            self._remove_at(position)
+
+    def sample(self, view: FogBoard) -> Optional[Coordinate]:
+        """An unshot lattice cell, or None when the lattice is exhausted."""
+        if not self.remaining:
+            return None
+        if self.remaining[0] != self.length:
+            self._rebuild(view)
+        if self.sampler is not None:
+            return self._sample_sparse(view)
+
+        table = coordinate_table(self.ruleset.board_size)
+        while self._cells:
+            position = self.rng.randrange(len(self._cells))
+            cell = table.from_index(self._cells[position])
+            if cell not in view.shots:
+                return cell
+            del self._position[self._cells[position]]
+            self._remove_at(position)
+        return None
+
+    def save(self) -> tuple:
+        return list(self.remaining), self.length, self.offset, list(self._cells)
+
+    def load(self, saved: tuple) -> None:
+        remaining, self.length, self.offset, cells = saved
+        self.remaining = list(remaining)
+        self._cells = list(cells)
+        self._position = {index: position for position, index in enumerate(self._cells)}
+
+    def _rebuild(self, view: FogBoard) -> None:
+        length = self.remaining[0]
+        self.length = length
+        if self.sampler is not None:
+            self.offset = self.rng.randrange(length)
+            return
+
+        size = self.ruleset.board_size
+        shots = view.shots
+        classes: List[List[int]] = [[] for _ in range(length)]
+        for cell in self.ruleset.cells():
+            if cell not in shots:
+                classes[(cell.row + cell.col) % length].append(cell.row * size + cell.col)
+        fewest = min(len(cells) for cells in classes)
+        self.offset = self.rng.choice([offset for offset, cells in enumerate(classes) if len(cells) == fewest])
+        self._cells = classes[self.offset]
+        self._position = {index: position for position, index in enumerate(self._cells)}
+
+    def _sample_sparse(self, view: FogBoard) -> Optional[Coordinate]:
+        cell = None
+        for _ in range(_SPARSE_ATTEMPTS * self.length):
+            cell = self.sampler.sample(view)
+            if cell is None or (cell.row + cell.col) % self.length == self.offset:
+                return cell
+        # Lattice (nearly) exhausted: any unshot cell will do
+        return cell
+
+    def _remove_at(self, position: int) -> None:
+        last = self._cells.pop()
+        if position < len(self._cells):
+            self._cells[position] = last
+            self._position[last] = position
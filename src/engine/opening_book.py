@@ -0,0 +1,292 @@
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.domain import Coordinate, FogBoard, ShotOutcome, coordinate_table
+from src.engine.placements import remaining_ship_sizes
+from src.ruleset import Ruleset
+
+_MAGIC = b"SBBOOK"
+_VERSION = 1
+# magic, version, ruleset fingerprint, book id (digest of the slots), slot count, entries,
+# depth (bot shots), largest fog board (cells)
+_HEADER = struct.Struct("<6sB8s8sIIHH")
+# fog key (0 = empty slot), up to CANDIDATES cell indices (_NO_CELL = unused)
+_SLOT = struct.Struct("<Q4H")
+CANDIDATES = 4
+_NO_CELL = 0xFFFF
+
+_OUTCOME_CODE: Dict[ShotOutcome, int] = {ShotOutcome.MISS: 1, ShotOutcome.HIT: 2, ShotOutcome.SUNK: 3}
+# Placements through k unsunk hits weigh _HIT_WEIGHT ** k: finishing a found ship comes first
+_HIT_WEIGHT = 64
+# Reach probability of a hit is estimated, never taken as certain
+_MAX_HIT_PROBABILITY = 0.95
+
+# path -> ((mtime_ns, size), book): one mapping per file for the whole process
+_CACHE: Dict[Path, Tuple[Tuple[int, int], "OpeningBook"]] = {}
+
+
+def fog_key(view: FogBoard) -> int:
+    """64-bit key of a fog board (its shot cells and outcomes), stable across processes; never 0."""
+    size = view.size
+    codes = sorted(((cell.row * size + cell.col) << 2) | _OUTCOME_CODE[outcome]
+                   for cell, outcome in view.shots.items())
+    digest = hashlib.blake2b(array("H", codes).tobytes(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+def ruleset_fingerprint(ruleset: Ruleset) -> bytes:
+    """What a book depends on: board size, fleet and the touching rule (not the name or salvo)."""
+    text = f"{ruleset.board_size}|{sorted(ruleset.ship_sizes)}|{ruleset.allow_touching}"
+    return hashlib.blake2b(text.encode("ascii"), digest_size=8).digest()
+
+
+class OpeningBook:
+    """
+    Precomputed bot moves for opening fog boards, read from a memory-mapped hash table.
+
+    The file is a small header and a power-of-two array of 16-byte slots (fog key +
+    up to four equally good cells), linear probing on the low key bits. Nothing is
+    parsed at startup: a lookup hashes the fog board and reads a slot or two from the
+    mapping, and the pages are shared by every process that maps the same file.
+    """
+
+    def __init__(self, data: mmap.mmap, ruleset: Ruleset, file_path: Optional[Path] = None):
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Truncated opening book: {file_path}")
+        magic, version, fingerprint, book_id, slots, entries, depth, max_cells = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not an opening book (or an unsupported version): {file_path}")
+        if fingerprint != ruleset_fingerprint(ruleset):
+            raise ValueError(f"Opening book {file_path} was built for a different board or fleet")
+        if slots & (slots - 1) or len(data) < _HEADER.size + slots * _SLOT.size:
+            raise ValueError(f"Truncated opening book: {file_path}")
+        self.ruleset = ruleset
+        self.file_path = file_path
+        # Recorded in the game meta, so a replay can tell whether it has the book the game was played with
+        self.book_id = book_id.hex()
+        self.entries = entries
+        self.depth = depth
+        # Boards with more shot cells than this are never in the book: no lookup needed
+        self.max_cells = max_cells
+        self._data = data
+        self._mask = slots - 1
+        self._table = coordinate_table(ruleset.board_size)
+
+    @classmethod
+    def open(cls, file_path: str | Path, ruleset: Ruleset) -> "OpeningBook":
+        """Maps the book file; reused while the file's mtime and size are unchanged."""
+        path = Path(file_path)
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = _CACHE.get(path)
+        if cached is not None and cached[0] == key and cached[1].ruleset == ruleset:
+            return cached[1]
+
+        with path.open("rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        book = cls(data, ruleset, path)
+        _CACHE[path] = (key, book)
+        return book
+
+    def __deepcopy__(self, memo) -> "OpeningBook":
+        # Read-only: brain snapshots and copies share the mapping
+        return self
+
+    def __reduce__(self):
+        # Other processes map the same file instead of receiving a copy
+        return OpeningBook.open, (self.file_path, self.ruleset)
+
+    def lookup(self, view: FogBoard) -> Tuple[Coordinate, ...]:
+        """The book's cells for `view` (empty when the position is not in the book)."""
+        if len(view.shots) > self.max_cells:
+            return ()
+        key = fog_key(view)
+        slot = key & self._mask
+        while True:
+            stored, *cells = _SLOT.unpack_from(self._data, _HEADER.size + slot * _SLOT.size)
+            if stored == key:
+                return tuple(self._table.from_index(index) for index in cells if index != _NO_CELL)
+            if stored == 0:
+                return ()
+            slot = (slot + 1) & self._mask
+
+    @staticmethod
+    def write(file_path: str | Path, ruleset: Ruleset, entries: Dict[int, Tuple[int, ...]],
+              depth: int, max_cells: int) -> None:
+        """Writes `entries` (fog key -> cell indices) as a book file, at most half full (temp file + rename)."""
+        slots = 1
+        while slots < 2 * max(len(entries), 1):
+            slots *= 2
+        blob = bytearray(_HEADER.size + slots * _SLOT.size)
+        taken = bytearray(slots)
+        for key, cells in entries.items():
+            slot = key & (slots - 1)
+            while taken[slot]:
+                slot = (slot + 1) & (slots - 1)
+            taken[slot] = 1
+            padded = (tuple(cells) + (_NO_CELL,) * CANDIDATES)[:CANDIDATES]
+            _SLOT.pack_into(blob, _HEADER.size + slot * _SLOT.size, key, *padded)
+        book_id = hashlib.blake2b(memoryview(blob)[_HEADER.size:], digest_size=8).digest()
+        _HEADER.pack_into(blob, 0, _MAGIC, _VERSION, ruleset_fingerprint(ruleset), book_id, slots, len(entries),
+                          depth, max_cells)
+
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_bytes(blob)
+        os.replace(tmp_path, path)
+
+
+class OpeningBookBuilder:
+    """
+    Enumerates the fog boards the bot can meet in its first `depth` shots and the best
+    cells to fire at on each.
+
+    - best cells: the largest placement density over the remaining ships (placements
+      that avoid misses and sunk ships; the ones through unsunk hits weigh far more),
+      up to CANDIDATES exact ties; the bot picks one of them at random
+    - successors: every outcome the shot can have (miss, hit, sunk when the hit
+      completes a straight run of a remaining ship length, with the surroundings
+      marked as misses like the game does)
+    - boards are expanded most likely first (estimated from the density), so when
+      `max_entries` is reached the book holds the openings that recur most
+    """
+
+    def __init__(self, ruleset: Ruleset, depth: int = 12, max_entries: int = 50_000):
+        if ruleset.sparse:
+            raise ValueError(f"Opening books are not available on sparse boards ({ruleset.board_size}x{ruleset.board_size})")
+        if depth < 1 or max_entries < 1:
+            raise ValueError("Opening book depth and size must be positive")
+        self.ruleset = ruleset
+        self.depth = depth
+        self.max_entries = max_entries
+        # Per ship length: (cells bitmask, bitmask of the cells around it no other ship may use, cell indices)
+        self._placements: Dict[int, List[Tuple[int, int, Tuple[int, ...]]]] = {}
+        board_size = ruleset.board_size
+        for length in set(ruleset.ship_sizes):
+            rows = []
+            for placement in ruleset.placements(length):
+                cells = tuple(cell.row * board_size + cell.col for cell in placement)
+                mask = sum(1 << index for index in cells)
+                halo = 0
+                for cell in placement:
+                    for near in ruleset.exclusion_zone(cell):
+                        halo |= 1 << (near.row * board_size + near.col)
+                rows.append((mask, halo & ~mask, cells))
+            self._placements[length] = rows
+
+    def build(self) -> Tuple[Dict[int, Tuple[int, ...]], int]:
+        """Returns (entries, largest fog board in cells)."""
+        entries: Dict[int, Tuple[int, ...]] = {}
+        max_cells = 0
+        seen = set()
+        tiebreak = 0  # heap order: likeliest first, then insertion order (boards are never compared)
+        table = coordinate_table(self.ruleset.board_size)
+        queue: List[Tuple[float, int, int, FogBoard]] = [(-1.0, tiebreak, 0, FogBoard(size=self.ruleset.board_size))]
+        while queue and len(entries) < self.max_entries:
+            probability, _, shots, view = heapq.heappop(queue)
+            key = fog_key(view)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            density, hit_chance = self._density(view)
+            if not density:
+                continue
+            best = max(density.values())
+            cells = sorted(index for index, weight in density.items() if weight == best)[:CANDIDATES]
+            entries[key] = tuple(cells)
+            max_cells = max(max_cells, len(view.shots))
+            if shots + 1 >= self.depth:
+                continue
+
+            share = -probability / len(cells)
+            for index in cells:
+                cell = table.from_index(index)
+                for outcome_chance, child in self._successors(view, cell, hit_chance[index]):
+                    if outcome_chance > 0:
+                        tiebreak += 1
+                        heapq.heappush(queue, (-share * outcome_chance, tiebreak, shots + 1, child))
+        return entries, max_cells
+
+    def _density(self, view: FogBoard) -> Tuple[Dict[int, int], Dict[int, float]]:
+        """(placement weight per unshot cell index, estimated hit probability per unshot cell index)."""
+        size = view.size
+        blocked = hits = shot = 0
+        for cell, outcome in view.shots.items():
+            bit = 1 << (cell.row * size + cell.col)
+            shot |= bit
+            if outcome == ShotOutcome.HIT:
+                hits |= bit
+            else:
+                blocked |= bit
+        remaining = remaining_ship_sizes(view, self.ruleset.ship_sizes)
+        density: Dict[int, int] = {}
+        chance: Dict[int, float] = {}
+        for length in set(remaining):
+            copies = remaining.count(length)
+            weighted: Dict[int, int] = {}
+            total = 0
+            for mask, halo, cells in self._placements[length]:
+                if mask & blocked or halo & hits:
+                    continue
+                through = (mask & hits).bit_count()
+                if through == length:
+                    continue
+                weight = _HIT_WEIGHT ** through
+                total += weight
+                for index in cells:
+                    if not shot >> index & 1:
+                        weighted[index] = weighted.get(index, 0) + weight
+            for index, weight in weighted.items():
+                density[index] = density.get(index, 0) + copies * weight
+                chance[index] = chance.get(index, 0.0) + copies * weight / total
+        return density, {index: min(value, _MAX_HIT_PROBABILITY) for index, value in chance.items()}
+
+    def _successors(self, view: FogBoard, cell: Coordinate, hit_chance: float) -> List[Tuple[float, FogBoard]]:
+        miss = FogBoard(size=view.size, shots=dict(view.shots))
+        miss.set_miss(cell)
+        result = [(1.0 - hit_chance, miss)]
+
+        run = self._hit_run(view, cell)
+        if run is None:
+            hit = FogBoard(size=view.size, shots=dict(view.shots))
+            hit.set_hit(cell)
+            return result + [(hit_chance, hit)]
+
+        remaining = remaining_ship_sizes(view, self.ruleset.ship_sizes)
+        outcomes: List[FogBoard] = []
+        if len(run) in remaining:
+            sunk = FogBoard(size=view.size, shots=dict(view.shots))
+            for part in run:
+                sunk.set_sunk(part)
+            for part in run:
+                for near in self.ruleset.exclusion_zone(part):
+                    sunk.set_miss(near)
+            outcomes.append(sunk)
+        if any(size > len(run) for size in remaining):
+            hit = FogBoard(size=view.size, shots=dict(view.shots))
+            hit.set_hit(cell)
+            outcomes.append(hit)
+        return result + [(hit_chance / len(outcomes), board) for board in outcomes]
+
+    def _hit_run(self, view: FogBoard, cell: Coordinate) -> Optional[List[Coordinate]]:
+        """`cell` and the unsunk hits 4-connected to it, if they form a straight line (else None)."""
+        table = coordinate_table(view.size)
+        run = [cell]
+        stack = [cell]
+        while stack:
+            current = stack.pop()
+            for near in table.neighbors_4(current):
+                if near not in run and view.shots.get(near) == ShotOutcome.HIT:
+                    run.append(near)
+                    stack.append(near)
+        if len({part.row for part in run}) > 1 and len({part.col for part in run}) > 1:
+            return None
+        return run
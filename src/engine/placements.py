@@ -0,0 +1,130 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from src.domain import Coordinate, FogBoard, ShotOutcome, coordinate_table
+from src.ruleset import CLASSIC, Placement, Ruleset
+
+# One joint placement of several ships
+Configuration = Tuple[Placement, ...]
+
+
+def sunk_ship_sizes(view: FogBoard) -> List[int]:
+    """
+    Lengths of the ships marked SUNK on a fog board.
+    Ships recorded by FogBoard.mark_sunk count as they sank (touching ships stay apart);
+    SUNK cells without a record (e.g. boards decoded from a file) are grouped 4-connected.
+    """
+    sizes: List[int] = [len(ship) for ship in view.sunk_ships]
+    sunk_cells = [cell for cell, outcome in view.shots.items() if outcome == ShotOutcome.SUNK]
+    if len(sunk_cells) == sum(sizes):
+        # Every SUNK cell belongs to a recorded ship (the usual case during a game)
+        return sizes
+    recorded = {cell for ship in view.sunk_ships for cell in ship}
+    sunk = {cell for cell in sunk_cells if cell not in recorded}
+    table = coordinate_table(view.size)
+    while sunk:
+        stack = [sunk.pop()]
+        length = 0
+        while stack:
+            cell = stack.pop()
+            length += 1
+            for near in table.neighbors_4(cell):
+                if near in sunk:
+                    sunk.remove(near)
+                    stack.append(near)
+        sizes.append(length)
+    return sizes
+
+
+def remaining_ship_sizes(view: FogBoard, ship_sizes: Sequence[int]) -> List[int]:
+    """Fleet composition minus the ships already sunk on the fog board."""
+    remaining = sorted(ship_sizes, reverse=True)
+    for size in sunk_ship_sizes(view):
+        if size in remaining:
+            remaining.remove(size)
+    return remaining
+
+
+def shot_masks(view: FogBoard) -> Tuple[int, int]:
+    """(unsunk hits, misses and sunk cells) of a fog board as bitmasks, bit index = row * size + col."""
+    size = view.size
+    hit_mask = closed_mask = 0
+    for cell, outcome in view.shots.items():
+        if outcome == ShotOutcome.HIT:
+            hit_mask |= 1 << (cell.row * size + cell.col)
+        else:
+            closed_mask |= 1 << (cell.row * size + cell.col)
+    return hit_mask, closed_mask
+
+
+def consistent_configurations(view: FogBoard, sizes: Sequence[int], ruleset: Ruleset = CLASSIC,
+                              limit: Optional[int] = None) -> Optional[List[Configuration]]:
+    """
+    All joint placements of the remaining ships that agree with the fog board:
+    - no ship on a miss or sunk cell, ships do not overlap (or touch, unless allowed);
+    - every unsunk hit is covered, and when touching is forbidden a hit next to a ship
+      belongs to that ship;
+    - no ship is fully hit (it would have been reported as sunk).
+    Returns None as soon as more than `limit` configurations exist.
+    """
+    hit_mask, closed_mask = shot_masks(view)
+    hit_count = hit_mask.bit_count()
+    order = sorted(sizes, reverse=True)
+
+    candidates: Dict[int, List[Tuple[Placement, int, int]]] = {
+        ship_size: [
+            (placement, mask, area)
+            for placement, mask, area in _placement_masks(ruleset, ship_size)
+            if not mask & closed_mask and mask & ~hit_mask and not area & ~mask & hit_mask
+        ]
+        for ship_size in set(order)
+    }
+
+    result: List[Configuration] = []
+    chosen: List[Placement] = []
+    total_cells = sum(order)
+
+    def place(index: int, start: int, blocked: int, covered_hits: int, placed_cells: int) -> bool:
+        if hit_count - covered_hits > total_cells - placed_cells:
+            return True
+        if index == len(order):
+            if covered_hits == hit_count:
+                result.append(tuple(chosen))
+                if limit is not None and len(result) > limit:
+                    return False
+            return True
+
+        ship_size = order[index]
+        options = candidates[ship_size]
+        # Equal sizes are placed in increasing option order to skip permutations
+        first = start if index > 0 and order[index - 1] == ship_size else 0
+        for option_index in range(first, len(options)):
+            placement, mask, area = options[option_index]
+            if mask & blocked:
+                continue
+            chosen.append(placement)
+            keep_going = place(index + 1, option_index + 1, blocked | area,
+                               covered_hits + (mask & hit_mask).bit_count(), placed_cells + ship_size)
+            chosen.pop()
+            if not keep_going:
+                return False
+        return True
+
+    if not place(0, 0, 0, 0, 0):
+        return None
+    return result
+
+
+@lru_cache(maxsize=None)
+def _placement_masks(ruleset: Ruleset, size: int) -> Tuple[Tuple[Placement, int, int], ...]:
+    """(placement, its cells, its cells and exclusion zone) for every placement of `size`, cells as bitmasks."""
+    board_size = ruleset.board_size
+    result = []
+    for placement in ruleset.placements(size):
+        mask = area = 0
+        for cell in placement:
+            mask |= 1 << (cell.row * board_size + cell.col)
+            for near in ruleset.exclusion_zone(cell):
+                area |= 1 << (near.row * board_size + near.col)
+        result.append((placement, mask, area | mask))
+    return tuple(result)
@@ -0,0 +1,167 @@
+import copy
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Set, Tuple
+
+from src.domain import Coordinate, Fleet, GameMeta, GameState, TurnSide, moves_of
+from src.engine.bot_brain import BotBrain
+from src.engine.game_manager import GameManager
+from src.engine.opening_book import OpeningBook
+from src.ruleset import Ruleset
+
+
+@dataclass
+class _ReplaySnapshot:
+    state: GameState
+    player_hits_on_bot: Set[Coordinate]
+    bot_hits_on_player: Set[Coordinate]
+    bot_brain: BotBrain
+
+
+class ReplayEngine:
+    """
+    Deterministic replay of a recorded game, under the ruleset recorded in its meta.
+
+    Rebuilds the exact GameManager state (boards, hits, bot brain) at any turn:
+    - seek(turn) restores the nearest periodic snapshot and fast-forwards from it;
+    - step_forward()/step_back() move one turn at a time.
+    With verify=True every bot shot is re-chosen by a BotBrain seeded from the
+    meta and must match the recorded one; games played with an opening book need
+    that same book (`opening_book`) to verify. Without verify a book whose id is not
+    the recorded one is ignored.
+    A caller-built `bot_brain` (seeded from the meta, e.g. the adaptive one) is
+    used instead: seek() to the last turn then leaves it ready to go on playing.
+    """
+
+    def __init__(self, meta: GameMeta, player_fleet: Fleet, bot_fleet: Fleet,
+                 turns: Sequence[Tuple[TurnSide, TurnSide]], snapshot_every: int = 16, verify: bool = False,
+                 opening_book: Optional[OpeningBook] = None, bot_brain: Optional[BotBrain] = None):
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be >= 1")
+
+        self.meta = meta
+        self.turns = list(turns)
+        self.snapshot_every = snapshot_every
+        self.verify = verify
+
+        if verify and meta.opening_book and (opening_book is None or opening_book.book_id != meta.opening_book):
+            raise ValueError(f"Game was played with opening book {meta.opening_book}, which is not available to verify against")
+        if opening_book is not None and opening_book.book_id != meta.opening_book:
+            opening_book = None
+
+        ruleset = Ruleset.from_meta(meta)
+        self.manager = GameManager(
+            player_fleet=player_fleet,
+            bot_fleet=bot_fleet,
+            bot_brain=bot_brain or BotBrain(seed=meta.bot_seed, ruleset=ruleset, opening_book=opening_book),
+            ruleset=ruleset,
+        )
+        # snapshots[i] is the state after turn i * snapshot_every
+        self._snapshots: List[_ReplaySnapshot] = [self._take_snapshot()]
+
+    @classmethod
+    def from_repositories(cls, meta_repo, player_repo, bot_repo, state_repo, **kwargs) -> "ReplayEngine":
+        state = state_repo.load()
+        return cls(
+            meta=meta_repo.load(),
+            player_fleet=player_repo.load(),
+            bot_fleet=bot_repo.load(),
+            turns=state.turn_history,
+            **kwargs,
+        )
+
+    @property
+    def position(self) -> int:
+        return self.manager.state.turn_number
+
+    @property
+    def state(self) -> GameState:
+        return self.manager.state
+
+    def seek(self, turn: int) -> GameState:
+        if not (0 <= turn <= len(self.turns)):
+            raise ValueError(f"Turn out of range: {turn} (0..{len(self.turns)})")
+
+        # Only rewind when the target is behind us or a later snapshot is closer
+        nearest = min(turn // self.snapshot_every, len(self._snapshots) - 1)
+        if turn < self.position or nearest * self.snapshot_every > self.position:
+            self._restore_snapshot(self._snapshots[nearest])
+
+        while self.position < turn:
+            self._apply_turn(self.turns[self.position])
+        return self.state
+
+    def step_forward(self) -> GameState:
+        if self.position >= len(self.turns):
+            raise ValueError("Already at the last recorded turn")
+        return self.seek(self.position + 1)
+
+    def step_back(self) -> GameState:
+        if self.position <= 0:
+            raise ValueError("Already at the first turn")
+        return self.seek(self.position - 1)
+
+    def _apply_turn(self, turn: Tuple[TurnSide, TurnSide]) -> None:
+        if self.manager.ruleset.salvo:
+            self._apply_salvo_turn(turn)
+        else:
+            self._apply_single_turn(turn)
+
+        if self.position % self.snapshot_every == 0 and self.position // self.snapshot_every == len(self._snapshots):
+            self._snapshots.append(self._take_snapshot())
+
+    def _apply_single_turn(self, turn: Tuple[TurnSide, TurnSide]) -> None:
+        (player_move,), (bot_move,) = moves_of(turn[0]), moves_of(turn[1])
+        turn_number = self.position + 1
+
+        player_outcome = self.manager.apply_player_shot(player_move.target)
+
+        # Always let the brain choose so its RNG and targeting stay in sync with the record
+        chosen = self.manager.choose_bot_target()
+        if self.verify and chosen != bot_move.target:
+            raise ValueError(
+                f"Replay diverged at turn {turn_number}: bot chose {chosen}, recorded {bot_move.target}"
+            )
+        bot_target, bot_outcome = self.manager.apply_bot_shot(target=bot_move.target)
+
+        if (player_outcome, bot_outcome) != (player_move.outcome, bot_move.outcome):
+            raise ValueError(f"Replay diverged at turn {turn_number}: outcomes do not match the record")
+
+        self.manager.commit_turn(
+            player_target=player_move.target, player_outcome=player_outcome,
+            bot_target=bot_target, bot_outcome=bot_outcome,
+        )
+
+    def _apply_salvo_turn(self, turn: Tuple[TurnSide, TurnSide]) -> None:
+        player_moves, bot_moves = moves_of(turn[0]), moves_of(turn[1])
+        turn_number = self.position + 1
+
+        player_targets = [move.target for move in player_moves]
+        player_outcomes = self.manager.apply_shots(player_targets)
+
+        recorded = [move.target for move in bot_moves]
+        chosen = self.manager.choose_bot_salvo()
+        if self.verify and chosen != recorded:
+            raise ValueError(f"Replay diverged at turn {turn_number}: bot chose {chosen}, recorded {recorded}")
+        bot_shots = self.manager.apply_bot_salvo(targets=recorded)
+
+        if (player_outcomes != [move.outcome for move in player_moves]
+                or [outcome for _, outcome in bot_shots] != [move.outcome for move in bot_moves]):
+            raise ValueError(f"Replay diverged at turn {turn_number}: outcomes do not match the record")
+
+        self.manager.commit_salvo_turn(list(zip(player_targets, player_outcomes)), bot_shots)
+
+    def _take_snapshot(self) -> _ReplaySnapshot:
+        return copy.deepcopy(_ReplaySnapshot(
+            state=self.manager.state,
+            player_hits_on_bot=self.manager.player_hits_on_bot,
+            bot_hits_on_player=self.manager.bot_hits_on_player,
+            bot_brain=self.manager.bot_brain,
+        ))
+
+    def _restore_snapshot(self, snapshot: _ReplaySnapshot) -> None:
+        # Copy again: the stored snapshot must stay untouched for later seeks
+        restored = copy.deepcopy(snapshot)
+        self.manager.state = restored.state
+        self.manager.player_hits_on_bot = restored.player_hits_on_bot
+        self.manager.bot_hits_on_player = restored.bot_hits_on_player
+        self.manager.bot_brain = restored.bot_brain
@@ -0,0 +1,50 @@
+import random
+from typing import Dict, Optional, Tuple
+
+from src.domain import Coordinate, FogBoard, coordinate_table
+
+
+class UnshotSampler:
+    """
+    Uniform random choice among unshot cells without enumerating the board.
+
+    A virtual swap-remove pool over cell indices 0..area-1: only positions whose
+    content changed are stored, so memory is O(removed cells) and each draw is
+    O(1) amortized. Cells shot elsewhere (player-chosen targets, auto-marked misses)
+    are dropped lazily the first time they are drawn.
+    """
+
+    def __init__(self, board_size: int, rng: random.Random):
+        self.board_size = board_size
+        self.rng = rng
+        self._table = coordinate_table(board_size)
+        self._size = board_size * board_size
+        # pool position -> cell index stored there, only where it differs from the position
+        self._moved: Dict[int, int] = {}
+
+    def sample(self, view: FogBoard) -> Optional[Coordinate]:
+        """A uniformly random unshot cell, or None when every cell has been shot."""
+        while self._size:
+            position = self.rng.randrange(self._size)
+            index = self._moved.get(position, position)
+            cell = self._table.from_index(index)
+            if not view.has_been_shot(cell):
+                return cell
+            self._remove_at(position)
+        return None
+
+    def save(self) -> Tuple[int, Dict[int, int]]:
+        """Copy of the pool, O(removed cells); restore with load()."""
+        return self._size, dict(self._moved)
+
+    def load(self, saved: Tuple[int, Dict[int, int]]) -> None:
+        size, moved = saved
+        self._size, self._moved = size, dict(moved)
+
+    def _remove_at(self, position: int) -> None:
+        # Swap the last pool entry into the freed position, then shrink the pool
+        last = self._size - 1
+        last_index = self._moved.pop(last, last)
+        if position != last:
+            self._moved[position] = last_index
+        self._size = last
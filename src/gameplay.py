@@ -1,23 +1,50 @@
-from typing import Optional
+from typing import Callable, List, Optional
 
+from src.domain import Coordinate
 from src.engine.game_manager import GameManager
 from src.storage.base import GameStateRepository
-from src.ui.console_renderer import ConsoleRenderer
-from src.ui.console_input import ConsoleInputProvider
 
 
-def run_cli_game(manager: GameManager, state_repo: Optional[GameStateRepository], resume: bool) -> None:
+def run_cli_game(manager: GameManager, state_repo: Optional[GameStateRepository], resume: bool,
+                 show_hints: bool = False, on_turn_saved: Optional[Callable[[GameManager], None]] = None) -> None:
     """
     Controller loop for CLI.
     - Input: ConsoleInputProvider
     - Output: ConsoleRenderer
-    - Persistence: GameStateRepository
+    - Persistence: GameStateRepository (fed incrementally from manager.events)
+    - show_hints: overlay the shot-hint heat map and print the top suggestions
+    - on_turn_saved: called right after each turn was appended to state_repo, when the
+      manager holds exactly what was persisted (e.g. to refresh the fast-start snapshot)
     """
-    renderer = ConsoleRenderer()
-    input_provider = ConsoleInputProvider()
+    # UI modules are loaded on first use to keep process startup cheap
+    from src.ui.console_renderer import ConsoleRenderer
+    from src.ui.console_input import ConsoleInputProvider
+
+    if show_hints and manager.ruleset.sparse:
+        print("Shot hints are not available on sparse boards.")
+        show_hints = False
+
+    renderer = ConsoleRenderer(manager.ruleset)
+    input_provider = ConsoleInputProvider(manager.ruleset)
+
+    def render() -> None:
+        if not show_hints:
+            renderer.render(manager.state, manager.player_fleet)
+            return
+        renderer.render(manager.state, manager.player_fleet, hints=manager.player_heat_map())
+        suggestions = ", ".join(
+            f"{manager.ruleset.cell_label(hint.cell)} ({hint.probability:.0%})"
+            for hint in manager.suggest_player_shots(3)
+        )
+        if suggestions:
+            print(f"Hint: {suggestions}")
+
+    # Persistence follows the game's events, so each append only writes what changed
+    if state_repo is not None:
+        state_repo.follow(manager.events, manager.state)
 
     # Show current state (including loaded state if resume=True)
-    renderer.render(manager.state, manager.player_fleet)
+    render()
 
     while True:
         result = manager.is_game_over()
@@ -25,6 +52,15 @@ def run_cli_game(manager: GameManager, state_repo: Optional[GameStateRepository]
             print(f"Game over! Winner: {result.winner}")
             break
 
+        if manager.ruleset.salvo:
+            player_targets = _read_salvo(manager, input_provider)
+            player_outcomes = manager.apply_shots(player_targets)
+            bot_shots = manager.apply_bot_salvo()
+            manager.commit_salvo_turn(list(zip(player_targets, player_outcomes)), bot_shots)
+            _persist_turn(manager, state_repo, on_turn_saved)
+            render()
+            continue
+
         # Player move (repeat if player shoots the same cell twice)
         while True:
             player_target = input_provider.read_shot_coordinate()
@@ -42,7 +78,31 @@ def run_cli_game(manager: GameManager, state_repo: Optional[GameStateRepository]
             player_target=player_target, player_outcome=player_outcome,
             bot_target=bot_target, bot_outcome=bot_outcome,
         )
-        if state_repo is not None:
-            state_repo.append_turn(manager.state)
+        _persist_turn(manager, state_repo, on_turn_saved)
+
+        render()
+
+
+def _persist_turn(manager: GameManager, state_repo: Optional[GameStateRepository],
+                  on_turn_saved: Optional[Callable[[GameManager], None]]) -> None:
+    if state_repo is None:
+        return
+    state_repo.append_turn(manager.state)
+    if on_turn_saved is not None:
+        on_turn_saved(manager)
+
 
-        renderer.render(manager.state, manager.player_fleet)
+def _read_salvo(manager: GameManager, input_provider) -> List[Coordinate]:
+    """One distinct, not yet shot cell per surviving player ship."""
+    count = manager.salvo_size("player")
+    print(f"Salvo: {count} shot(s)")
+    targets: List[Coordinate] = []
+    while len(targets) < count:
+        target = input_provider.read_shot_coordinate()
+        if manager.state.player_view.has_been_shot(target):
+            print("This cell was already shot/marked by the player.")
+        elif target in targets:
+            print("This cell is already part of the salvo.")
+        else:
+            targets.append(target)
+    return targets
@@ -0,0 +1,156 @@
+import json
+import sys
+from typing import Dict, List, Optional, TextIO
+
+from src.domain import Coordinate, Fleet, GameEvent, Ship, ShotOutcome, fog_changes
+from src.engine.bot_brain import BotBrain
+from src.engine.game_manager import GameManager
+from src.placement.bot_setup import RandomFleetGenerator
+from src.ruleset import CLASSIC, Ruleset, get_ruleset
+from src.validators.fleet_validator import validate_fleet_or_raise
+
+# Same cell symbols as the sparse delta format (SparseCsvGameStateRepository)
+_SYMBOLS = {ShotOutcome.MISS: "o", ShotOutcome.HIT: "x", ShotOutcome.SUNK: "s"}
+
+
+class JsonlSession:
+    """
+    Headless controller speaking JSON lines: one request per input line, one or
+    more response lines per request.
+
+    Requests:
+      {"cmd": "new", "ruleset": "classic", "seed": 7, "fleet": [[[row, col], ...], ...], "endgame": true}
+        all fields are optional; without a fleet the player's is random, and "endgame": false
+        turns off the bot's exact endgame solver (weaker bot, no multi-millisecond endgame moves)
+      {"cmd": "shoot", "target": [row, col]}       ({"targets": [[row, col], ...]} in salvo games)
+      {"cmd": "quit"}
+    Responses:
+      {"event": "new", "board_size": 10, "ship_sizes": [...], "salvo": false}
+      {"event": "delta", "turn": 3, "player": [[row, col, "o"], ...], "bot": [[row, col, "x"], ...]}
+        fog cells changed by the turn on each side's board (o = miss, x = hit, s = sunk)
+      {"event": "game_over", "winner": "player", "turn": 41}
+      {"event": "error", "message": "..."}               (the game is left unchanged)
+
+    Nothing is rendered or re-encoded per move: deltas are formatted straight from
+    the game's events, and one JSON decoder/encoder pair serves the whole session.
+    """
+
+    def __init__(self, output: TextIO, flush: bool = True):
+        self.output = output
+        self.flush = flush
+        self.manager: Optional[GameManager] = None
+        self._decode = json.JSONDecoder().decode
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+        self._changes: Dict[str, List[str]] = {"player": [], "bot": []}
+
+    def serve(self, lines) -> None:
+        """Handles request lines until "quit" or end of input."""
+        for line in lines:
+            if line.strip() and not self.handle(line):
+                break
+
+    def handle(self, line: str) -> bool:
+        """One request line; False after "quit"."""
+        try:
+            request = self._decode(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            cmd = request.get("cmd")
+            if cmd == "shoot":
+                self._shoot(request)
+            elif cmd == "new":
+                self._new_game(request)
+            elif cmd == "quit":
+                return False
+            else:
+                raise ValueError(f"Unknown command: {cmd!r}")
+        except (ValueError, TypeError, KeyError, IndexError) as e:
+            self._write(self._encode({"event": "error", "message": str(e)}))
+        return True
+
+    def _new_game(self, request: dict) -> None:
+        ruleset = get_ruleset(request.get("ruleset", CLASSIC.name))
+        seed = request.get("seed")
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            raise ValueError(f"Seed must be an integer: {json.dumps(seed)}")
+        if "fleet" in request:
+            player_fleet = self._parse_fleet(ruleset, request["fleet"])
+            validate_fleet_or_raise(player_fleet, ruleset)
+        else:
+            player_fleet = RandomFleetGenerator(seed=None if seed is None else seed + 1, ruleset=ruleset).generate()
+        bot_fleet = RandomFleetGenerator(seed=seed, ruleset=ruleset).generate()
+
+        bot_brain = BotBrain(seed=seed, ruleset=ruleset, endgame_threshold=12 if request.get("endgame", True) else 0)
+        self.manager = GameManager(player_fleet, bot_fleet, bot_brain, ruleset=ruleset)
+        self.manager.events.subscribe(self._on_event)
+        for changes in self._changes.values():
+            changes.clear()
+        self._write(self._encode({
+            "event": "new",
+            "board_size": ruleset.board_size,
+            "ship_sizes": list(ruleset.ship_sizes),
+            "salvo": ruleset.salvo,
+        }))
+
+    def _shoot(self, request: dict) -> None:
+        manager = self.manager
+        if manager is None:
+            raise ValueError("No game: send {\"cmd\": \"new\"} first")
+        if manager.is_game_over().winner is not None:
+            raise ValueError("Game is over: send {\"cmd\": \"new\"} to start another")
+
+        if manager.ruleset.salvo:
+            raw_targets = request.get("targets")
+            if not isinstance(raw_targets, list):
+                raise ValueError("Salvo games shoot with \"targets\": [[row, col], ...]")
+            targets = [self._parse_cell(manager.ruleset, cell) for cell in raw_targets]
+            if len(targets) != manager.salvo_size("player"):
+                raise ValueError(f"Salvo needs {manager.salvo_size('player')} shot(s), got {len(targets)}")
+            outcomes = manager.apply_shots(targets)
+            bot_shots = manager.apply_bot_salvo()
+            manager.commit_salvo_turn(list(zip(targets, outcomes)), bot_shots)
+        else:
+            target = self._parse_cell(manager.ruleset, request.get("target"))
+            outcome = manager.apply_player_shot(target)
+            bot_target, bot_outcome = manager.apply_bot_shot()
+            manager.commit_turn(target, outcome, bot_target, bot_outcome)
+
+        turn = manager.state.turn_number
+        player, bot = self._changes["player"], self._changes["bot"]
+        self._write(f'{{"event":"delta","turn":{turn},"player":[{",".join(player)}],"bot":[{",".join(bot)}]}}')
+        player.clear()
+        bot.clear()
+
+        winner = manager.is_game_over().winner
+        if winner is not None:
+            self._write(f'{{"event":"game_over","winner":"{winner}","turn":{turn}}}')
+
+    def _on_event(self, event: GameEvent) -> None:
+        for actor, cell, outcome in fog_changes(event):
+            self._changes[actor].append(f'[{cell.row},{cell.col},"{_SYMBOLS[outcome]}"]')
+
+    def _write(self, line: str) -> None:
+        self.output.write(line + "\n")
+        if self.flush:
+            self.output.flush()
+
+    @staticmethod
+    def _parse_cell(ruleset: Ruleset, raw) -> Coordinate:
+        # bool is an int subclass: [true, 1] must not fire at (1, 1)
+        if not (isinstance(raw, list) and len(raw) == 2
+                and all(isinstance(value, int) and not isinstance(value, bool) for value in raw)):
+            raise ValueError(f"Cell must be [row, col] integers: {json.dumps(raw)}")
+        row, col = raw
+        if not (0 <= row < ruleset.board_size and 0 <= col < ruleset.board_size):
+            raise ValueError(f"Cell out of bounds: {raw}")
+        return ruleset.cell_at(row, col)
+
+    @classmethod
+    def _parse_fleet(cls, ruleset: Ruleset, raw) -> Fleet:
+        if not (isinstance(raw, list) and all(isinstance(ship, list) and ship for ship in raw)):
+            raise ValueError("Fleet must be a list of ships, each a non-empty list of [row, col] cells")
+        return Fleet(ships=[Ship(cells=[cls._parse_cell(ruleset, cell) for cell in ship]) for ship in raw])
+
+
+def run_jsonl(input_stream: TextIO = sys.stdin, output: TextIO = sys.stdout) -> None:
+    JsonlSession(output).serve(input_stream)
@@ -0,0 +1,133 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from src.domain import Coordinate, Fleet, ScoredFleet, Ship
+from src.engine.adaptive_bot import AdaptiveBotBrain
+from src.engine.bot_brain import BotBrain
+from src.placement.prior import PlacementPrior
+from src.placement.bot_setup import RandomFleetGenerator
+from src.ruleset import CLASSIC, Ruleset
+from src.simulation.batch import shots_to_sink
+
+# Hunting strategies a layout is scored against, by name (names, not objects, cross process boundaries)
+STRATEGIES: Dict[str, Callable[[int, Ruleset], BotBrain]] = {
+    # Our own bot: lattice hunt, follow-ups, exact endgame
+    "bot": lambda seed, ruleset: BotBrain(seed=seed, ruleset=ruleset),
+    # Density-style hunter: densest cell over placements that still fit (uniform prior)
+    "density": lambda seed, ruleset: AdaptiveBotBrain(PlacementPrior(ruleset), seed=seed, ruleset=ruleset),
+}
+DEFAULT_PANEL: Tuple[str, ...] = ("bot", "density")
+
+
+def evaluate_layout(fleet: Fleet, ruleset: Ruleset, panel: Sequence[str], seeds: Sequence[int]) -> float:
+    """Average shots the panel's strategies need to sink `fleet`, one game per (strategy, seed)."""
+    total = 0
+    for name in panel:
+        factory = STRATEGIES[name]
+        for seed in seeds:
+            total += shots_to_sink(fleet, factory(seed, ruleset), ruleset)
+    return total / (len(panel) * len(seeds))
+
+
+class AdversarialPlacementSearch:
+    """
+    Hill climbing over valid fleet layouts, maximizing the shots hunters need to sink them.
+
+    Each step proposes `neighbours` mutants of the current layout (one ship moved to a
+    random valid spot) and keeps the best one if it beats the current layout. A step
+    scores the current layout and its mutants on the same panel games (strategy x seed),
+    drawn afresh for every step, so the climb cannot overfit a fixed set of games; the
+    reported score of a climbed layout comes from held-out games none of its steps saw.
+    The games of a step are fanned out over a process pool.
+    build_library() runs several climbs and keeps the best layouts for
+    LibraryFleetGenerator, so choosing a bot fleet in a game is a lookup.
+    """
+
+    def __init__(self, ruleset: Ruleset = CLASSIC, panel: Sequence[str] = DEFAULT_PANEL, trials: int = 8,
+                 neighbours: int = 8, seed: Optional[int] = None, workers: Optional[int] = None):
+        unknown = [name for name in panel if name not in STRATEGIES]
+        if unknown:
+            raise ValueError(f"Unknown strategies: {unknown}. Available: {', '.join(sorted(STRATEGIES))}")
+        if ruleset.sparse:
+            raise ValueError(f"Placement search is not available on sparse boards ({ruleset.board_size}x{ruleset.board_size})")
+        self.ruleset = ruleset
+        self.panel = tuple(panel)
+        self.neighbours = neighbours
+        self.trials = trials
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.generator = RandomFleetGenerator(seed=self.rng.getrandbits(32), ruleset=ruleset)
+
+    def search(self, iterations: int = 50, start: Optional[Fleet] = None,
+               pool: Optional[ProcessPoolExecutor] = None) -> ScoredFleet:
+        """One hill climb from `start` (a random layout by default)."""
+        fleet = start or self.generator.generate()
+        for _ in range(iterations):
+            mutants = [self._mutate(fleet) for _ in range(self.neighbours)]
+            # scores[0] is the current layout, on this step's games
+            scores = self.evaluate([fleet] + mutants, pool, self.draw_seeds())
+            top = max(range(1, len(scores)), key=scores.__getitem__)
+            if scores[top] > scores[0]:
+                fleet = mutants[top - 1]
+        return ScoredFleet(fleet=fleet, score=self.evaluate([fleet], pool, self.draw_seeds())[0])
+
+    def build_library(self, layouts: int, iterations: int = 50, library: Sequence[ScoredFleet] = (),
+                      capacity: int = 50) -> List[ScoredFleet]:
+        """Adds `layouts` climbed layouts to `library`; returns the best `capacity` layouts, best first."""
+        result = list(library)
+        with self._pool() as pool:
+            for _ in range(layouts):
+                result.append(self.search(iterations, pool=pool))
+        result.sort(key=lambda layout: layout.score, reverse=True)
+        return result[:capacity]
+
+    def draw_seeds(self) -> List[int]:
+        """`trials` fresh game seeds."""
+        return [self.rng.getrandbits(32) for _ in range(self.trials)]
+
+    def evaluate(self, fleets: Sequence[Fleet], pool: Optional[ProcessPoolExecutor] = None,
+                 seeds: Optional[Sequence[int]] = None) -> List[float]:
+        """Panel scores of `fleets`, all on the same games (`seeds`, fresh ones by default)."""
+        if seeds is None:
+            seeds = self.draw_seeds()
+        if pool is None:
+            return [evaluate_layout(fleet, self.ruleset, self.panel, seeds) for fleet in fleets]
+        # One task per (layout, strategy): enough parallelism without shipping every game separately
+        futures = [
+            [pool.submit(evaluate_layout, fleet, self.ruleset, (name,), seeds) for name in self.panel]
+            for fleet in fleets
+        ]
+        return [sum(future.result() for future in per_fleet) / len(per_fleet) for per_fleet in futures]
+
+    def _pool(self):
+        if self.workers == 1:
+            return _NoPool()
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+    def _mutate(self, fleet: Fleet) -> Fleet:
+        """`fleet` with one random ship re-placed at a random valid position."""
+        moved = self.rng.randrange(len(fleet.ships))
+        occupied: Set[Coordinate] = set()
+        forbidden: Set[Coordinate] = set()
+        for index, ship in enumerate(fleet.ships):
+            if index == moved:
+                continue
+            occupied.update(ship.cells)
+            for cell in ship.cells:
+                forbidden.update(self.ruleset.exclusion_zone(cell))
+        forbidden -= occupied
+        ship = self.generator.place_ship(fleet.ships[moved].length, occupied, forbidden)
+        ships: List[Ship] = list(fleet.ships)
+        ships[moved] = ship
+        return Fleet(ships=ships)
+
+
+class _NoPool:
+    """Stands in for a process pool when searching in-process (workers=1)."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
@@ -1,47 +1,52 @@
+import hashlib
 import random
-from typing import List, Set
+from typing import List, Optional, Sequence, Set, Tuple
 
-from src.domain import Coordinate, Fleet, Ship, BOARD_SIZE
-from src.validators.fleet_validator import REQUIRED_SIZES
+from src.domain import Coordinate, Fleet, ScoredFleet, Ship
+from src.ruleset import CLASSIC, Ruleset
 
 
 class RandomFleetGenerator:
     """
-    Generates a random valid fleet (no overlap, no adjacency including diagonals).
+    Generates a random valid fleet (no overlap, no adjacency including diagonals
+    unless the ruleset allows touching).
     """
 
-    def __init__(self, seed: int | None = None):
+    def __init__(self, seed: int | None = None, ruleset: Ruleset = CLASSIC):
         self.rng = random.Random(seed)
+        self.ruleset = ruleset
 
     def generate(self) -> Fleet:
         ships: List[Ship] = []
         occupied: Set[Coordinate] = set()
         forbidden: Set[Coordinate] = set()
 
-        for size in REQUIRED_SIZES:
-            ship = self._place_ship(size, occupied, forbidden)
+        for size in self.ruleset.ship_sizes:
+            ship = self.place_ship(size, occupied, forbidden)
             ships.append(ship)
 
             for cell in ship.cells:
                 occupied.add(cell)
             for cell in ship.cells:
-                for near in cell.neighbors_8():
-                    if near.is_inside(BOARD_SIZE) and near not in occupied:
+                for near in self.ruleset.exclusion_zone(cell):
+                    if near not in occupied:
                         forbidden.add(near)
 
         return Fleet(ships=ships)
 
-    def _place_ship(self, size: int, occupied: Set[Coordinate], forbidden: Set[Coordinate]) -> Ship:
+    def place_ship(self, size: int, occupied: Set[Coordinate], forbidden: Set[Coordinate]) -> Ship:
+        """A random straight ship of `size` avoiding `occupied` cells and the `forbidden` zone around them."""
+        board_size = self.ruleset.board_size
         for _ in range(20_000):
             horizontal = self.rng.choice([True, False])
             if horizontal:
-                row = self.rng.randrange(0, BOARD_SIZE)
-                col_start = self.rng.randrange(0, BOARD_SIZE - size + 1)
-                cells = [Coordinate(row, col_start + i) for i in range(size)]
+                row = self.rng.randrange(0, board_size)
+                col_start = self.rng.randrange(0, board_size - size + 1)
+                cells = [self.ruleset.cell_at(row, col_start + i) for i in range(size)]
             else:
-                col = self.rng.randrange(0, BOARD_SIZE)
-                row_start = self.rng.randrange(0, BOARD_SIZE - size + 1)
-                cells = [Coordinate(row_start + i, col) for i in range(size)]
+                col = self.rng.randrange(0, board_size)
+                row_start = self.rng.randrange(0, board_size - size + 1)
+                cells = [self.ruleset.cell_at(row_start + i, col) for i in range(size)]
 
             if any(c in occupied for c in cells):
                 continue
@@ -51,7 +56,7 @@ class RandomFleetGenerator:
             # Double-check adjacency to occupied cells
             ok = True
             for c in cells:
-                for near in c.neighbors_8():
+                for near in self.ruleset.exclusion_zone(c):
                     if near in occupied:
                         ok = False
                         break
@@ -63,3 +68,58 @@ class RandomFleetGenerator:
             return Ship(cells=cells)
 
         raise RuntimeError("Failed to generate a valid ship placement")
+
+
+class LibraryFleetGenerator:
+    """
+    Picks the bot fleet from a library of searched layouts (see src/placement/adversarial.py)
+    instead of placing it blindly: a random layout among the best `top` ones, under a
+    random rotation/reflection of the board so repeated layouts are not recognizable.
+    Generating is a lookup; an empty library falls back to RandomFleetGenerator.
+    `library_id` and `last_pick` (layout index, symmetry) are what GameMeta records:
+    fleet_for() rebuilds the fleet from them.
+    """
+
+    def __init__(self, layouts: Sequence[ScoredFleet], seed: int | None = None, ruleset: Ruleset = CLASSIC,
+                 top: int = 20):
+        self.rng = random.Random(seed)
+        self.ruleset = ruleset
+        self.layouts = sorted(layouts, key=lambda layout: layout.score, reverse=True)[:top]
+        self.library_id = fleet_library_id(self.layouts)
+        self.last_pick: Optional[Tuple[int, int]] = None
+
+    def generate(self) -> Fleet:
+        if not self.layouts:
+            self.last_pick = None
+            return RandomFleetGenerator(seed=self.rng.getrandbits(32), ruleset=self.ruleset).generate()
+        layout = self.rng.randrange(len(self.layouts))
+        transform = self.rng.randrange(8)
+        self.last_pick = (layout, transform)
+        return self.fleet_for(layout, transform)
+
+    def fleet_for(self, layout: int, transform: int) -> Fleet:
+        """Layout number `layout` (best first) under board symmetry `transform` (0..7)."""
+        if not (0 <= layout < len(self.layouts) and 0 <= transform < 8):
+            raise ValueError(f"No layout {layout} / symmetry {transform} in fleet library {self.library_id}")
+        fleet = self.layouts[layout].fleet
+        return Fleet(ships=[Ship(cells=[self._transform(cell, transform) for cell in ship.cells]) for ship in fleet.ships])
+
+    def _transform(self, cell: Coordinate, transform: int) -> Coordinate:
+        # The 8 symmetries of the square board: optional transpose, then optional row/column flips
+        last = self.ruleset.board_size - 1
+        row, col = (cell.col, cell.row) if transform & 4 else (cell.row, cell.col)
+        if transform & 2:
+            row = last - row
+        if transform & 1:
+            col = last - col
+        return self.ruleset.cell_at(row, col)
+
+
+def fleet_library_id(layouts: Sequence[ScoredFleet]) -> str:
+    """Short content hash of `layouts` (cells only, in order): games record which library their fleet came from."""
+    digest = hashlib.blake2b(digest_size=8)
+    for layout in layouts:
+        for ship in layout.fleet.ships:
+            digest.update(",".join(f"{cell.row}:{cell.col}" for cell in ship.cells).encode("ascii") + b";")
+        digest.update(b"|")
+    return digest.hexdigest()
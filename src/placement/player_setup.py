@@ -1,12 +1,12 @@
 from typing import List
 
 from src.domain import Coordinate, Fleet, Ship
-from src.validators.fleet_validator import REQUIRED_SIZES
+from src.ruleset import CLASSIC, Ruleset
 
 
 class ConsoleFleetInput:
     """
-    Reads 10 ships from console input. One ship per line.
+    Reads the ruleset's ships (10 on the classic board) from console input. One ship per line.
 
     Supported formats:
     - "A1 A4" (two endpoints)
@@ -15,10 +15,14 @@ class ConsoleFleetInput:
     - "1,1 1,4" (two coords), 1-based or 0-based accepted
     """
 
+    def __init__(self, ruleset: Ruleset = CLASSIC):
+        self.ruleset = ruleset
+
     def read_fleet_from_console(self) -> Fleet:
         ships: List[Ship] = []
-        for idx, size in enumerate(REQUIRED_SIZES, start=1):
-            prompt = f"Ship {idx}/10 (size {size}) > "
+        total = len(self.ruleset.ship_sizes)
+        for idx, size in enumerate(self.ruleset.ship_sizes, start=1):
+            prompt = f"Ship {idx}/{total} (size {size}) > "
             line = input(prompt).strip()
             cells = self._parse_ship_line(line)
             ships.append(Ship(cells=cells))
@@ -49,17 +53,7 @@ class ConsoleFleetInput:
         t = token.strip().upper()
 
         if t and t[0].isalpha():
-            col_letter = t[0]
-            if col_letter < "A" or col_letter > "J":
-                raise ValueError("Column must be A..J")
-            col = ord(col_letter) - ord("A")
-            num_part = t[1:].strip()
-            if not num_part.isdigit():
-                raise ValueError("Row number expected after letter")
-            row_1_based = int(num_part)
-            if not (1 <= row_1_based <= 10):
-                raise ValueError("Row must be 1..10")
-            return Coordinate(row_1_based - 1, col)
+            return self.ruleset.parse_cell_label(t)
 
         if "," in t:
             parts = [p for p in t.split(",") if p]
@@ -71,13 +65,13 @@ class ConsoleFleetInput:
 
         raise ValueError("Bad coordinate token")
 
-    @staticmethod
-    def _normalize_numeric(r: int, c: int) -> Coordinate:
-        if 1 <= r <= 10 and 1 <= c <= 10:
+    def _normalize_numeric(self, r: int, c: int) -> Coordinate:
+        size = self.ruleset.board_size
+        if 1 <= r <= size and 1 <= c <= size:
             return Coordinate(r - 1, c - 1)
-        if 0 <= r <= 9 and 0 <= c <= 9:
+        if 0 <= r <= size - 1 and 0 <= c <= size - 1:
             return Coordinate(r, c)
-        raise ValueError("Row/col must be 1..10 or 0..9")
+        raise ValueError(f"Row/col must be 1..{size} or 0..{size - 1}")
 
     @staticmethod
     def _cells_from_endpoints(a: Coordinate, b: Coordinate) -> List[Coordinate]:
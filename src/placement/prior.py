@@ -0,0 +1,54 @@
+from array import array
+from functools import lru_cache
+from typing import Dict, Optional
+
+from src.domain import Fleet
+from src.ruleset import Placement, Ruleset
+
+
+@lru_cache(maxsize=None)
+def _placement_index(ruleset: Ruleset, size: int) -> Dict[Placement, int]:
+    return {placement: index for index, placement in enumerate(ruleset.placements(size))}
+
+
+class PlacementPrior:
+    """
+    How often opponents used each ship placement.
+
+    One unsigned counter per placement of every ship size, in ruleset.placements(size)
+    order. record() adds one finished game's fleet: a lookup per ship, so the update
+    is O(placements) at worst and never rescans earlier games. weights() adds
+    `smoothing` to every count, so placements nobody used yet stay possible.
+    """
+
+    def __init__(self, ruleset: Ruleset, counts: Optional[Dict[int, array]] = None, games: int = 0,
+                 smoothing: float = 1.0):
+        if ruleset.sparse:
+            raise ValueError(f"Placement priors are not available on sparse boards ({ruleset.board_size}x{ruleset.board_size})")
+        self.ruleset = ruleset
+        self.games = games
+        self.smoothing = smoothing
+        self.counts: Dict[int, array] = {}
+        for size in sorted(set(ruleset.ship_sizes)):
+            expected = len(ruleset.placements(size))
+            stored = (counts or {}).get(size)
+            if stored is not None and len(stored) != expected:
+                raise ValueError(f"Prior for ship size {size} has {len(stored)} placements, expected {expected}")
+            self.counts[size] = array("I", stored) if stored is not None else array("I", [0]) * expected
+
+    def record(self, fleet: Fleet) -> None:
+        """Counts the placements of a finished game's fleet."""
+        for ship in fleet.ships:
+            size = ship.length
+            if size not in self.counts:
+                raise ValueError(f"Ship of size {size} is not part of the {self.ruleset.name} fleet")
+            placement = tuple(sorted(ship.cells))
+            index = _placement_index(self.ruleset, size).get(placement)
+            if index is None:
+                raise ValueError(f"Ship is not a straight line on the board: {ship.cells}")
+            self.counts[size][index] += 1
+        self.games += 1
+
+    def weights(self, size: int) -> array:
+        """Smoothed weight per placement of `size` (same order as ruleset.placements(size))."""
+        return array("d", (count + self.smoothing for count in self.counts[size]))
@@ -1,7 +1,8 @@
 # src/presentation/console_renderer.py
 from typing import Optional, TYPE_CHECKING
 
-from src.domain import BOARD_SIZE, Coordinate, FogCell
+from src.domain import FogCell
+from src.ruleset import CLASSIC, Ruleset
 
 if TYPE_CHECKING:
     from src.domain import GameState, Fleet
@@ -16,8 +17,9 @@ class ConsoleGameRenderer:
     Optionally can show player's own ships on the right board.
     """
 
-    def __init__(self, show_coordinates: bool = True):
+    def __init__(self, show_coordinates: bool = True, ruleset: Ruleset = CLASSIC):
         self.show_coordinates = show_coordinates
+        self.ruleset = ruleset
 
     def render(
         self,
@@ -54,8 +56,8 @@ class ConsoleGameRenderer:
         print("")  # trailing blank line
 
     def _render_fog_board(self, fog_board, title: str, overlay_fleet: Optional["Fleet"]) -> list[str]:
-        # Header: A..J
-        cols = [chr(ord("A") + i) for i in range(BOARD_SIZE)]
+        # Header: A..J on the classic board
+        cols = list(self.ruleset.column_labels())
         header = "    " + " ".join(cols) if self.show_coordinates else ""
 
         lines: list[str] = []
@@ -67,10 +69,10 @@ class ConsoleGameRenderer:
         if overlay_fleet is not None:
             fleet_cells = overlay_fleet.occupied_cells()
 
-        for row in range(BOARD_SIZE):
+        for row in range(self.ruleset.board_size):
             row_cells = []
-            for col in range(BOARD_SIZE):
-                cell = Coordinate(row, col)
+            for col in range(self.ruleset.board_size):
+                cell = self.ruleset.cell_at(row, col)
                 symbol = fog_board.visible_symbol(cell)  # '?', 'o', 'x'
 
                 # Overlay ships only for unknown cells (so hits/misses remain visible)
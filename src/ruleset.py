@@ -0,0 +1,169 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from src.domain import BOARD_SIZE, Coordinate, GameMeta, coordinate_table
+
+Placement = Tuple[Coordinate, ...]
+
+# Boards wider than this run in sparse mode (see Ruleset.sparse)
+SPARSE_BOARD_SIZE = 64
+
+
+@dataclass(frozen=True, slots=True)
+class Ruleset:
+    """
+    Game variant: board size, fleet composition, the touching rule and salvo mode
+    (each side fires one shot per surviving ship per turn).
+
+    Rulesets are immutable and hashable. Lookup tables (cells, placements,
+    neighbours) are built lazily on first use and memoized per ruleset, so
+    switching variants is free after the first game and several rulesets can be
+    used side by side in one process.
+    """
+    name: str = "classic"
+    board_size: int = BOARD_SIZE
+    ship_sizes: Tuple[int, ...] = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+    allow_touching: bool = False
+    salvo: bool = False
+
+    def __post_init__(self):
+        if self.board_size < 1:
+            raise ValueError(f"Invalid board size: {self.board_size}")
+        if not self.ship_sizes or min(self.ship_sizes) < 1 or max(self.ship_sizes) > self.board_size:
+            raise ValueError(f"Invalid ship sizes for a {self.board_size}x{self.board_size} board: {self.ship_sizes}")
+
+    @classmethod
+    def from_meta(cls, meta: GameMeta) -> "Ruleset":
+        known = RULESETS.get(meta.ruleset)
+        ruleset = cls(
+            name=meta.ruleset,
+            board_size=meta.board_size,
+            ship_sizes=tuple(meta.ship_sizes),
+            allow_touching=meta.allow_touching,
+            salvo=meta.salvo,
+        )
+        # Reuse the registered instance (and its warm tables) when nothing was customized
+        return known if known == ruleset else ruleset
+
+    @property
+    def fleet_cells(self) -> int:
+        return sum(self.ship_sizes)
+
+    @property
+    def sparse(self) -> bool:
+        """
+        Large-board mode: nothing may cost O(board area) per move.
+        - the bot hunts with an O(1) unshot sampler instead of listing free cells
+        - saved games store per-turn deltas instead of full boards
+        - whole-board tables (cells, placements, hints, endgame solver) are not used
+        """
+        return self.board_size > SPARSE_BOARD_SIZE
+
+    def is_inside(self, cell: Coordinate) -> bool:
+        return cell.is_inside(self.board_size)
+
+    def cells(self) -> Tuple[Coordinate, ...]:
+        """All board cells in row-major order (interned, see coordinate_table)."""
+        return _cells(self.board_size)
+
+    def cell_at(self, row: int, col: int) -> Coordinate:
+        return coordinate_table(self.board_size).at(row, col)
+
+    def placements(self, size: int) -> Tuple[Placement, ...]:
+        """All straight placements of a ship of `size` on an empty board."""
+        return _placements(size, self.board_size)
+
+    def neighbors(self, cell: Coordinate) -> Tuple[Coordinate, ...]:
+        """8-directional neighbours of `cell` that are on the board."""
+        return coordinate_table(self.board_size).neighbors_8(cell)
+
+    def exclusion_zone(self, cell: Coordinate) -> Tuple[Coordinate, ...]:
+        """Cells other ships may not use because of a ship on `cell` (besides the cell itself)."""
+        if self.allow_touching:
+            return ()
+        return self.neighbors(cell)
+
+    def column_labels(self) -> Tuple[str, ...]:
+        return _column_labels(self.board_size)
+
+    def cell_label(self, cell: Coordinate) -> str:
+        return f"{self.column_labels()[cell.col]}{cell.row + 1}"
+
+    def parse_cell_label(self, token: str) -> Coordinate:
+        """Parses "A1".."J10" style labels (multi-letter columns on boards wider than 26)."""
+        text = token.strip().upper()
+        letters = ""
+        while letters != text and text[len(letters)].isalpha():
+            letters += text[len(letters)]
+        digits = text[len(letters):].strip()
+
+        labels = self.column_labels()
+        if not letters or letters not in _label_index(self.board_size):
+            raise ValueError(f"Column must be {labels[0]}..{labels[-1]}")
+        if not digits.isdigit():
+            raise ValueError(f"Row number expected after letter ({labels[0]}1..{labels[-1]}{self.board_size})")
+        row_1_based = int(digits)
+        if not (1 <= row_1_based <= self.board_size):
+            raise ValueError(f"Row must be 1..{self.board_size}")
+        return self.cell_at(row_1_based - 1, _label_index(self.board_size)[letters])
+
+
+@lru_cache(maxsize=None)
+def _cells(board_size: int) -> Tuple[Coordinate, ...]:
+    return coordinate_table(board_size).all_cells()
+
+
+@lru_cache(maxsize=None)
+def _placements(size: int, board_size: int) -> Tuple[Placement, ...]:
+    at = coordinate_table(board_size).at
+    result: List[Placement] = []
+    for r in range(board_size):
+        for c in range(board_size - size + 1):
+            result.append(tuple(at(r, c + i) for i in range(size)))
+    if size > 1:
+        for c in range(board_size):
+            for r in range(board_size - size + 1):
+                result.append(tuple(at(r + i, c) for i in range(size)))
+    return tuple(result)
+
+
+@lru_cache(maxsize=None)
+def _column_labels(board_size: int) -> Tuple[str, ...]:
+    labels: List[str] = []
+    for col in range(board_size):
+        label = ""
+        n = col + 1
+        while n:
+            n, rest = divmod(n - 1, 26)
+            label = chr(ord("A") + rest) + label
+        labels.append(label)
+    return tuple(labels)
+
+
+@lru_cache(maxsize=None)
+def _label_index(board_size: int) -> Dict[str, int]:
+    return {label: col for col, label in enumerate(_column_labels(board_size))}
+
+
+CLASSIC = Ruleset()
+# Hasbro-style fleet; ships may touch
+BATTLESHIP = Ruleset(name="battleship", ship_sizes=(5, 4, 3, 3, 2), allow_touching=True)
+# Classic board and fleet, one shot per surviving ship per turn
+SALVO = Ruleset(name="salvo", salvo=True)
+# 1000x1000 board with twenty classic fleets; runs in sparse mode
+LARGE = Ruleset(name="large", board_size=1000, ship_sizes=CLASSIC.ship_sizes * 20)
+
+RULESETS: Dict[str, Ruleset] = {
+    CLASSIC.name: CLASSIC,
+    BATTLESHIP.name: BATTLESHIP,
+    SALVO.name: SALVO,
+    LARGE.name: LARGE,
+}
+
+
+def get_ruleset(name: str) -> Ruleset:
+    try:
+        return RULESETS[name]
+    except KeyError:
+        raise ValueError(f"Unknown ruleset: {name}. Available: {', '.join(sorted(RULESETS))}") from None
@@ -0,0 +1,138 @@
+import hashlib
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from src.domain import Fleet
+from src.engine.bot_brain import BotBrain
+from src.engine.game_manager import GameManager
+from src.placement.bot_setup import RandomFleetGenerator
+from src.ruleset import CLASSIC, Ruleset
+from src.simulation.checkpoint import BatchCheckpoint, CheckpointStore
+from src.simulation.shared_pool import SharedGamePool
+from src.simulation.stats import BatchStats
+
+# Worker-process side of a parallel batch: (attached pool, endgame threshold), see _attach_worker
+_worker: Optional[Tuple[SharedGamePool, int]] = None
+
+
+class SimulationBatch:
+    """
+    Bot-tuning sweep: in game i a BotBrain shoots at a random fleet until it is sunk.
+    Fleet and bot seeds of every game are drawn from one master RNG seeded with `seed`.
+
+    With a checkpoint path, progress (next game id, master RNG state, running stats)
+    is saved atomically every `checkpoint_every` games and at the end; run() continues
+    from a saved checkpoint, so an interrupted batch finishes with bit-identical stats.
+
+    With workers > 1 each block of `checkpoint_every` games is generated here, packed
+    into a SharedGamePool and played by a process pool; a task is a slot range, and
+    the results are read back in game order, so the stats match a serial run.
+    """
+
+    def __init__(self, games: int, seed: int, checkpoint_path: Optional[str | Path] = None,
+                 ruleset: Ruleset = CLASSIC, endgame_threshold: int = 12, checkpoint_every: int = 100,
+                 workers: int = 1):
+        if games < 0 or checkpoint_every < 1:
+            raise ValueError(f"Invalid batch size: {games} games, checkpoint every {checkpoint_every}")
+        if workers < 1:
+            raise ValueError(f"Invalid worker count: {workers}")
+        self.games = games
+        self.seed = seed
+        self.ruleset = ruleset
+        self.endgame_threshold = endgame_threshold
+        self.checkpoint_every = checkpoint_every
+        self.workers = workers
+        self.store = CheckpointStore(checkpoint_path) if checkpoint_path is not None else None
+
+    @property
+    def config_key(self) -> bytes:
+        """Fingerprint of everything that determines the results; a checkpoint only resumes the same batch."""
+        config = repr((self.games, self.seed, self.ruleset, self.endgame_threshold))
+        return hashlib.blake2b(config.encode("utf-8"), digest_size=16).digest()
+
+    def run(self, on_game: Optional[Callable[[int, int], None]] = None) -> BatchStats:
+        """Plays the remaining games; on_game(game_id, shots) is called after each one."""
+        rng = random.Random(self.seed)
+        checkpoint = self.store.load() if self.store is not None else None
+        if checkpoint is not None:
+            if checkpoint.config_key != self.config_key:
+                raise ValueError(f"Checkpoint {self.store.file_path} belongs to a different batch")
+            rng.setstate(checkpoint.rng_state)
+            next_game, stats = checkpoint.next_game, checkpoint.stats
+        else:
+            next_game, stats = 0, BatchStats()
+
+        pool: Optional[SharedGamePool] = None
+        executor: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1 and next_game < self.games:
+            pool = SharedGamePool(self.ruleset, capacity=self.checkpoint_every)
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach_worker,
+                                           initargs=(pool.name, self.ruleset, pool.capacity, self.endgame_threshold))
+        try:
+            game_id = next_game
+            while game_id < self.games:
+                # Blocks end on multiples of checkpoint_every, wherever the batch was resumed
+                stop = min(self.games, (game_id // self.checkpoint_every + 1) * self.checkpoint_every)
+                seeds = [(rng.getrandbits(32), rng.getrandbits(32)) for _ in range(game_id, stop)]
+                if pool is None:
+                    results: Iterable[int] = (self.play_game(fleet_seed, bot_seed) for fleet_seed, bot_seed in seeds)
+                else:
+                    results = self._play_shared(seeds, pool, executor)
+                for offset, shots in enumerate(results):
+                    stats.add(shots)
+                    if on_game is not None:
+                        on_game(game_id + offset, shots)
+                game_id = stop
+                if self.store is not None:
+                    self.store.save(BatchCheckpoint(self.config_key, game_id, rng.getstate(), stats))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if pool is not None:
+                pool.close()
+                pool.unlink()
+        return stats
+
+    def _play_shared(self, seeds: List[Tuple[int, int]], pool: SharedGamePool,
+                     executor: ProcessPoolExecutor) -> List[int]:
+        for slot, (fleet_seed, bot_seed) in enumerate(seeds):
+            pool.put(slot, RandomFleetGenerator(seed=fleet_seed, ruleset=self.ruleset).generate(), bot_seed)
+        # A few tasks per worker evens out slow games; each task is two integers
+        step = max(1, -(-len(seeds) // (4 * self.workers)))
+        tasks = [executor.submit(_play_slots, start, min(start + step, len(seeds)))
+                 for start in range(0, len(seeds), step)]
+        for task in tasks:
+            task.result()
+        return pool.results(len(seeds))
+
+    def play_game(self, fleet_seed: int, bot_seed: int) -> int:
+        """Shots the bot needs to sink a fleet generated from `fleet_seed`."""
+        fleet = RandomFleetGenerator(seed=fleet_seed, ruleset=self.ruleset).generate()
+        brain = BotBrain(seed=bot_seed, ruleset=self.ruleset, endgame_threshold=self.endgame_threshold)
+        return shots_to_sink(fleet, brain, self.ruleset)
+
+
+def shots_to_sink(fleet: Fleet, brain: BotBrain, ruleset: Ruleset = CLASSIC) -> int:
+    """Shots `brain` needs to sink `fleet` (only the bot shoots)."""
+    # The same fleet stands in for the bot's own, which is never fired at
+    manager = GameManager(player_fleet=fleet, bot_fleet=fleet, bot_brain=brain, ruleset=ruleset)
+    shots = 0
+    while manager.is_game_over().winner is None:
+        manager.apply_bot_shot()
+        shots += 1
+    return shots
+
+
+def _attach_worker(pool_name: str, ruleset: Ruleset, capacity: int, endgame_threshold: int) -> None:
+    global _worker
+    _worker = (SharedGamePool.attach(pool_name, ruleset, capacity), endgame_threshold)
+
+
+def _play_slots(start: int, stop: int) -> None:
+    """Plays pool slots start..stop-1 and stores each game's shots in the pool."""
+    pool, endgame_threshold = _worker
+    for slot in range(start, stop):
+        brain = BotBrain(seed=pool.bot_seed(slot), ruleset=pool.ruleset, endgame_threshold=endgame_threshold)
+        pool.set_result(slot, shots_to_sink(pool.fleet(slot), brain, pool.ruleset))
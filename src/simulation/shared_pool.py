@@ -0,0 +1,111 @@
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+from src.domain import Coordinate, Fleet, Ship, coordinate_table
+from src.ruleset import Ruleset
+
+
+class SharedGamePool:
+    """
+    Games for worker processes in one shared-memory block, so a task is just a slot range.
+
+    Packed layout (native uint32), `capacity` slots:
+    - fleets: one word per ship, ships in ruleset.ship_sizes order,
+      word = first cell index (row * board_size + col) << 1 | vertical
+    - bot seeds: one word per slot
+    - results: one word per slot (shots), written by the workers
+    The creator fills slots with put(); workers attach() by name (zero-copy: the
+    block is mapped, not sent) and fleet() builds a Fleet of interned Coordinates
+    straight from the words. The creator must close() and unlink() the block.
+    """
+
+    def __init__(self, ruleset: Ruleset, capacity: int, name: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("Pool capacity must be >= 1")
+        self.ruleset = ruleset
+        self.capacity = capacity
+        self.ships = len(ruleset.ship_sizes)
+        size = 4 * capacity * (self.ships + 2)
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            if self._memory.size < size:
+                self._memory.close()
+                raise ValueError(f"Shared pool {name} is too small for {capacity} {ruleset.name} games")
+        words = self._memory.buf.cast("I")
+        fleet_words = capacity * self.ships
+        self._words = words
+        self._fleets = words[:fleet_words]
+        self._seeds = words[fleet_words:fleet_words + capacity]
+        self._results = words[fleet_words + capacity:fleet_words + 2 * capacity]
+        # Ship sizes in the order they are packed
+        self._sizes = tuple(ruleset.ship_sizes)
+
+    @classmethod
+    def attach(cls, name: str, ruleset: Ruleset, capacity: int) -> "SharedGamePool":
+        return cls(ruleset, capacity, name=name)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def put(self, slot: int, fleet: Fleet, bot_seed: int) -> None:
+        board_size = self.ruleset.board_size
+        pending: List[Ship] = list(fleet.ships)
+        base = slot * self.ships
+        for position, size in enumerate(self._sizes):
+            ship = next((ship for ship in pending if ship.length == size), None)
+            if ship is None:
+                raise ValueError(f"Fleet does not match the {self.ruleset.name} ship sizes {list(self._sizes)}")
+            pending.remove(ship)
+            first = min(ship.cells)
+            vertical = size > 1 and all(cell.col == first.col for cell in ship.cells)
+            if not vertical and any(cell.row != first.row for cell in ship.cells):
+                raise ValueError(f"Ship is not a straight line: {ship.cells}")
+            self._fleets[base + position] = (first.row * board_size + first.col) << 1 | vertical
+        if pending:
+            raise ValueError(f"Fleet does not match the {self.ruleset.name} ship sizes {list(self._sizes)}")
+        self._seeds[slot] = bot_seed
+        self._results[slot] = 0
+
+    def fleet(self, slot: int) -> Fleet:
+        """The fleet in `slot`, built from the shared words (cells in ascending order)."""
+        table = coordinate_table(self.ruleset.board_size)
+        step_down = self.ruleset.board_size
+        base = slot * self.ships
+        ships: List[Ship] = []
+        for position, size in enumerate(self._sizes):
+            word = self._fleets[base + position]
+            first, step = word >> 1, step_down if word & 1 else 1
+            cells: List[Coordinate] = [table.from_index(first + k * step) for k in range(size)]
+            ships.append(Ship(cells=cells))
+        return Fleet(ships=ships)
+
+    def bot_seed(self, slot: int) -> int:
+        return self._seeds[slot]
+
+    def set_result(self, slot: int, shots: int) -> None:
+        self._results[slot] = shots
+
+    def result(self, slot: int) -> int:
+        return self._results[slot]
+
+    def results(self, count: int) -> List[int]:
+        return self._results[:count].tolist()
+
+    def close(self) -> None:
+        # Views into the buffer must be released before the mapping can be closed
+        for view in (self._fleets, self._seeds, self._results, self._words):
+            view.release()
+        self._memory.close()
+
+    def unlink(self) -> None:
+        self._memory.unlink()
+
+    def __enter__(self) -> "SharedGamePool":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
@@ -0,0 +1,36 @@
+from array import array
+from dataclasses import dataclass, field
+
+
+@dataclass
+class BatchStats:
+    """Running aggregates of shots-to-win, kept as integers so resumed batches match exactly."""
+    games: int = 0
+    total_shots: int = 0
+    total_shots_sq: int = 0
+    min_shots: int = 0
+    max_shots: int = 0
+    # histogram[n] = games won in exactly n shots
+    histogram: array = field(default_factory=lambda: array("I"))
+
+    def add(self, shots: int) -> None:
+        if self.games == 0 or shots < self.min_shots:
+            self.min_shots = shots
+        self.max_shots = max(self.max_shots, shots)
+        self.games += 1
+        self.total_shots += shots
+        self.total_shots_sq += shots * shots
+        if len(self.histogram) <= shots:
+            self.histogram.extend([0] * (shots + 1 - len(self.histogram)))
+        self.histogram[shots] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total_shots / self.games if self.games else 0.0
+
+    @property
+    def stdev(self) -> float:
+        if self.games < 2:
+            return 0.0
+        variance = (self.total_shots_sq - self.total_shots * self.total_shots / self.games) / (self.games - 1)
+        return max(variance, 0.0) ** 0.5
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from src.domain import Fleet, GameState
+from typing import List
+
+from src.domain import Fleet, GameMeta, GameState, ScoredFleet
 
 
 class FleetRepository(ABC):
@@ -14,6 +16,18 @@ class FleetRepository(ABC):
         raise NotImplementedError
 
 
+class FleetLibraryRepository(ABC):
+    """Storage interface for a library of scored fleet layouts (best first)."""
+
+    @abstractmethod
+    def save(self, layouts: List[ScoredFleet]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load(self) -> List[ScoredFleet]:
+        raise NotImplementedError
+
+
 class GameStateRepository(ABC):
     """Game state storage interface (turns + boards)."""
 
@@ -26,7 +40,26 @@ class GameStateRepository(ABC):
     def append_turn(self, state: GameState) -> None:
         """Append one record for the current turn."""
         raise NotImplementedError
-    
+
+    def follow(self, events, state: GameState) -> None:
+        """
+        Track board changes from a GameManager's EventBus, starting from `state`,
+        so append_turn can write deltas instead of re-reading the whole state.
+        Optional: repositories that do not override it keep working from the state.
+        """
+
     @abstractmethod
     def load(self) -> GameState:
         raise NotImplementedError
+
+
+class GameMetaRepository(ABC):
+    """Game metadata storage interface (seeds + rules)."""
+
+    @abstractmethod
+    def save(self, meta: GameMeta) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load(self) -> GameMeta:
+        raise NotImplementedError
@@ -1,9 +1,12 @@
 import csv
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, TextIO, Tuple
 
-from src.domain import Coordinate, Ship, Fleet, GameState, Move, ShotOutcome, FogBoard
-from src.storage.base import FleetRepository, GameStateRepository
+from src.domain import (
+    BOARD_SIZE, Coordinate, Ship, Fleet, GameEvent, GameMeta, GameState, Move, ScoredFleet, ShotOutcome, FogBoard,
+    TurnSide, coordinate_table, fog_changes, moves_of,
+)
+from src.storage.base import FleetLibraryRepository, FleetRepository, GameMetaRepository, GameStateRepository
 
 
 class CsvFleetRepository(FleetRepository):
@@ -29,14 +32,16 @@ class CsvFleetRepository(FleetRepository):
         if not self.file_path.exists():
             raise FileNotFoundError(f"Fleet file not found: {self.file_path}")
 
-        cells_by_ship_id: Dict[int, List[Coordinate]] = {}
-
         with self.file_path.open("r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                ship_id = int(row["ship_id"])
-                cell = Coordinate(int(row["row"]), int(row["col"]))
-                cells_by_ship_id.setdefault(ship_id, []).append(cell)
+            return self.read(file)
+
+    def read(self, file: TextIO) -> Fleet:
+        """Parses a fleet from an open CSV stream (e.g. one unpacked from the game archive)."""
+        cells_by_ship_id: Dict[int, List[Coordinate]] = {}
+        for row in csv.DictReader(file):
+            ship_id = int(row["ship_id"])
+            cell = Coordinate(int(row["row"]), int(row["col"]))
+            cells_by_ship_id.setdefault(ship_id, []).append(cell)
 
         ships: List[Ship] = []
         for ship_id in sorted(cells_by_ship_id.keys()):
@@ -45,6 +50,50 @@ class CsvFleetRepository(FleetRepository):
         return Fleet(ships=ships)
 
 
+class CsvFleetLibraryRepository(FleetLibraryRepository):
+    """
+    CSV format:
+      layout_id,score,ship_id,row,col
+    Like CsvFleetRepository with one more level: each layout is a group of ship rows,
+    layouts are stored best first.
+    """
+
+    def __init__(self, file_path: str | Path):
+        self.file_path = Path(file_path)
+
+    def save(self, layouts: List[ScoredFleet]) -> None:
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.file_path.open("w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["layout_id", "score", "ship_id", "row", "col"])
+            for layout_id, layout in enumerate(layouts, start=1):
+                for ship_id, ship in enumerate(layout.fleet.ships, start=1):
+                    for cell in ship.cells:
+                        writer.writerow([layout_id, f"{layout.score:.4f}", ship_id, cell.row, cell.col])
+
+    def load(self) -> List[ScoredFleet]:
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"Fleet library not found: {self.file_path}")
+
+        scores: Dict[int, float] = {}
+        cells: Dict[int, Dict[int, List[Coordinate]]] = {}
+        with self.file_path.open("r", newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                layout_id = int(row["layout_id"])
+                scores[layout_id] = float(row["score"])
+                ships = cells.setdefault(layout_id, {})
+                ships.setdefault(int(row["ship_id"]), []).append(Coordinate(int(row["row"]), int(row["col"])))
+
+        return [
+            ScoredFleet(
+                fleet=Fleet(ships=[Ship(cells=cells[layout_id][ship_id]) for ship_id in sorted(cells[layout_id])]),
+                score=scores[layout_id],
+            )
+            for layout_id in sorted(cells)
+        ]
+
+
 class CsvGameStateRepository(GameStateRepository):
     """
     CSV format:
@@ -53,12 +102,30 @@ class CsvGameStateRepository(GameStateRepository):
       bot_move,bot_result,
       player_view_100,bot_view_100
 
-    - move format: "row,col"
-    - boards are 100-char strings (row-major)
+    - move format: "row,col"; a salvo lists its shots as "row,col;row,col", results as "hit;miss"
+    - boards are board_size^2-char strings (row-major), 100 chars on the classic board
+    - after follow(), the board strings are patched from game events instead of re-encoded
     """
 
-    def __init__(self, file_path: str | Path):
+    _BOARD_SYMBOLS = {ShotOutcome.MISS: ord("o"), ShotOutcome.HIT: ord("x"), ShotOutcome.SUNK: ord("x")}
+
+    def __init__(self, file_path: str | Path, board_size: int = BOARD_SIZE):
         self.file_path = Path(file_path)
+        self.board_size = board_size
+        # actor -> encoded fog board, kept current by follow()
+        self._boards: Optional[Dict[str, bytearray]] = None
+
+    def follow(self, events, state: GameState) -> None:
+        self._boards = {
+            "player": bytearray(state.player_view.encode_100(), "ascii"),
+            "bot": bytearray(state.bot_view.encode_100(), "ascii"),
+        }
+        events.subscribe_batch(self._on_events)
+
+    def _on_events(self, batch: List[GameEvent]) -> None:
+        for event in batch:
+            for actor, cell, outcome in fog_changes(event):
+                self._boards[actor][cell.row * self.board_size + cell.col] = self._BOARD_SYMBOLS[outcome]
 
     def init_new(self, state: GameState) -> None:
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -76,46 +143,69 @@ class CsvGameStateRepository(GameStateRepository):
         if not state.turn_history:
             raise ValueError("No turns in history to append.")
 
-        player_move, bot_move = state.turn_history[-1]
-
-        def format_move(move: Move) -> str:
-            return f"{move.target.row},{move.target.col}"
+        player_side, bot_side = state.turn_history[-1]
 
         with self.file_path.open("a", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
             writer.writerow([
                 state.turn_number,
-                format_move(player_move), player_move.outcome.value,
-                format_move(bot_move), bot_move.outcome.value,
-                state.player_view.encode_100(),
-                state.bot_view.encode_100(),
+                *self._format_side(player_side),
+                *self._format_side(bot_side),
+                *self._encoded_boards(state),
             ])
 
     def load(self) -> GameState:
         if not self.file_path.exists():
             raise FileNotFoundError(f"Game state file not found: {self.file_path}")
 
-        rows: List[dict] = []
         with self.file_path.open("r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                rows.append(row)
+            return self.read(file)
+
+    def read(self, file: TextIO) -> GameState:
+        """Parses a game log from an open CSV stream."""
+        rows: List[dict] = list(csv.DictReader(file))
 
-        state = GameState()
+        state = GameState(player_view=FogBoard(size=self.board_size), bot_view=FogBoard(size=self.board_size))
         if not rows:
             return state
 
         for row in rows:
             turn = int(row["turn"])
-            player_move = self._parse_move("player", row["player_move"], row["player_result"])
-            bot_move = self._parse_move("bot", row["bot_move"], row["bot_result"])
-            state.turn_history.append((player_move, bot_move))
+            player_side = self._parse_side("player", row["player_move"], row["player_result"])
+            bot_side = self._parse_side("bot", row["bot_move"], row["bot_result"])
+            state.turn_history.append((player_side, bot_side))
             state.turn_number = turn
-            state.player_view = FogBoard.decode_100(row["player_view_100"])
-            state.bot_view = FogBoard.decode_100(row["bot_view_100"])
+            state.player_view = FogBoard.decode_100(row["player_view_100"], size=self.board_size)
+            state.bot_view = FogBoard.decode_100(row["bot_view_100"], size=self.board_size)
 
         return state
 
+    def _encoded_boards(self, state: GameState) -> Tuple[str, str]:
+        if self._boards is not None:
+            return self._boards["player"].decode("ascii"), self._boards["bot"].decode("ascii")
+        return state.player_view.encode_100(), state.bot_view.encode_100()
+
+    @staticmethod
+    def _format_side(side: TurnSide) -> Tuple[str, str]:
+        """(moves, results) columns for one side of a turn."""
+        moves = moves_of(side)
+        return (
+            ";".join(f"{move.target.row},{move.target.col}" for move in moves),
+            ";".join(move.outcome.value for move in moves),
+        )
+
+    @classmethod
+    def _parse_side(cls, actor: str, moves_str: str, outcomes_str: str) -> TurnSide:
+        if not moves_str and not outcomes_str:
+            return ()  # a salvo side with no ships left to fire
+        if ";" not in moves_str and ";" not in outcomes_str:
+            return cls._parse_move(actor, moves_str, outcomes_str)
+        move_parts = moves_str.split(";")
+        outcome_parts = outcomes_str.split(";")
+        if len(move_parts) != len(outcome_parts):
+            raise ValueError(f"Salvo has {len(move_parts)} moves but {len(outcome_parts)} results: {moves_str}")
+        return tuple(cls._parse_move(actor, move, outcome) for move, outcome in zip(move_parts, outcome_parts))
+
     @staticmethod
     def _parse_move(actor: str, move_str: str, outcome_str: str) -> Move:
         parts = move_str.split(",")
@@ -124,3 +214,178 @@ class CsvGameStateRepository(GameStateRepository):
         r = int(parts[0])
         c = int(parts[1])
         return Move(actor=actor, target=Coordinate(r, c), outcome=ShotOutcome(outcome_str))
+
+
+class SparseCsvGameStateRepository(CsvGameStateRepository):
+    """
+    Delta format for large boards, where full board strings would dwarf the moves:
+      turn,
+      player_move,player_result,
+      bot_move,bot_result,
+      player_delta,bot_delta
+
+    - moves and results as in CsvGameStateRepository (salvos separated by ";")
+    - delta: fog cells changed by that turn's shot, "row,col,symbol" joined by ";"
+      (symbol: o = miss, x = hit, s = sunk); a sinking shot lists the whole ship and
+      the misses marked around it
+    Appending a turn costs O(cells changed), loading O(total cells changed).
+    After follow(), deltas are taken from game events instead of being rebuilt from the boards.
+    """
+
+    _SYMBOLS = {ShotOutcome.MISS: "o", ShotOutcome.HIT: "x", ShotOutcome.SUNK: "s"}
+    _OUTCOMES = {symbol: outcome for outcome, symbol in _SYMBOLS.items()}
+
+    def __init__(self, file_path: str | Path, board_size: int = BOARD_SIZE):
+        super().__init__(file_path, board_size)
+        # actor -> cells changed since the last appended turn, kept by follow()
+        self._changes: Optional[Dict[str, List[Tuple[Coordinate, ShotOutcome]]]] = None
+
+    def follow(self, events, state: GameState) -> None:
+        self._changes = {"player": [], "bot": []}
+        events.subscribe_batch(self._on_events)
+
+    def _on_events(self, batch: List[GameEvent]) -> None:
+        for event in batch:
+            for actor, cell, outcome in fog_changes(event):
+                self._changes[actor].append((cell, outcome))
+
+    def init_new(self, state: GameState) -> None:
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.file_path.open("w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow([
+                "turn",
+                "player_move", "player_result",
+                "bot_move", "bot_result",
+                "player_delta",
+                "bot_delta",
+            ])
+
+    def append_turn(self, state: GameState) -> None:
+        if not state.turn_history:
+            raise ValueError("No turns in history to append.")
+
+        player_side, bot_side = state.turn_history[-1]
+
+        with self.file_path.open("a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow([
+                state.turn_number,
+                *self._format_side(player_side),
+                *self._format_side(bot_side),
+                self._delta("player", state.player_view, player_side),
+                self._delta("bot", state.bot_view, bot_side),
+            ])
+
+    def load(self) -> GameState:
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"Game state file not found: {self.file_path}")
+
+        with self.file_path.open("r", newline="", encoding="utf-8") as file:
+            return self.read(file)
+
+    def read(self, file: TextIO) -> GameState:
+        state = GameState(player_view=FogBoard(size=self.board_size), bot_view=FogBoard(size=self.board_size))
+        for row in csv.DictReader(file):
+            player_side = self._parse_side("player", row["player_move"], row["player_result"])
+            bot_side = self._parse_side("bot", row["bot_move"], row["bot_result"])
+            state.turn_history.append((player_side, bot_side))
+            state.turn_number = int(row["turn"])
+            self._apply_delta(state.player_view, row["player_delta"])
+            self._apply_delta(state.bot_view, row["bot_delta"])
+
+        return state
+
+    def _delta(self, actor: str, view: FogBoard, side: TurnSide) -> str:
+        if self._changes is not None:
+            changes, self._changes[actor] = self._changes[actor], []
+            return ";".join(f"{cell.row},{cell.col},{self._SYMBOLS[outcome]}" for cell, outcome in changes)
+
+        # Not following a game: rebuild the delta from the board around the moves
+        return ";".join(self._move_delta(view, move) for move in moves_of(side))
+
+    def _move_delta(self, view: FogBoard, move: Move) -> str:
+        if move.outcome != ShotOutcome.SUNK:
+            changed = [move.target]
+        else:
+            # The sunk ship (4-connected sunk cells) plus the misses marked around it
+            table = coordinate_table(self.board_size)
+            ship = {move.target}
+            stack = [move.target]
+            while stack:
+                cell = stack.pop()
+                for near in table.neighbors_4(cell):
+                    if near not in ship and view.shots.get(near) == ShotOutcome.SUNK:
+                        ship.add(near)
+                        stack.append(near)
+            around = {
+                near for cell in ship for near in table.neighbors_8(cell)
+                if near not in ship and view.shots.get(near) == ShotOutcome.MISS
+            }
+            changed = sorted(ship) + sorted(around)
+        return ";".join(f"{cell.row},{cell.col},{self._SYMBOLS[view.shots[cell]]}" for cell in changed)
+
+    def _apply_delta(self, view: FogBoard, delta: str) -> None:
+        for item in delta.split(";") if delta else ():
+            parts = item.split(",")
+            if len(parts) != 3 or parts[2] not in self._OUTCOMES:
+                raise ValueError(f"Bad delta entry: {item}")
+            row, col = int(parts[0]), int(parts[1])
+            if not (0 <= row < self.board_size and 0 <= col < self.board_size):
+                raise ValueError(f"Delta cell out of bounds: {item}")
+            view.shots[coordinate_table(self.board_size).at(row, col)] = self._OUTCOMES[parts[2]]
+
+
+class CsvGameMetaRepository(GameMetaRepository):
+    """
+    CSV format:
+      key,value
+    - ship_sizes are stored space-separated, e.g. "4 3 3 2 2 2 1 1 1 1"
+    """
+
+    def __init__(self, file_path: str | Path):
+        self.file_path = Path(file_path)
+
+    def save(self, meta: GameMeta) -> None:
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.file_path.open("w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["key", "value"])
+            writer.writerow(["game_id", meta.game_id])
+            writer.writerow(["bot_seed", meta.bot_seed])
+            writer.writerow(["fleet_seed", meta.fleet_seed])
+            writer.writerow(["ruleset", meta.ruleset])
+            writer.writerow(["board_size", meta.board_size])
+            writer.writerow(["ship_sizes", " ".join(str(size) for size in meta.ship_sizes)])
+            writer.writerow(["allow_touching", int(meta.allow_touching)])
+            writer.writerow(["salvo", int(meta.salvo)])
+            writer.writerow(["opening_book", meta.opening_book])
+            writer.writerow(["fleet_library", meta.fleet_library])
+            writer.writerow(["fleet_layout", meta.fleet_layout])
+            writer.writerow(["fleet_transform", meta.fleet_transform])
+
+    def load(self) -> GameMeta:
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"Game meta file not found: {self.file_path}")
+
+        with self.file_path.open("r", newline="", encoding="utf-8") as file:
+            return self.read(file)
+
+    def read(self, file: TextIO) -> GameMeta:
+        """Parses game meta from an open CSV stream."""
+        values: Dict[str, str] = {row["key"]: row["value"] for row in csv.DictReader(file)}
+
+        return GameMeta(
+            game_id=values["game_id"],
+            bot_seed=int(values["bot_seed"]),
+            fleet_seed=int(values["fleet_seed"]),
+            ruleset=values.get("ruleset", "classic"),
+            board_size=int(values["board_size"]),
+            ship_sizes=[int(size) for size in values["ship_sizes"].split()],
+            allow_touching=values.get("allow_touching", "0") == "1",
+            salvo=values.get("salvo", "0") == "1",
+            opening_book=values.get("opening_book", ""),
+            fleet_library=values.get("fleet_library", ""),
+            fleet_layout=int(values.get("fleet_layout", 0)),
+            fleet_transform=int(values.get("fleet_transform", 0)),
+        )
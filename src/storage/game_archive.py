@@ -0,0 +1,206 @@
+import csv
+import io
+import lzma
+import os
+import re
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.domain import Fleet, GameMeta, GameState
+from src.ruleset import Ruleset
+from src.storage.csv_storage import (
+    CsvFleetRepository, CsvGameMetaRepository, CsvGameStateRepository, SparseCsvGameStateRepository,
+)
+
+# Codec name (also the segment file extension) -> (compress, decompress)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+# Files of one game, in the order they are packed
+GAME_FILES = ("game_meta.csv", "player_ships.csv", "bot_ships.csv", "game_state.csv")
+# Per file in a record: name length, data length (then the name and the data)
+_PART = struct.Struct("<HI")
+_SEGMENT_NAME = re.compile(r"segment-(\d{6})\.(\w+)$")
+_INDEX_HEADER = ["game_id", "offset", "length", "size"]
+
+
+@dataclass(slots=True)
+class IndexEntry:
+    """Where one game sits in a segment: compressed bytes [offset, offset + length), `size` once unpacked."""
+    game_id: str
+    offset: int
+    length: int
+    size: int
+
+
+@dataclass(slots=True)
+class ArchivedGame:
+    """One game unpacked from the archive: its CSV files, parsed on demand."""
+    game_id: str
+    files: Dict[str, bytes]
+
+    def meta(self) -> GameMeta:
+        return CsvGameMetaRepository("game_meta.csv").read(self._text("game_meta.csv"))
+
+    def player_fleet(self) -> Fleet:
+        return CsvFleetRepository("player_ships.csv").read(self._text("player_ships.csv"))
+
+    def bot_fleet(self) -> Fleet:
+        return CsvFleetRepository("bot_ships.csv").read(self._text("bot_ships.csv"))
+
+    def state(self) -> GameState:
+        ruleset = Ruleset.from_meta(self.meta())
+        repo_class = SparseCsvGameStateRepository if ruleset.sparse else CsvGameStateRepository
+        return repo_class("game_state.csv", board_size=ruleset.board_size).read(self._text("game_state.csv"))
+
+    def _text(self, name: str) -> io.StringIO:
+        if name not in self.files:
+            raise ValueError(f"Archived game {self.game_id} has no {name}")
+        return io.StringIO(self.files[name].decode("utf-8"), newline="")
+
+
+class GameArchive:
+    """
+    Append-only archive of finished game logs, rotated into compressed segments.
+
+    Directory layout:
+      segment-000001.zlib   records back to back, each compressed on its own
+      segment-000001.idx    CSV index: game_id,offset,length,size
+    - a record packs a game's files (GAME_FILES) as name/data parts, see _PART
+    - new games go to the newest segment until it reaches `segment_bytes`
+      (or was written with another codec), then a new segment is started
+    - a record is written and flushed before its index row, so a crash can leave
+      unindexed bytes at the end of a segment but never an index row without data
+    Readers only touch index rows and the records they need: read() unpacks one
+    game, iter_games() yields the games one at a time, so memory does not grow
+    with the archive. read() finds games through a game_id -> (segment, entry)
+    map built from the index files once per instance (and rebuilt on a miss, in
+    case another process archived the game since).
+    """
+
+    def __init__(self, directory: str | Path, codec: str = "zlib", segment_bytes: int = 4 << 20):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown archive codec: {codec} (expected one of {sorted(CODECS)})")
+        if segment_bytes < 1:
+            raise ValueError("segment_bytes must be >= 1")
+        self.directory = Path(directory)
+        self.codec = codec
+        self.segment_bytes = segment_bytes
+        self._locations: Optional[Dict[str, Tuple[Path, IndexEntry]]] = None
+
+    def segments(self) -> List[Path]:
+        """Segment files, oldest first."""
+        if not self.directory.exists():
+            return []
+        found = [(int(match.group(1)), path) for path in self.directory.iterdir()
+                 if (match := _SEGMENT_NAME.match(path.name)) and match.group(2) in CODECS]
+        return [path for _, path in sorted(found)]
+
+    def append(self, game_id: str, files: Dict[str, bytes]) -> bool:
+        """Archives one game; False when it already is in the newest segment (e.g. archived before a crash)."""
+        unknown = set(files) - set(GAME_FILES)
+        if unknown:
+            raise ValueError(f"Not a game file: {sorted(unknown)}")
+        segment = self._active_segment()
+        if any(entry.game_id == game_id for entry in self._index(segment)):
+            return False
+
+        raw = b"".join(_PART.pack(len(name), len(files[name])) + name.encode("ascii") + files[name]
+                       for name in GAME_FILES if name in files)
+        blob = CODECS[self.codec][0](raw)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with segment.open("ab") as file:
+            offset = file.seek(0, os.SEEK_END)
+            file.write(blob)
+            file.flush()
+            os.fsync(file.fileno())
+
+        index_path = segment.with_suffix(".idx")
+        new_index = not index_path.exists()
+        with index_path.open("a", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            if new_index:
+                writer.writerow(_INDEX_HEADER)
+            writer.writerow([game_id, offset, len(blob), len(raw)])
+        if self._locations is not None:
+            self._locations[game_id] = (segment, IndexEntry(game_id, offset, len(blob), len(raw)))
+        return True
+
+    def append_files(self, game_id: str, paths: Dict[str, Path]) -> bool:
+        """Archives a game from its files on disk; missing files are left out."""
+        return self.append(game_id, {name: path.read_bytes() for name, path in paths.items() if path.exists()})
+
+    def entries(self) -> Iterator[Tuple[Path, IndexEntry]]:
+        """(segment, entry) for every archived game, oldest first, streamed from the index files."""
+        for segment in self.segments():
+            for entry in self._index(segment):
+                yield segment, entry
+
+    def read(self, game_id: str) -> ArchivedGame:
+        """Unpacks one game, decompressing only its record (newest copy wins)."""
+        if self._locations is None or game_id not in self._locations:
+            # Later rows overwrite earlier ones: the newest copy wins
+            self._locations = {entry.game_id: (segment, entry) for segment, entry in self.entries()}
+        location = self._locations.get(game_id)
+        if location is None:
+            raise ValueError(f"Game {game_id} is not in the archive {self.directory}")
+        segment, entry = location
+        with segment.open("rb") as file:
+            return self._unpack(segment, file, entry)
+
+    def iter_games(self) -> Iterator[ArchivedGame]:
+        """Every archived game, oldest first; one record is held in memory at a time."""
+        for segment in self.segments():
+            with segment.open("rb") as file:
+                for entry in self._index(segment):
+                    yield self._unpack(segment, file, entry)
+
+    def _active_segment(self) -> Path:
+        segments = self.segments()
+        if segments:
+            newest = segments[-1]
+            if newest.suffix == f".{self.codec}" and newest.stat().st_size < self.segment_bytes:
+                return newest
+            number = int(_SEGMENT_NAME.match(newest.name).group(1)) + 1
+        else:
+            number = 1
+        return self.directory / f"segment-{number:06d}.{self.codec}"
+
+    @staticmethod
+    def _index(segment: Path) -> Iterator[IndexEntry]:
+        index_path = segment.with_suffix(".idx")
+        if not index_path.exists():
+            return
+        with index_path.open("r", newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                yield IndexEntry(row["game_id"], int(row["offset"]), int(row["length"]), int(row["size"]))
+
+    @staticmethod
+    def _unpack(segment: Path, file, entry: IndexEntry) -> ArchivedGame:
+        file.seek(entry.offset)
+        blob = file.read(entry.length)
+        if len(blob) != entry.length:
+            raise ValueError(f"Segment {segment} is truncated at game {entry.game_id}")
+        try:
+            raw = CODECS[segment.suffix[1:]][1](blob)
+        except (zlib.error, lzma.LZMAError) as e:
+            raise ValueError(f"Game {entry.game_id} in {segment} is corrupt: {e}") from e
+        if len(raw) != entry.size:
+            raise ValueError(f"Game {entry.game_id} in {segment} unpacked to {len(raw)} bytes, expected {entry.size}")
+
+        files: Dict[str, bytes] = {}
+        position = 0
+        while position + _PART.size <= len(raw):
+            name_length, data_length = _PART.unpack_from(raw, position)
+            position += _PART.size
+            name = raw[position:position + name_length].decode("ascii")
+            position += name_length
+            files[name] = raw[position:position + data_length]
+            position += data_length
+        if position != len(raw):
+            raise ValueError(f"Game {entry.game_id} in {segment} has a torn record")
+        return ArchivedGame(entry.game_id, files)
@@ -0,0 +1,91 @@
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Tuple
+
+from src.placement.prior import PlacementPrior
+from src.ruleset import Ruleset
+from src.storage.base import FleetRepository
+
+_MAGIC = b"SBPRIOR"
+_VERSION = 1
+# magic, version, board size, games, number of ship sizes
+_HEADER = struct.Struct("<7sBHIH")
+# ship size, number of placements (followed by that many little-endian uint32 counts)
+_SECTION = struct.Struct("<HI")
+
+# path -> ((mtime_ns, size), prior): one parsed copy per file for the whole process
+_CACHE: Dict[Path, Tuple[Tuple[int, int], PlacementPrior]] = {}
+
+
+class PlacementPriorStore:
+    """
+    Compact binary file for a PlacementPrior: a small header, then one section of
+    uint32 placement counts per ship size (about 2.3 KB for the classic fleet).
+
+    Loaded priors are cached in memory and reused while the file's mtime and size
+    are unchanged; saves are atomic (temp file + rename) and refresh the cache.
+    """
+
+    def __init__(self, file_path: str | Path):
+        self.file_path = Path(file_path)
+
+    def load(self, ruleset: Ruleset) -> PlacementPrior:
+        """The stored prior, or an empty one when nothing was recorded yet."""
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return PlacementPrior(ruleset)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = _CACHE.get(self.file_path)
+        if cached is not None and cached[0] == key and cached[1].ruleset == ruleset:
+            return cached[1]
+
+        prior = self._decode(self.file_path.read_bytes(), ruleset)
+        _CACHE[self.file_path] = (key, prior)
+        return prior
+
+    def save(self, prior: PlacementPrior) -> None:
+        blob = bytearray(_HEADER.pack(_MAGIC, _VERSION, prior.ruleset.board_size, prior.games, len(prior.counts)))
+        for size, counts in sorted(prior.counts.items()):
+            blob += _SECTION.pack(size, len(counts))
+            blob += struct.pack(f"<{len(counts)}I", *counts)
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.file_path.with_suffix(self.file_path.suffix + ".tmp")
+        tmp_path.write_bytes(blob)
+        os.replace(tmp_path, self.file_path)
+        stat = self.file_path.stat()
+        _CACHE[self.file_path] = ((stat.st_mtime_ns, stat.st_size), prior)
+
+    def record_game(self, fleet_repo: FleetRepository, ruleset: Ruleset) -> PlacementPrior:
+        """
+        Adds the opponent fleet of a finished game and saves the prior.
+        The fleet is recorded into a copy: the cached prior stays as it is on disk if the save fails.
+        """
+        cached = self.load(ruleset)
+        prior = PlacementPrior(ruleset, cached.counts, games=cached.games, smoothing=cached.smoothing)
+        prior.record(fleet_repo.load())
+        self.save(prior)
+        return prior
+
+    def _decode(self, raw: bytes, ruleset: Ruleset) -> PlacementPrior:
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"Truncated placement prior: {self.file_path}")
+        magic, version, board_size, games, sections = _HEADER.unpack_from(raw)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a placement prior file (or an unsupported version): {self.file_path}")
+        if board_size != ruleset.board_size:
+            raise ValueError(f"Placement prior {self.file_path} is for a {board_size}x{board_size} board")
+
+        counts: Dict[int, array] = {}
+        offset = _HEADER.size
+        for _ in range(sections):
+            size, length = _SECTION.unpack_from(raw, offset)
+            offset += _SECTION.size
+            counts[size] = array("I", struct.unpack_from(f"<{length}I", raw, offset))
+            offset += 4 * length
+        # Sizes that are not part of this ruleset's fleet are ignored
+        counts = {size: values for size, values in counts.items() if size in ruleset.ship_sizes}
+        return PlacementPrior(ruleset, counts, games=games)
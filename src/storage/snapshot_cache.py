@@ -0,0 +1,89 @@
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+_MAGIC = b"SBSNAP"
+_VERSION = 5
+
+# (mtime_ns, size, blake2b digest) per source file
+Fingerprint = Tuple[int, int, bytes]
+
+
+class ResumeSnapshotCache:
+    """
+    Compact binary cache of already validated fleets and the resumed game state.
+
+    The cache is keyed by the fingerprint of each source file:
+    - if mtime and size are unchanged, the cache is used without reading the sources;
+    - if only mtime changed, the sources are hashed and the cache is reused when
+      the content hash still matches.
+    Anything else is a miss and the caller falls back to the normal CSV path.
+    """
+
+    def __init__(self, cache_path: str | Path, sources: Sequence[str | Path]):
+        self.cache_path = Path(cache_path)
+        self.sources = [Path(p) for p in sources]
+
+    def load(self) -> Optional[Any]:
+        entry = self._read_entry()
+        if entry is None:
+            return None
+
+        cached_prints, payload = entry
+        if len(cached_prints) != len(self.sources):
+            return None
+
+        stale = False
+        for path, cached in zip(self.sources, cached_prints):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return None
+            if (stat.st_mtime_ns, stat.st_size) == cached[:2]:
+                continue
+            if stat.st_size != cached[1] or self._digest(path) != cached[2]:
+                return None
+            stale = True
+
+        if stale:
+            # Content is identical, only timestamps moved: refresh the key
+            self.save(payload)
+        return payload
+
+    def save(self, payload: Any) -> None:
+        prints: List[Fingerprint] = []
+        for path in self.sources:
+            stat = path.stat()
+            prints.append((stat.st_mtime_ns, stat.st_size, self._digest(path)))
+
+        blob = pickle.dumps((prints, payload), protocol=pickle.HIGHEST_PROTOCOL)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+        with tmp_path.open("wb") as file:
+            file.write(_MAGIC)
+            file.write(bytes([_VERSION]))
+            file.write(blob)
+        os.replace(tmp_path, self.cache_path)
+
+    def invalidate(self) -> None:
+        self.cache_path.unlink(missing_ok=True)
+
+    def _read_entry(self) -> Optional[Tuple[List[Fingerprint], Any]]:
+        try:
+            raw = self.cache_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        header_len = len(_MAGIC) + 1
+        if raw[:len(_MAGIC)] != _MAGIC or raw[len(_MAGIC):header_len] != bytes([_VERSION]):
+            return None
+        try:
+            return pickle.loads(raw[header_len:])
+        except Exception:
+            # Corrupted or written by an incompatible version of the code
+            return None
+
+    @staticmethod
+    def _digest(path: Path) -> bytes:
+        return hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Optional
 
 if TYPE_CHECKING:
     from src.domain import Coordinate, Fleet, GameState
@@ -9,7 +9,8 @@ class Renderer(ABC):
     """Output layer. Can be replaced with GUI/web/etc."""
 
     @abstractmethod
-    def render(self, state: "GameState", player_fleet: "Fleet") -> None:
+    def render(self, state: "GameState", player_fleet: "Fleet",
+               hints: Optional[Dict["Coordinate", float]] = None) -> None:
         raise NotImplementedError
 
 
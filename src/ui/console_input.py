@@ -1,17 +1,24 @@
 from src.domain import Coordinate
+from src.ruleset import CLASSIC, Ruleset
 from src.ui.base import InputProvider
 
 
 class ConsoleInputProvider(InputProvider):
     """
-    Accepts:
+    Accepts (classic board):
       - A1..J10
       - "row col" or "row,col" (1-10 or 0-9 supported)
+    Bounds and column letters follow the ruleset's board size.
     """
 
+    def __init__(self, ruleset: Ruleset = CLASSIC):
+        self.ruleset = ruleset
+
     def read_shot_coordinate(self) -> Coordinate:
+        labels = self.ruleset.column_labels()
+        example = f"A1, {labels[-1]}{self.ruleset.board_size}"
         while True:
-            raw = input("Enter shot (e.g. A1, J10, '3 4', '2,7'): ").strip()
+            raw = input(f"Enter shot (e.g. {example}, '3 4', '2,7'): ").strip()
             try:
                 return self._parse_coordinate(raw)
             except ValueError as e:
@@ -23,17 +30,7 @@ class ConsoleInputProvider(InputProvider):
             raise ValueError("Empty input")
 
         if s[0].isalpha():
-            col_letter = s[0]
-            if col_letter < "A" or col_letter > "J":
-                raise ValueError("Column must be A..J")
-            col = ord(col_letter) - ord("A")
-            num_part = s[1:].strip()
-            if not num_part.isdigit():
-                raise ValueError("Row number expected after letter (A1..J10)")
-            row_1_based = int(num_part)
-            if not (1 <= row_1_based <= 10):
-                raise ValueError("Row must be 1..10")
-            return Coordinate(row_1_based - 1, col)
+            return self.ruleset.parse_cell_label(s)
 
         parts = s.replace(",", " ").split()
         if len(parts) != 2:
@@ -41,8 +38,9 @@ class ConsoleInputProvider(InputProvider):
         r = int(parts[0])
         c = int(parts[1])
 
-        if 1 <= r <= 10 and 1 <= c <= 10:
+        size = self.ruleset.board_size
+        if 1 <= r <= size and 1 <= c <= size:
             return Coordinate(r - 1, c - 1)
-        if 0 <= r <= 9 and 0 <= c <= 9:
+        if 0 <= r <= size - 1 and 0 <= c <= size - 1:
             return Coordinate(r, c)
-        raise ValueError("Row/col must be 1..10 or 0..9")
+        raise ValueError(f"Row/col must be 1..{size} or 0..{size - 1}")
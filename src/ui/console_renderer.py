@@ -1,58 +1,157 @@
-from src.domain import Coordinate, Fleet, GameState, ShotOutcome
+from typing import Dict, Optional, Tuple
+
+from src.domain import Coordinate, Fleet, FogCell, GameState, ShotOutcome, moves_of
+from src.ruleset import CLASSIC, Ruleset
+
+# Heat-map shades for unknown enemy cells, coldest to hottest
+HEAT_SHADES = "0123456789"
+# Sparse boards: side of the window shown around the last shot on each board
+VIEWPORT = 15
 
 
 class ConsoleRenderer:
     """
-    Renders two 10x10 boards:
+    Renders two boards (10x10 on the classic ruleset):
     - Left: player's own board (ships visible + bot shots).
     - Right: player's fog-of-war view of the enemy board.
+    On sparse boards a frame is a summary plus a VIEWPORT x VIEWPORT window of each
+    board around its last shot, so rendering costs O(window + fleet), not O(board area).
     """
 
-    def render(self, state: GameState, player_fleet: Fleet) -> None:
+    def __init__(self, ruleset: Ruleset = CLASSIC):
+        self.ruleset = ruleset
+        width = max(len(label) for label in ruleset.column_labels())
+        self._header = "   " + " ".join(label.rjust(width) for label in ruleset.column_labels())
+        self._cell_width = width
+
+    def render(self, state: GameState, player_fleet: Fleet,
+               hints: Optional[Dict[Coordinate, float]] = None) -> None:
+        """hints: optional hit probabilities, drawn as a heat map over unknown enemy cells."""
+        print("\n".join(self.frame_lines(state, player_fleet, hints)))
+
+    def frame_lines(self, state: GameState, player_fleet: Fleet,
+                    hints: Optional[Dict[Coordinate, float]] = None) -> list[str]:
+        """The lines render() prints (for callers that send the frame elsewhere, e.g. to spectators)."""
+        if self.ruleset.sparse:
+            return self._sparse_frame_lines(state, player_fleet)
         own_lines = self._player_board_lines(state, player_fleet)
-        enemy_lines = self._enemy_board_lines(state)
+        enemy_lines = self._enemy_board_lines(state, hints)
 
         gap = "   "
-        print("\n" + "=" * 80)
-        print(f"Turn: {state.turn_number}")
-        print(f"{'YOUR BOARD':<36}{gap}{'ENEMY BOARD (FOG)':<36}")
-        print("=" * 80)
+        lines = ["", "=" * 80, f"Turn: {state.turn_number}", f"{'YOUR BOARD':<36}{gap}{'ENEMY BOARD (FOG)':<36}", "=" * 80]
+        lines.extend(f"{left}{gap}{right}" for left, right in zip(own_lines, enemy_lines))
 
-        for left, right in zip(own_lines, enemy_lines):
-            print(f"{left}{gap}{right}")
+        lines.extend(["", "Legend:", "  Your board: S=ship, X=hit ship, o=miss, .=unknown water",
+                      "  Enemy fog:  x=hit, o=miss, ?=unknown"])
+        if hints:
+            lines.append("  Heat map:   0..9 = relative chance of a ship on an unknown cell")
+        lines.extend(["=" * 80, ""])
+        return lines
 
-        print("\nLegend:")
-        print("  Your board: S=ship, X=hit ship, o=miss, .=unknown water")
-        print("  Enemy fog:  x=hit, o=miss, ?=unknown")
-        print("=" * 80 + "\n")
+    def render_heat_map(self, title: str, heat: Dict[Coordinate, float]) -> None:
+        """One board of HEAT_SHADES scaled to the hottest cell; cells missing from `heat` print as '.'."""
+        hottest = max(heat.values(), default=0.0)
+        print("\n" + title)
+        print(self._header)
+        for r in range(self.ruleset.board_size):
+            row_symbols: list[str] = []
+            for c in range(self.ruleset.board_size):
+                value = heat.get(self.ruleset.cell_at(r, c))
+                if value is None or hottest <= 0:
+                    row_symbols.append(".")
+                else:
+                    row_symbols.append(HEAT_SHADES[int(value / hottest * (len(HEAT_SHADES) - 1))])
+            print(self._row_line(r, row_symbols))
 
     def _player_board_lines(self, state: GameState, player_fleet: Fleet) -> list[str]:
         occupied = player_fleet.occupied_cells()
         lines: list[str] = []
-        lines.append("   " + " ".join(list("ABCDEFGHIJ")))
+        lines.append(self._header)
 
-        for r in range(10):
+        for r in range(self.ruleset.board_size):
             row_symbols: list[str] = []
-            for c in range(10):
-                cell = Coordinate(r, c)
+            for c in range(self.ruleset.board_size):
+                cell = self.ruleset.cell_at(r, c)
                 bot_mark = state.bot_view.shots.get(cell)
 
                 if cell in occupied:
                     row_symbols.append("X" if bot_mark in (ShotOutcome.HIT, ShotOutcome.SUNK) else "S")
                 else:
                     row_symbols.append("o" if bot_mark == ShotOutcome.MISS else ".")
-            lines.append(f"{r+1:>2} " + " ".join(row_symbols))
+            lines.append(self._row_line(r, row_symbols))
 
         return lines
 
-    def _enemy_board_lines(self, state: GameState) -> list[str]:
+    def _enemy_board_lines(self, state: GameState, hints: Optional[Dict[Coordinate, float]] = None) -> list[str]:
         lines: list[str] = []
-        lines.append("   " + " ".join(list("ABCDEFGHIJ")))
+        lines.append(self._header)
 
-        for r in range(10):
+        hottest = max(hints.values(), default=0.0) if hints else 0.0
+        for r in range(self.ruleset.board_size):
             row_symbols: list[str] = []
-            for c in range(10):
-                row_symbols.append(state.player_view.symbol_at(Coordinate(r, c)))
-            lines.append(f"{r+1:>2} " + " ".join(row_symbols))
+            for c in range(self.ruleset.board_size):
+                cell = self.ruleset.cell_at(r, c)
+                symbol = state.player_view.symbol_at(cell)
+                if hottest > 0 and symbol == FogCell.UNKNOWN.value and cell in hints:
+                    shade = int(hints[cell] / hottest * (len(HEAT_SHADES) - 1))
+                    symbol = HEAT_SHADES[shade]
+                row_symbols.append(symbol)
+            lines.append(self._row_line(r, row_symbols))
+
+        return lines
 
+    def _sparse_frame_lines(self, state: GameState, player_fleet: Fleet) -> list[str]:
+        size = self.ruleset.board_size
+        player_target = bot_target = Coordinate(0, 0)
+        if state.turn_history:
+            player_side, bot_side = state.turn_history[-1]
+            player_target = moves_of(player_side)[-1].target if moves_of(player_side) else player_target
+            bot_target = moves_of(bot_side)[-1].target if moves_of(bot_side) else bot_target
+
+        occupied = player_fleet.occupied_cells()
+        afloat = sum(1 for ship in player_fleet.ships
+                     if any(state.bot_view.shots.get(cell) not in (ShotOutcome.HIT, ShotOutcome.SUNK) for cell in ship.cells))
+        own_rows, own_cols = self._window(bot_target), self._window(bot_target, column=True)
+        enemy_rows, enemy_cols = self._window(player_target), self._window(player_target, column=True)
+
+        def own_symbol(cell: Coordinate) -> str:
+            bot_mark = state.bot_view.shots.get(cell)
+            if cell in occupied:
+                return "X" if bot_mark in (ShotOutcome.HIT, ShotOutcome.SUNK) else "S"
+            return "o" if bot_mark == ShotOutcome.MISS else "."
+
+        own_lines = self._window_lines(own_rows, own_cols, own_symbol)
+        enemy_lines = self._window_lines(enemy_rows, enemy_cols, state.player_view.symbol_at)
+        width = max(len(line) for line in own_lines)
+
+        lines = ["", "=" * 80, f"Turn: {state.turn_number}   Board: {size}x{size} (sparse, showing {VIEWPORT}x{VIEWPORT} windows)",
+                 f"Your fleet: {afloat} of {len(player_fleet.ships)} ships afloat, {len(state.bot_view.shots)} cells shot by the bot",
+                 f"Enemy fleet: {len(state.player_view.sunk_ships)} of {len(self.ruleset.ship_sizes)} ships sunk, "
+                 f"{len(state.player_view.shots)} cells revealed",
+                 f"{'YOUR BOARD near ' + self.ruleset.cell_label(bot_target):<{width}}   "
+                 f"ENEMY BOARD (FOG) near {self.ruleset.cell_label(player_target)}",
+                 "=" * 80]
+        lines.extend(f"{left:<{width}}   {right}" for left, right in zip(own_lines, enemy_lines))
+        lines.extend(["", "Legend:", "  Your board: S=ship, X=hit ship, o=miss, .=unknown water",
+                      "  Enemy fog:  x=hit, o=miss, ?=unknown", "=" * 80, ""])
         return lines
+
+    def _window(self, center: Coordinate, column: bool = False) -> range:
+        """VIEWPORT rows (or columns) around `center`, clamped to the board."""
+        size = self.ruleset.board_size
+        span = min(VIEWPORT, size)
+        start = min(max((center.col if column else center.row) - span // 2, 0), size - span)
+        return range(start, start + span)
+
+    def _window_lines(self, rows: range, cols: range, symbol_of) -> list[str]:
+        labels = self.ruleset.column_labels()
+        label_width = max(len(labels[c]) for c in cols)
+        row_width = len(str(rows[-1] + 1))
+        lines = [" " * (row_width + 1) + " ".join(labels[c].rjust(label_width) for c in cols)]
+        for r in rows:
+            symbols = (symbol_of(self.ruleset.cell_at(r, c)).rjust(label_width) for c in cols)
+            lines.append(f"{r + 1:>{row_width}} " + " ".join(symbols))
+        return lines
+
+    def _row_line(self, row: int, symbols: list[str]) -> str:
+        return f"{row+1:>2} " + " ".join(symbol.rjust(self._cell_width) for symbol in symbols)
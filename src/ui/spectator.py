@@ -0,0 +1,235 @@
+import asyncio
+import struct
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.domain import GameEvent, GameOver, ShotOutcome, fog_changes
+from src.engine.game_manager import GameManager
+from src.ui.console_renderer import ConsoleRenderer
+
+# Binary messages: byte length of the rest, kind, then the kind's fields
+HELLO, KEYFRAME, DELTA, GAME_OVER = 0, 1, 2, 3
+# Version 2: uint32 cell counts (uint16 overflowed on sparse boards) and the HELLO message
+PROTOCOL_VERSION = 2
+# length, kind, protocol version
+_HELLO = struct.Struct("<IBB")
+# length, kind, turn, player shot cells, bot shot cells, player ship cells (then that many _CELLs)
+_BOARD = struct.Struct("<IBIIII")
+# length, kind, turn, winner (0 = player, 1 = bot)
+_GAME_OVER = struct.Struct("<IBIB")
+# cell index (row * board_size + col), code
+_CELL = struct.Struct("<IB")
+_CODES = {ShotOutcome.MISS: 1, ShotOutcome.HIT: 2, ShotOutcome.SUNK: 3}
+SHIP = 4
+_WINNERS = {"player": 0, "bot": 1}
+_HELLO_BYTES = _HELLO.pack(_HELLO.size - 4, HELLO, PROTOCOL_VERSION)
+
+
+@dataclass(frozen=True, slots=True)
+class SpectatorFrame:
+    """One committed turn in binary form, encoded once and shared by every binary spectator."""
+    seq: int
+    turn: int
+    binary: bytes  # DELTA message (followed by a GAME_OVER message when the game ended)
+
+
+class SpectatorHub:
+    """
+    Live fan-out of one game to any number of asyncio spectators.
+
+    Each committed turn is encoded once, in the game's thread: the renderer's text
+    frame and a compact binary delta (only the fog cells the turn changed). The
+    frame is appended to a shared backlog of the last `backlog` turns and the
+    spectators are woken; every spectator task then writes the same immutable
+    bytes to its own stream. Publishing costs the same for one viewer or thousands.
+
+    - text spectators get the latest full frame (older frames are skipped, not queued)
+    - binary spectators get a HELLO and a KEYFRAME on joining (encoded once per turn, on demand), then every DELTA
+    - backpressure: a spectator waits for its writer to drain before sending more; one
+      that falls out of the backlog or does not drain within `drain_timeout` is dropped
+    """
+
+    def __init__(self, manager: GameManager, loop: asyncio.AbstractEventLoop, backlog: int = 64,
+                 drain_timeout: float = 5.0):
+        if backlog < 1:
+            raise ValueError("backlog must be >= 1")
+        self.manager = manager
+        self.loop = loop
+        self.drain_timeout = drain_timeout
+        self.renderer = None if manager.ruleset.sparse else ConsoleRenderer(manager.ruleset)
+        self.spectators = 0
+        self.dropped = 0
+        self._frames: Deque[SpectatorFrame] = deque(maxlen=backlog)
+        self._seq = 0
+        self._turn = manager.state.turn_number
+        self._wakeup = asyncio.Event()
+        self._final = manager.is_game_over().winner is not None
+        self._text = self._render_text()
+        self._keyframe: Optional[Tuple[int, bytes]] = None
+
+        # Keyframe mirror of both fog boards; only touched on the loop thread
+        size = manager.ruleset.board_size
+        self._fog: Dict[str, Dict[int, int]] = {
+            actor: {cell.row * size + cell.col: _CODES[outcome] for cell, outcome in view.shots.items()}
+            for actor, view in (("player", manager.state.player_view), ("bot", manager.state.bot_view))
+        }
+        self._ships = b"".join(_CELL.pack(cell.row * size + cell.col, SHIP)
+                               for ship in manager.player_fleet.ships for cell in ship.cells)
+        self._ship_count = len(self._ships) // _CELL.size
+        manager.events.subscribe_batch(self._on_turn)
+
+    @property
+    def finished(self) -> bool:
+        """True once the game-over frame was published (loop thread view)."""
+        return self._final
+
+    def close(self) -> None:
+        self.manager.events.unsubscribe(self._on_turn)
+
+    async def stream(self, writer: asyncio.StreamWriter, binary: bool) -> None:
+        """Sends the game to one spectator until it ends, the spectator is dropped or the stream breaks."""
+        if not binary and self.renderer is None:
+            writer.write(b"Text frames are not available on sparse boards; connect in binary mode.\n")
+            writer.close()
+            return
+
+        self.spectators += 1
+        seq = self._seq
+        try:
+            writer.write(_HELLO_BYTES + self._keyframe_bytes() if binary else self._text)
+            while not (self._final and seq == self._seq):
+                await asyncio.wait_for(writer.drain(), self.drain_timeout)
+                wakeup = self._wakeup
+                if seq == self._seq:
+                    await wakeup.wait()
+                    continue
+                if binary:
+                    frames = self._frames_after(seq)
+                    if frames is None:
+                        self.dropped += 1
+                        return
+                    writer.write(b"".join(frame.binary for frame in frames))
+                else:
+                    # Text frames are complete boards: a lagging viewer just skips to the latest
+                    writer.write(self._text)
+                seq = self._seq
+            await asyncio.wait_for(writer.drain(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+        except ConnectionError:
+            pass
+        finally:
+            self.spectators -= 1
+            writer.close()
+
+    def _on_turn(self, batch: List[GameEvent]) -> None:
+        # Game thread: encode once, then hand the frame to the loop
+        size = self.manager.ruleset.board_size
+        changes = tuple((actor, cell.row * size + cell.col, _CODES[outcome])
+                        for event in batch for actor, cell, outcome in fog_changes(event))
+        turn = self.manager.state.turn_number
+        player = [_CELL.pack(index, code) for actor, index, code in changes if actor == "player"]
+        bot = [_CELL.pack(index, code) for actor, index, code in changes if actor == "bot"]
+        body = b"".join(player + bot)
+        binary = _BOARD.pack(_BOARD.size - 4 + len(body), DELTA, turn, len(player), len(bot), 0) + body
+
+        text = self._render_text()
+        winner = next((event.winner for event in batch if isinstance(event, GameOver)), None)
+        if winner is not None:
+            binary += _GAME_OVER.pack(_GAME_OVER.size - 4, GAME_OVER, turn, _WINNERS[winner])
+            if text is not None:
+                text += f"Game over! Winner: {winner}\n".encode("utf-8")
+        self.loop.call_soon_threadsafe(self._append, turn, text, binary, changes, winner is not None)
+
+    def _append(self, turn: int, text: Optional[bytes], binary: bytes,
+                changes: Tuple[Tuple[str, int, int], ...], final: bool) -> None:
+        self._seq += 1
+        self._turn = turn
+        self._frames.append(SpectatorFrame(self._seq, turn, binary))
+        for actor, index, code in changes:
+            self._fog[actor][index] = code
+        if text is not None:
+            self._text = text
+        self._final = self._final or final
+        # Everyone waiting on the old event wakes up; later waiters get the new one
+        wakeup, self._wakeup = self._wakeup, asyncio.Event()
+        wakeup.set()
+
+    def _frames_after(self, seq: int) -> Optional[List[SpectatorFrame]]:
+        """Frames newer than `seq`, or None when some of them already left the backlog."""
+        if not self._frames or self._frames[0].seq > seq + 1:
+            return None
+        return [frame for frame in self._frames if frame.seq > seq]
+
+    def _keyframe_bytes(self) -> bytes:
+        if self._keyframe is not None and self._keyframe[0] == self._seq:
+            return self._keyframe[1]
+        player = b"".join(_CELL.pack(index, code) for index, code in self._fog["player"].items())
+        bot = b"".join(_CELL.pack(index, code) for index, code in self._fog["bot"].items())
+        body = player + bot + self._ships
+        blob = _BOARD.pack(_BOARD.size - 4 + len(body), KEYFRAME, self._turn, len(self._fog["player"]),
+                           len(self._fog["bot"]), self._ship_count) + body
+        self._keyframe = (self._seq, blob)
+        return blob
+
+    def _render_text(self) -> Optional[bytes]:
+        if self.renderer is None:
+            return None
+        return "\n".join(self.renderer.frame_lines(self.manager.state, self.manager.player_fleet)).encode("utf-8") + b"\n"
+
+
+class SpectatorServer:
+    """
+    TCP server for a SpectatorHub on its own event-loop thread, so a blocking game
+    loop (like the CLI) can be watched live. A client sends one line, "text" or
+    "binary", and then only reads.
+    """
+
+    def __init__(self, manager: GameManager, host: str = "127.0.0.1", port: int = 8765, backlog: int = 64,
+                 drain_timeout: float = 5.0):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.loop = asyncio.new_event_loop()
+        self.hub = SpectatorHub(manager, self.loop, backlog=backlog, drain_timeout=drain_timeout)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Returns once the server is listening (errors such as a busy port are raised here)."""
+        self._server = self.loop.run_until_complete(asyncio.start_server(self._serve, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._thread = threading.Thread(target=self.loop.run_forever, name="spectators", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Lets connected spectators receive what was published, then shuts the server down."""
+        if self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(timeout), self.loop).result(timeout + 1.0)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self.hub.close()
+        self._thread = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            mode = (await asyncio.wait_for(reader.readline(), self.hub.drain_timeout)).strip().lower()
+        except (asyncio.TimeoutError, ConnectionError):
+            writer.close()
+            return
+        await self.hub.stream(writer, binary=mode == b"binary")
+
+    async def _shutdown(self, timeout: float) -> None:
+        self._server.close()
+        # Spectators of a finished game leave once the last frame is written; the others are cut off
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout if self.hub.finished else 0)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self._server.wait_closed()
@@ -1,17 +1,19 @@
 from typing import List, Set
 
-from src.domain import Coordinate, Fleet, Ship, BOARD_SIZE
+from src.domain import Coordinate, Fleet, Ship
+from src.ruleset import CLASSIC, Ruleset
 
-REQUIRED_SIZES = [4, 3, 3, 2, 2, 2, 1, 1, 1, 1]
+REQUIRED_SIZES = list(CLASSIC.ship_sizes)
 
 
-def validate_fleet_or_raise(fleet: Fleet) -> None:
-    """Validates: sizes, inside board, straight/contiguous, no overlap, no adjacency (8-dir)."""
+def validate_fleet_or_raise(fleet: Fleet, ruleset: Ruleset = CLASSIC) -> None:
+    """Validates: sizes, inside board, straight/contiguous, no overlap, no adjacency (8-dir, unless the ruleset allows it)."""
     ships = fleet.ships
+    required = list(ruleset.ship_sizes)
 
     sizes = sorted([s.length for s in ships], reverse=True)
-    if sorted(sizes) != sorted(REQUIRED_SIZES):
-        raise ValueError(f"Invalid ship sizes: {sizes}. Required: {REQUIRED_SIZES}")
+    if sorted(sizes) != sorted(required):
+        raise ValueError(f"Invalid ship sizes: {sizes}. Required: {required}")
 
     occupied_cells: Set[Coordinate] = set()
     forbidden_cells: Set[Coordinate] = set()
@@ -20,7 +22,7 @@ def validate_fleet_or_raise(fleet: Fleet) -> None:
         _validate_ship_shape_or_raise(ship)
 
         for cell in ship.cells:
-            if not cell.is_inside(BOARD_SIZE):
+            if not ruleset.is_inside(cell):
                 raise ValueError(f"Ship cell out of bounds: {cell}")
             if cell in occupied_cells:
                 raise ValueError(f"Overlapping ships at: {cell}")
@@ -31,8 +33,8 @@ def validate_fleet_or_raise(fleet: Fleet) -> None:
             occupied_cells.add(cell)
 
         for cell in ship.cells:
-            for near in cell.neighbors_8():
-                if near.is_inside(BOARD_SIZE) and near not in occupied_cells:
+            for near in ruleset.exclusion_zone(cell):
+                if near not in occupied_cells:
                     forbidden_cells.add(near)
 
 
@@ -0,0 +1,71 @@
+from typing import Optional
+
+from src.domain import Coordinate, GameMeta
+from src.engine.bot_brain import BotBrain
+from src.engine.game_manager import GameManager
+from src.placement.bot_setup import RandomFleetGenerator
+from src.ruleset import CLASSIC, Ruleset
+
+
+def make_meta(ruleset: Ruleset = CLASSIC, bot_seed: int = 11, fleet_seed: int = 22, game_id: str = "g1") -> GameMeta:
+    return GameMeta(
+        game_id=game_id, bot_seed=bot_seed, fleet_seed=fleet_seed, ruleset=ruleset.name,
+        board_size=ruleset.board_size, ship_sizes=list(ruleset.ship_sizes),
+        allow_touching=ruleset.allow_touching, salvo=ruleset.salvo,
+    )
+
+
+def make_game(meta: GameMeta, ruleset: Ruleset = CLASSIC, player_seed: int = 5) -> GameManager:
+    return GameManager(
+        player_fleet=RandomFleetGenerator(seed=player_seed, ruleset=ruleset).generate(),
+        bot_fleet=RandomFleetGenerator(seed=meta.fleet_seed, ruleset=ruleset).generate(),
+        bot_brain=BotBrain(seed=meta.bot_seed, ruleset=ruleset),
+        ruleset=ruleset,
+    )
+
+
+def first_unshot(manager: GameManager) -> Coordinate:
+    """The player's scripted shot: the first unshot cell in row-major order."""
+    for cell in manager.ruleset.cells():
+        if not manager.state.player_view.has_been_shot(cell):
+            return cell
+    raise ValueError("Board is full")
+
+
+def play_turns(manager: GameManager, turns: int, state_repo=None) -> None:
+    """Plays up to `turns` single-shot turns (player shots from first_unshot), appending each to `state_repo`."""
+    for _ in range(turns):
+        if manager.is_game_over().winner is not None:
+            return
+        player_target = first_unshot(manager)
+        player_outcome = manager.apply_player_shot(player_target)
+        bot_target, bot_outcome = manager.apply_bot_shot()
+        manager.commit_turn(player_target, player_outcome, bot_target, bot_outcome)
+        if state_repo is not None:
+            state_repo.append_turn(manager.state)
+
+
+def play_salvo_turns(manager: GameManager, turns: int, state_repo=None) -> None:
+    for _ in range(turns):
+        if manager.is_game_over().winner is not None:
+            return
+        player_targets = []
+        for cell in manager.ruleset.cells():
+            if len(player_targets) == manager.salvo_size("player"):
+                break
+            if not manager.state.player_view.has_been_shot(cell):
+                player_targets.append(cell)
+        player_outcomes = manager.apply_shots(player_targets)
+        bot_shots = manager.apply_bot_salvo()
+        manager.commit_salvo_turn(list(zip(player_targets, player_outcomes)), bot_shots)
+        if state_repo is not None:
+            state_repo.append_turn(manager.state)
+
+
+def bot_only_shots(manager: GameManager, limit: Optional[int] = None) -> int:
+    """Bot shots until the player's fleet is sunk (or `limit`)."""
+    shots = 0
+    while manager.is_game_over().winner is None and (limit is None or shots < limit):
+        manager.apply_bot_shot()
+        shots += 1
+    return shots
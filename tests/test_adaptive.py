@@ -0,0 +1,57 @@
+import pytest
+
+from src.engine.adaptive_bot import AdaptiveBotBrain
+from src.engine.bot_brain import BotBrain
+from src.engine.game_manager import GameManager
+from src.placement.bot_setup import RandomFleetGenerator
+from src.placement.prior import PlacementPrior
+from src.ruleset import CLASSIC
+from src.storage import prior_store
+from src.storage.csv_storage import CsvFleetRepository
+from src.storage.prior_store import PlacementPriorStore
+from tests.support import bot_only_shots
+
+
+def test_prior_store_round_trip(tmp_path):
+    fleet_repo = CsvFleetRepository(tmp_path / "player_ships.csv")
+    fleet_repo.save(RandomFleetGenerator(seed=4).generate())
+    store = PlacementPriorStore(tmp_path / "prior.bin")
+
+    store.record_game(fleet_repo, CLASSIC)
+    prior = store.record_game(fleet_repo, CLASSIC)
+    assert prior.games == 2
+    assert sum(prior.counts[4]) == 2 and sum(prior.counts[1]) == 8
+
+    reloaded = PlacementPriorStore(tmp_path / "prior.bin")._decode((tmp_path / "prior.bin").read_bytes(), CLASSIC)
+    assert reloaded.games == 2 and reloaded.counts == prior.counts
+
+
+def test_adaptive_bot_exploits_a_predictable_opponent():
+    fleet = RandomFleetGenerator(seed=9).generate()
+    prior = PlacementPrior(CLASSIC)
+    for _ in range(30):
+        prior.record(fleet)
+
+    def mean_shots(make_brain):
+        shots = [bot_only_shots(GameManager(fleet, fleet, bot_brain=make_brain(seed))) for seed in range(5)]
+        return sum(shots) / len(shots)
+
+    adaptive = mean_shots(lambda seed: AdaptiveBotBrain(prior, seed=seed))
+    standard = mean_shots(lambda seed: BotBrain(seed=seed))
+    assert adaptive < standard - 10
+
+
+def test_a_failed_save_leaves_the_loaded_prior_alone(tmp_path, monkeypatch):
+    fleet_repo = CsvFleetRepository(tmp_path / "player_ships.csv")
+    fleet_repo.save(RandomFleetGenerator(seed=4).generate())
+    store = PlacementPriorStore(tmp_path / "prior.bin")
+    store.record_game(fleet_repo, CLASSIC)
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(prior_store.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        store.record_game(fleet_repo, CLASSIC)
+    assert store.load(CLASSIC).games == 1
+    assert sum(store.load(CLASSIC).counts[4]) == 1
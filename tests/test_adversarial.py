@@ -0,0 +1,40 @@
+from src.domain import ScoredFleet
+from src.placement.adversarial import AdversarialPlacementSearch
+from src.placement.bot_setup import LibraryFleetGenerator, RandomFleetGenerator
+from src.storage.csv_storage import CsvGameMetaRepository
+from tests.support import make_meta
+
+
+def test_library_fleet_is_rebuilt_from_the_recorded_pick(tmp_path):
+    layouts = [ScoredFleet(fleet=RandomFleetGenerator(seed=seed).generate(), score=40.0 + seed) for seed in range(5)]
+    generator = LibraryFleetGenerator(layouts, seed=3)
+    fleet = generator.generate()
+
+    meta = make_meta()
+    meta.fleet_library = generator.library_id
+    meta.fleet_layout, meta.fleet_transform = generator.last_pick
+    repo = CsvGameMetaRepository(tmp_path / "game_meta.csv")
+    repo.save(meta)
+    loaded = repo.load()
+    assert loaded == meta
+
+    rebuilt = LibraryFleetGenerator(layouts)
+    assert rebuilt.library_id == loaded.fleet_library
+    assert rebuilt.fleet_for(loaded.fleet_layout, loaded.fleet_transform) == fleet
+    assert LibraryFleetGenerator(layouts[:4]).library_id != generator.library_id
+
+
+def test_every_step_is_scored_on_fresh_games_and_the_result_on_held_out_ones():
+    search = AdversarialPlacementSearch(panel=("bot",), trials=2, neighbours=2, seed=1, workers=1)
+    seen = []
+    evaluate = search.evaluate
+
+    def recording(fleets, pool=None, seeds=None):
+        seen.append((len(fleets), tuple(seeds)))
+        return evaluate(fleets, pool, seeds)
+
+    search.evaluate = recording
+    search.search(iterations=3)
+
+    assert [count for count, _ in seen] == [3, 3, 3, 1]
+    assert len({seeds for _, seeds in seen}) == 4
@@ -0,0 +1,102 @@
+import pytest
+
+import main
+from src.storage.csv_storage import CsvFleetRepository, CsvGameMetaRepository, CsvGameStateRepository
+from src.storage.game_archive import GAME_FILES, GameArchive
+from tests.support import bot_only_shots, make_game, make_meta, play_turns
+
+
+def saved_game(directory, game_id, turns=12):
+    """A played game's files, written the way main.py writes them."""
+    directory.mkdir(parents=True, exist_ok=True)
+    meta = make_meta(game_id=game_id)
+    manager = make_game(meta)
+    paths = {name: directory / name for name in GAME_FILES}
+    CsvGameMetaRepository(paths["game_meta.csv"]).save(meta)
+    CsvFleetRepository(paths["player_ships.csv"]).save(manager.player_fleet)
+    CsvFleetRepository(paths["bot_ships.csv"]).save(manager.bot_fleet)
+    state_repo = CsvGameStateRepository(paths["game_state.csv"])
+    state_repo.init_new(manager.state)
+    play_turns(manager, turns, state_repo)
+    return manager, paths
+
+
+def test_games_round_trip_through_read_and_iteration(tmp_path):
+    archive = GameArchive(tmp_path / "archive")
+    first, first_paths = saved_game(tmp_path / "g1", "g1")
+    second, second_paths = saved_game(tmp_path / "g2", "g2", turns=20)
+    assert archive.append_files("g1", first_paths)
+    assert archive.append_files("g2", second_paths)
+    assert not archive.append_files("g2", second_paths)
+
+    game = archive.read("g1")
+    assert game.meta().game_id == "g1"
+    assert game.state().turn_history == first.state.turn_history
+    assert [ship.cell_set() for ship in game.bot_fleet().ships] == [ship.cell_set() for ship in first.bot_fleet.ships]
+    assert [(game.game_id, game.state().turn_number) for game in archive.iter_games()] == [("g1", 12), ("g2", 20)]
+    with pytest.raises(ValueError):
+        archive.read("nope")
+
+
+def test_segments_rotate_by_size_and_codec(tmp_path):
+    _, paths = saved_game(tmp_path / "g", "g")
+    GameArchive(tmp_path / "archive", segment_bytes=1).append_files("a", paths)
+    GameArchive(tmp_path / "archive", segment_bytes=1).append_files("b", paths)
+    GameArchive(tmp_path / "archive", codec="lzma").append_files("c", paths)
+
+    archive = GameArchive(tmp_path / "archive")
+    assert [path.name for path in archive.segments()] == [
+        "segment-000001.zlib", "segment-000002.zlib", "segment-000003.lzma"]
+    assert [game.game_id for game in archive.iter_games()] == ["a", "b", "c"]
+    assert archive.read("c").meta().game_id == "g"
+
+
+def test_torn_records_are_reported(tmp_path):
+    _, paths = saved_game(tmp_path / "g", "g")
+    archive = GameArchive(tmp_path / "archive")
+    archive.append_files("g", paths)
+    segment = archive.segments()[0]
+    data = segment.read_bytes()
+
+    segment.write_bytes(data[:len(data) // 2])
+    with pytest.raises(ValueError, match="truncated"):
+        archive.read("g")
+    segment.write_bytes(data[:10] + bytes(len(data) - 10))
+    with pytest.raises(ValueError, match="corrupt"):
+        archive.read("g")
+
+
+def test_a_game_is_archived_when_it_ends_with_its_own_files(tmp_path, monkeypatch):
+    manager, paths = saved_game(tmp_path, "g1")
+    monkeypatch.setattr(main, "ARCHIVE_DIR", tmp_path / "archive")
+    for constant, name in (("GAME_META", "game_meta.csv"), ("PLAYER_SHIPS", "player_ships.csv"),
+                           ("BOT_SHIPS", "bot_ships.csv"), ("GAME_STATE", "game_state.csv")):
+        monkeypatch.setattr(main, constant, paths[name])
+    meta = CsvGameMetaRepository(paths["game_meta.csv"]).load()
+
+    main.archive_finished_game(manager, meta, "zlib")
+    assert GameArchive(tmp_path / "archive").segments() == []
+
+    bot_only_shots(manager)
+    main.archive_finished_game(manager, meta, "zlib")
+    archived = GameArchive(tmp_path / "archive").read("g1")
+    assert archived.files["player_ships.csv"] == paths["player_ships.csv"].read_bytes()
+
+
+def test_lookups_read_the_index_files_once(tmp_path, monkeypatch):
+    writer = GameArchive(tmp_path / "archive", segment_bytes=1)
+    for game_id in ("g1", "g2", "g3"):
+        writer.append_files(game_id, saved_game(tmp_path / game_id, game_id, turns=3)[1])
+
+    reads = []
+    index = GameArchive._index
+    monkeypatch.setattr(GameArchive, "_index", staticmethod(lambda segment: reads.append(segment) or index(segment)))
+    archive = GameArchive(tmp_path / "archive")
+    assert [archive.read(game_id).game_id for game_id in ("g3", "g1", "g2", "g1")] == ["g3", "g1", "g2", "g1"]
+    assert len(reads) == 3
+
+    # Games archived by another instance are found after one more pass
+    writer.append_files("g4", saved_game(tmp_path / "g4", "g4", turns=3)[1])
+    reads.clear()
+    assert archive.read("g4").game_id == "g4" and archive.read("g2").game_id == "g2"
+    assert len(reads) == 4
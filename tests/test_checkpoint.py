@@ -0,0 +1,44 @@
+import pytest
+
+from src.simulation.batch import SimulationBatch
+from src.simulation.checkpoint import CheckpointStore
+
+
+class Interrupted(Exception):
+    pass
+
+
+def stop_after(game_id: int):
+    def on_game(played: int, shots: int) -> None:
+        if played == game_id:
+            raise Interrupted
+    return on_game
+
+
+def test_an_interrupted_batch_resumes_to_the_same_stats(tmp_path):
+    expected = SimulationBatch(games=25, seed=7).run()
+
+    path = tmp_path / "batch.ckpt"
+    batch = SimulationBatch(games=25, seed=7, checkpoint_path=path, checkpoint_every=10)
+    with pytest.raises(Interrupted):
+        batch.run(on_game=stop_after(14))
+    saved = CheckpointStore(path).load()
+    assert saved.next_game == 10 and saved.stats.games == 10
+
+    played = []
+    stats = batch.run(on_game=lambda game_id, shots: played.append(game_id))
+    assert played == list(range(10, 25))
+    assert stats == expected
+    assert CheckpointStore(path).load().next_game == 25
+
+
+def test_a_checkpoint_only_resumes_its_own_batch(tmp_path):
+    path = tmp_path / "batch.ckpt"
+    SimulationBatch(games=3, seed=1, checkpoint_path=path).run()
+    with pytest.raises(ValueError, match="different batch"):
+        SimulationBatch(games=3, seed=2, checkpoint_path=path).run()
+
+    path.write_bytes(path.read_bytes()[:100])
+    with pytest.raises(ValueError, match="Truncated"):
+        CheckpointStore(path).load()
+    assert CheckpointStore(tmp_path / "missing.ckpt").load() is None
@@ -0,0 +1,30 @@
+from src.domain import FogBoard, GameState, Move, ShotOutcome, TurnHistory, coordinate_table
+from src.ruleset import LARGE
+
+
+def test_turn_history_round_trips_with_interned_cells():
+    table = coordinate_table(LARGE.board_size)
+    salvo = (Move("player", table.at(999, 0), ShotOutcome.HIT), Move("player", table.at(3, 999), ShotOutcome.SUNK))
+    turns = [(salvo, Move("bot", table.at(500, 7), ShotOutcome.MISS)),
+             (Move("player", table.at(0, 0), ShotOutcome.MISS), Move("bot", table.at(999, 999), ShotOutcome.HIT))]
+    history = TurnHistory(turns, size=LARGE.board_size)
+
+    assert history == turns and list(history) == turns
+    assert history[0][0][1].target is table.at(3, 999)
+    assert history[-1][1].target is table.at(999, 999)
+    del history[1:]
+    assert list(history) == turns[:1]
+
+
+def test_game_state_packs_its_history_for_its_board_size():
+    state = GameState(player_view=FogBoard(size=LARGE.board_size), bot_view=FogBoard(size=LARGE.board_size))
+    assert state.turn_history.size == LARGE.board_size
+
+
+def test_neighbours_are_interned_and_stay_on_the_board():
+    table = coordinate_table(10)
+    corner = table.at(0, 0)
+    assert table.neighbors_4(corner) == (table.at(1, 0), table.at(0, 1))
+    assert table.neighbors_8(corner) == (table.at(0, 1), table.at(1, 0), table.at(1, 1))
+    assert all(near is table.at(near.row, near.col) for near in table.neighbors_8(table.at(5, 5)))
+    assert len(table.neighbors_8(table.at(5, 5))) == 8
@@ -0,0 +1,80 @@
+from src.domain import FogBoard
+from src.engine.endgame import EndgameSolver
+from src.engine.placements import consistent_configurations, remaining_ship_sizes
+from src.ruleset import CLASSIC, Ruleset
+from tests.support import make_game, make_meta
+
+TINY = Ruleset(name="tiny", board_size=4, ship_sizes=(2,))
+
+
+def copy_view(view: FogBoard) -> FogBoard:
+    return FogBoard(size=view.size, shots=dict(view.shots), sunk_ships=list(view.sunk_ships))
+
+
+def test_single_hit_is_followed_up_next_to_it():
+    view = FogBoard(size=4)
+    view.set_hit(TINY.cell_at(1, 1))
+    shot = EndgameSolver(TINY).best_shot(view)
+    assert shot in {TINY.cell_at(0, 1), TINY.cell_at(2, 1), TINY.cell_at(1, 0), TINY.cell_at(1, 2)}
+
+
+def test_answers_do_not_depend_on_what_the_cache_holds():
+    answered = []
+    for seed in range(4):
+        manager = make_game(make_meta(bot_seed=seed, fleet_seed=seed), player_seed=seed)
+        solver = EndgameSolver(manager.ruleset)
+        while manager.is_game_over().winner is None:
+            view = manager.state.bot_view
+            shot = solver.best_shot(view)
+            if shot is not None:
+                assert not view.has_been_shot(shot)
+                answered.append((copy_view(view), shot))
+            manager.apply_bot_shot()
+    assert len(answered) > 5
+
+    # Cold cache, positions asked in the opposite order
+    EndgameSolver._cache.clear()
+    fresh = EndgameSolver(CLASSIC)
+    assert [fresh.best_shot(view) for view, _ in reversed(answered)] == [shot for _, shot in reversed(answered)]
+
+
+def test_positions_with_many_open_cells_are_left_to_the_heuristics():
+    view = FogBoard(size=4)
+    view.set_hit(TINY.cell_at(1, 1))
+    assert EndgameSolver(TINY, max_open_cells=3).best_shot(view) is None
+    assert EndgameSolver(TINY, max_open_cells=4).best_shot(view) is not None
+
+
+def test_a_warm_cache_does_not_skip_the_budget_gate():
+    positions = []
+    for seed in range(4):
+        manager = make_game(make_meta(bot_seed=seed, fleet_seed=seed), player_seed=seed)
+        while manager.is_game_over().winner is None:
+            positions.append(copy_view(manager.state.bot_view))
+            manager.apply_bot_shot()
+
+    def configurations(view):
+        remaining = remaining_ship_sizes(view, CLASSIC.ship_sizes)
+        return len(consistent_configurations(view, remaining, CLASSIC, limit=12))
+
+    # A position that blows a small budget, and a larger one that fits in it
+    budget = 100
+    blown, solvable = [], []
+    for view in positions:
+        EndgameSolver._cache.clear()
+        solver = EndgameSolver(CLASSIC, node_budget=budget)
+        if solver.best_shot(view) is not None:
+            solvable.append(view)
+        elif solver._failed_at is not None:
+            blown.append((solver._failed_at, view))
+    failed_at, first = min(blown, key=lambda item: item[0])
+    second = next(view for view in solvable if configurations(view) >= failed_at)
+
+    def play(warm: bool):
+        EndgameSolver._cache.clear()
+        if warm:
+            EndgameSolver(CLASSIC, node_budget=budget).best_shot(second)
+        solver = EndgameSolver(CLASSIC, node_budget=budget)
+        return [solver.best_shot(first), solver.best_shot(second)]
+
+    assert play(warm=False) == play(warm=True) == [None, None]
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from src.domain import GameOver, ShipSunk, ShotFired, ShotOutcome, TurnCommitted, fog_changes
+from src.storage.csv_storage import CsvGameStateRepository
+from tests.support import make_game, make_meta, play_turns
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_batches_arrive_once_per_committed_turn():
+    manager = make_game(make_meta())
+    batches = []
+    manager.events.subscribe_batch(batches.append)
+    play_turns(manager, 3)
+
+    assert len(batches) == 3
+    for turn, batch in enumerate(batches, start=1):
+        committed = [event for event in batch if isinstance(event, TurnCommitted)]
+        assert [event.turn_number for event in committed] == [turn]
+        assert sum(isinstance(event, ShotFired) for event in batch) == 2
+
+
+def test_branches_are_muted_and_game_over_is_published():
+    manager = make_game(make_meta())
+    seen = []
+    manager.events.subscribe(seen.append)
+    with manager.branch():
+        play_turns(manager, 2)
+    assert seen == [] and manager.state.turn_number == 0
+
+    # Sink the bot fleet: the last batch ends with GameOver
+    for ship in manager.bot_fleet.ships:
+        for cell in ship.cells:
+            if manager.is_game_over().winner is not None:
+                break
+            outcome = manager.apply_player_shot(cell)
+            bot_target, bot_outcome = manager.apply_bot_shot()
+            manager.commit_turn(cell, outcome, bot_target, bot_outcome)
+    assert isinstance(seen[-1], GameOver) and seen[-1].winner == "player"
+
+    sunk = [event for event in seen if isinstance(event, ShipSunk) and event.actor == "player"]
+    assert len(sunk) == len(manager.bot_fleet.ships)
+    changes = fog_changes(sunk[0])
+    assert {cell for _, cell, outcome in changes if outcome == ShotOutcome.SUNK} == set(sunk[0].cells)
+
+
+def test_followed_log_matches_a_log_encoded_from_the_state(tmp_path):
+    manager = make_game(make_meta())
+    followed = CsvGameStateRepository(tmp_path / "followed.csv")
+    plain = CsvGameStateRepository(tmp_path / "plain.csv")
+    followed.init_new(manager.state)
+    plain.init_new(manager.state)
+    followed.follow(manager.events, manager.state)
+    for _ in range(15):
+        play_turns(manager, 1, followed)
+        plain.append_turn(manager.state)
+    assert (tmp_path / "followed.csv").read_text() == (tmp_path / "plain.csv").read_text()
+
+
+def test_storage_does_not_import_the_engine():
+    code = ("import sys, src.storage.csv_storage, src.storage.prior_store, src.storage.game_archive; "
+            "print(sorted(name for name in sys.modules if name.startswith('src.engine')))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,85 @@
+import builtins
+import os
+
+import pytest
+
+import main
+from src.gameplay import run_cli_game
+from src.storage.csv_storage import CsvFleetRepository, CsvGameMetaRepository, CsvGameStateRepository
+from src.storage.snapshot_cache import ResumeSnapshotCache
+from tests.support import first_unshot, make_game, make_meta, play_turns
+
+
+def test_snapshot_round_trip_and_invalidation(tmp_path):
+    source = tmp_path / "game_state.csv"
+    source.write_text("turn\n1\n")
+    cache = ResumeSnapshotCache(tmp_path / "resume.snapshot", [source])
+
+    cache.save({"turns": 1})
+    assert cache.load() == {"turns": 1}
+
+    # Same content, new mtime: still a hit
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    assert cache.load() == {"turns": 1}
+
+    source.write_text("turn\n1\n2\n")
+    assert cache.load() is None
+
+
+def test_snapshot_is_refreshed_only_after_a_persisted_turn(tmp_path, monkeypatch):
+    manager = make_game(make_meta())
+    repo = CsvGameStateRepository(tmp_path / "game_state.csv")
+    repo.init_new(manager.state)
+
+    answers = iter(["A1"])
+
+    def fake_input(prompt=""):
+        try:
+            return next(answers)
+        except StopIteration:
+            raise EOFError from None
+
+    monkeypatch.setattr(builtins, "input", fake_input)
+    saved = []
+    with pytest.raises(EOFError):
+        run_cli_game(manager, state_repo=repo, resume=False,
+                     on_turn_saved=lambda m: saved.append((m.state.turn_number, len(repo.load().turn_history))))
+
+    assert saved == [(1, 1)]
+
+
+def test_writer_snapshots_every_few_turns_and_on_a_clean_exit(monkeypatch):
+    saved = []
+    monkeypatch.setattr(main, "save_resume_snapshot", lambda manager: saved.append(manager.state.turn_number))
+    manager = make_game(make_meta())
+    writer = main.ResumeSnapshotWriter(every=3)
+    for _ in range(7):
+        play_turns(manager, 1)
+        writer.turn_saved(manager)
+    assert saved == [3, 6]
+    writer.close(manager)
+    assert saved == [3, 6, 7]
+
+    # Interrupted after the player's shot: nothing past turn 8 is on disk
+    play_turns(manager, 1)
+    writer.turn_saved(manager)
+    manager.apply_player_shot(first_unshot(manager))
+    writer.close(manager)
+    assert saved == [3, 6, 7]
+
+
+def test_a_changed_meta_invalidates_the_snapshot(tmp_path, monkeypatch):
+    for name in ("GAME_META", "PLAYER_SHIPS", "BOT_SHIPS", "GAME_STATE", "RESUME_CACHE"):
+        monkeypatch.setattr(main, name, tmp_path / getattr(main, name).name)
+    meta = make_meta()
+    manager = make_game(meta)
+    CsvGameMetaRepository(main.GAME_META).save(meta)
+    CsvFleetRepository(main.PLAYER_SHIPS).save(manager.player_fleet)
+    CsvFleetRepository(main.BOT_SHIPS).save(manager.bot_fleet)
+    CsvGameStateRepository(main.GAME_STATE).init_new(manager.state)
+
+    main.save_resume_snapshot(manager)
+    assert main.resume_snapshot_cache().load() is not None
+    CsvGameMetaRepository(main.GAME_META).save(make_meta(bot_seed=meta.bot_seed + 1))
+    assert main.resume_snapshot_cache().load() is None
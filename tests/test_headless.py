@@ -0,0 +1,39 @@
+import io
+import json
+
+from src.headless import JsonlSession
+
+
+def session_lines(*requests):
+    output = io.StringIO()
+    session = JsonlSession(output)
+    for request in requests:
+        session.handle(json.dumps(request))
+    return session, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_a_shot_answers_with_the_fog_delta_of_both_sides():
+    session, lines = session_lines({"cmd": "new", "seed": 7}, {"cmd": "shoot", "target": [0, 0]})
+    assert lines[0]["event"] == "new" and lines[0]["board_size"] == 10
+    delta = lines[1]
+    assert delta["event"] == "delta" and delta["turn"] == 1
+    assert delta["player"][0][:2] == [0, 0]
+    bot_target = session.manager.state.turn_history[0][1].target
+    assert delta["bot"][0][:2] == [bot_target.row, bot_target.col]
+
+
+def test_malformed_requests_are_errors_and_leave_the_game_unchanged():
+    session, lines = session_lines(
+        {"cmd": "new", "seed": 7},
+        {"cmd": "shoot", "target": [True, 1]},
+        {"cmd": "shoot", "target": [1]},
+        {"cmd": "shoot"},
+        {"cmd": "new", "fleet": 5},
+        {"cmd": "new", "fleet": [[[0, 0]], 3]},
+        {"cmd": "new", "seed": "x"},
+    )
+    errors = lines[1:]
+    assert [line["event"] for line in errors] == ["error"] * 6
+    assert "[true, 1]" in errors[0]["message"]
+    assert errors[3]["message"].startswith("Fleet must be a list of ships")
+    assert session.manager.state.turn_number == 0
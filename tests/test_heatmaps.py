@@ -0,0 +1,66 @@
+import pytest
+
+from src.domain import ShotOutcome, moves_of
+from src.ruleset import CLASSIC
+from tests.support import make_game, make_meta, play_turns
+
+np = pytest.importorskip("numpy")
+
+from src.analytics.heatmaps import MAP_NAMES, HeatMapAggregator, HeatMaps  # noqa: E402
+
+
+def played_games(count: int):
+    games = []
+    for seed in range(count):
+        manager = make_game(make_meta(bot_seed=seed, fleet_seed=seed + 100), player_seed=seed)
+        play_turns(manager, 100)
+        games.append((list(manager.state.turn_history), manager))
+    return games
+
+
+def aggregate(games, batch_size: int = 65_536) -> HeatMaps:
+    aggregator = HeatMapAggregator(CLASSIC, batch_size=batch_size)
+    for turns, manager in games:
+        aggregator.add_fleet(manager.player_fleet)
+        aggregator.add_game(turns, manager.player_fleet)
+    return aggregator.result()
+
+
+def test_counters_match_the_games():
+    games = played_games(4)
+    maps = aggregate(games)
+    assert (maps.fleets, maps.games) == (4, 4)
+    assert maps.maps["occupancy"].sum() == 4 * CLASSIC.fleet_cells
+    assert maps.maps["first_hit"].sum() == 4
+
+    bot_moves = [move for turns, _ in games for _, bot_side in turns for move in moves_of(bot_side)]
+    assert maps.maps["misses"].sum() == sum(move.outcome == ShotOutcome.MISS for move in bot_moves)
+    sunk_cells = sum(
+        len(ship.cells) for _, manager in games for ship in manager.player_fleet.ships
+        if all(manager.state.bot_view.has_been_shot(cell) for cell in ship.cells)
+    )
+    assert maps.maps["sunk_count"].sum() == sunk_cells
+    mean = maps.mean_sunk_turn()
+    assert np.nanmin(mean) >= 1 and np.nanmax(mean) <= 100
+
+
+def test_batching_and_merging_do_not_change_the_result(tmp_path):
+    games = played_games(4)
+    whole = aggregate(games)
+    assert all((aggregate(games, batch_size=7).maps[name] == whole.maps[name]).all() for name in MAP_NAMES)
+
+    merged = HeatMaps.merged([aggregate(games[:1]), aggregate(games[1:])])
+    assert (merged.fleets, merged.games) == (whole.fleets, whole.games)
+    assert all((merged.maps[name] == whole.maps[name]).all() for name in MAP_NAMES)
+
+    whole.save(tmp_path / "maps.npz")
+    loaded = HeatMaps.load(tmp_path / "maps.npz")
+    assert loaded.board_size == CLASSIC.board_size and loaded.games == 4
+    assert loaded.cells("occupancy") == whole.cells("occupancy")
+
+
+def test_maps_of_other_boards_are_rejected():
+    with pytest.raises(ValueError):
+        HeatMaps(10).merge(HeatMaps(12))
+    with pytest.raises(ValueError):
+        HeatMaps(10, {"occupancy": np.zeros(99, dtype=np.int64)})
@@ -0,0 +1,45 @@
+import pytest
+
+from src.domain import FogBoard
+from src.engine.hints import ShotHinter, shared_hinter
+from src.ruleset import CLASSIC, LARGE
+from tests.support import make_game, make_meta, play_turns
+
+
+def test_hints_rank_unshot_cells_by_probability():
+    manager = make_game(make_meta())
+    play_turns(manager, 12)
+    view = manager.state.player_view
+    hints = manager.suggest_player_shots(5)
+
+    assert len(hints) == 5
+    assert all(not view.has_been_shot(hint.cell) and 0 < hint.probability <= 1 for hint in hints)
+    assert [hint.probability for hint in hints] == sorted((hint.probability for hint in hints), reverse=True)
+    heat = manager.player_heat_map()
+    assert set(heat) == {cell for cell in CLASSIC.cells() if not view.has_been_shot(cell)}
+    assert hints[0].probability == max(heat.values())
+
+
+def test_an_open_hit_points_the_hint_at_its_neighbours():
+    view = FogBoard(size=CLASSIC.board_size)
+    view.set_hit(CLASSIC.cell_at(4, 4))
+    best = ShotHinter(CLASSIC).suggest(view, k=1)[0].cell
+    assert abs(best.row - 4) + abs(best.col - 4) == 1
+
+
+def test_rankings_are_cached_per_position():
+    hinter = ShotHinter(CLASSIC)
+    view = FogBoard(size=CLASSIC.board_size)
+    view.set_miss(CLASSIC.cell_at(0, 0))
+    first = hinter.suggest(view)
+    assert hinter.suggest(FogBoard(size=view.size, shots=dict(view.shots))) == first
+    assert len(hinter._cache) == 1
+    view.set_miss(CLASSIC.cell_at(9, 9))
+    hinter.suggest(view)
+    assert len(hinter._cache) == 2
+    assert shared_hinter(CLASSIC) is shared_hinter(CLASSIC)
+
+
+def test_sparse_boards_have_no_hints():
+    with pytest.raises(ValueError, match="sparse"):
+        ShotHinter(LARGE)
@@ -0,0 +1,42 @@
+import random
+
+from src.domain import FogBoard
+from src.engine.hunt_index import HuntIndex
+from src.ruleset import BATTLESHIP
+
+
+def drain(index: HuntIndex, view: FogBoard):
+    drawn = []
+    while (cell := index.sample(view)) is not None:
+        drawn.append(cell)
+        view.set_miss(cell)
+        index.remove(cell)
+    return drawn
+
+
+def test_hunt_draws_each_lattice_cell_once():
+    view = FogBoard(size=BATTLESHIP.board_size)
+    index = HuntIndex(BATTLESHIP, random.Random(4))
+    drawn = drain(index, view)
+    shortest = min(BATTLESHIP.ship_sizes)
+    assert len(drawn) == len(set(drawn)) == BATTLESHIP.board_size ** 2 // shortest
+    assert {(cell.row + cell.col) % shortest for cell in drawn} == {index.offset}
+
+
+def test_sinking_the_last_short_ship_thins_the_lattice():
+    view = FogBoard(size=BATTLESHIP.board_size)
+    index = HuntIndex(BATTLESHIP, random.Random(4))
+    first = index.sample(view)
+    shortest = min(BATTLESHIP.ship_sizes)
+    for _ in range(BATTLESHIP.ship_sizes.count(shortest)):
+        index.sunk(shortest)
+    # Cells shot without the index being told are skipped as well
+    view.set_miss(first)
+
+    drawn = drain(index, view)
+    assert index.length == min(size for size in BATTLESHIP.ship_sizes if size != shortest)
+    assert first not in drawn
+    assert all((cell.row + cell.col) % index.length == index.offset for cell in drawn)
+    restored = HuntIndex(BATTLESHIP, random.Random(4))
+    restored.load(index.save())
+    assert restored.sample(view) is None
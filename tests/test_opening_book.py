@@ -0,0 +1,55 @@
+import pytest
+
+import main
+from src.domain import FogBoard
+from src.engine.bot_brain import BotBrain
+from src.engine.opening_book import OpeningBook, OpeningBookBuilder
+from src.engine.replay import ReplayEngine
+from src.ruleset import CLASSIC
+from tests.support import make_game, make_meta, play_turns
+
+
+def write_book(path, depth=3):
+    entries, max_cells = OpeningBookBuilder(CLASSIC, depth=depth, max_entries=200).build()
+    OpeningBook.write(path, CLASSIC, entries, depth=depth, max_cells=max_cells)
+    return OpeningBook.open(path, CLASSIC)
+
+
+def test_book_answers_opening_boards_and_the_bot_plays_them(tmp_path):
+    book = write_book(tmp_path / "book.bin")
+    options = book.lookup(FogBoard())
+    assert options
+    brain = BotBrain(seed=1, opening_book=book)
+    assert brain.choose_next_shot(FogBoard()) in options
+
+
+def test_replay_refuses_to_verify_and_otherwise_ignores_another_book(tmp_path):
+    book = write_book(tmp_path / "book.bin")
+    other = write_book(tmp_path / "other.bin", depth=2)
+    assert other.book_id != book.book_id
+
+    meta = make_meta()
+    meta.opening_book = book.book_id
+    manager = make_game(meta)
+    manager.bot_brain.opening_book = book
+    play_turns(manager, 10)
+    turns = manager.state.turn_history
+
+    assert ReplayEngine(meta, manager.player_fleet, manager.bot_fleet, turns, verify=True,
+                        opening_book=book).seek(10).turn_number == 10
+    with pytest.raises(ValueError, match="not available to verify"):
+        ReplayEngine(meta, manager.player_fleet, manager.bot_fleet, turns, verify=True, opening_book=other)
+    engine = ReplayEngine(meta, manager.player_fleet, manager.bot_fleet, turns, opening_book=other)
+    assert engine.manager.bot_brain.opening_book is None
+
+
+def test_resume_only_uses_the_recorded_book(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "DATA_DIR", tmp_path)
+    book = write_book(main.opening_book_path(CLASSIC))
+    meta = make_meta()
+    assert main.recorded_opening_book(meta, CLASSIC) is None
+
+    meta.opening_book = book.book_id
+    assert main.recorded_opening_book(meta, CLASSIC).book_id == book.book_id
+    meta.opening_book = "0123456789abcdef"
+    assert main.recorded_opening_book(meta, CLASSIC) is None
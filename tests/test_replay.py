@@ -0,0 +1,66 @@
+import pytest
+
+import main
+from src.domain import Move
+from src.engine.bot_brain import BotBrain
+from src.engine.replay import ReplayEngine
+from src.ruleset import CLASSIC
+from src.storage.csv_storage import CsvFleetRepository, CsvGameMetaRepository, CsvGameStateRepository
+from tests.support import make_game, make_meta, play_turns
+
+
+def test_seek_and_step_rebuild_recorded_boards():
+    meta = make_meta()
+    manager = make_game(meta)
+    boards = {}
+    for turn in range(1, 31):
+        play_turns(manager, 1)
+        boards[turn] = (manager.state.player_view.encode_100(), manager.state.bot_view.encode_100())
+
+    engine = ReplayEngine(meta, manager.player_fleet, manager.bot_fleet, manager.state.turn_history,
+                          snapshot_every=8, verify=True)
+    for turn in (30, 9, 17, 1):
+        state = engine.seek(turn)
+        assert (state.player_view.encode_100(), state.bot_view.encode_100()) == boards[turn]
+    engine.seek(20)
+    state = engine.step_back()
+    assert state.turn_number == 19
+    assert (state.player_view.encode_100(), state.bot_view.encode_100()) == boards[19]
+
+
+def test_verify_detects_a_diverging_record():
+    meta = make_meta()
+    manager = make_game(meta)
+    play_turns(manager, 10)
+    turns = list(manager.state.turn_history)
+    player_move, bot_move = turns[4]
+    other = next(cell for cell in CLASSIC.cells() if cell != bot_move.target
+                 and not any(t[1].target == cell for t in turns))
+    turns[4] = (player_move, Move("bot", other, bot_move.outcome))
+
+    engine = ReplayEngine(meta, manager.player_fleet, manager.bot_fleet, turns, verify=True)
+    with pytest.raises(ValueError, match="diverged at turn 5"):
+        engine.seek(10)
+
+
+def test_resumed_game_stays_reproducible(tmp_path):
+    meta = make_meta()
+    manager = make_game(meta)
+    player_repo = CsvFleetRepository(tmp_path / "player_ships.csv")
+    bot_repo = CsvFleetRepository(tmp_path / "bot_ships.csv")
+    state_repo = CsvGameStateRepository(tmp_path / "game_state.csv")
+    player_repo.save(manager.player_fleet)
+    bot_repo.save(manager.bot_fleet)
+    state_repo.init_new(manager.state)
+    play_turns(manager, 20, state_repo)
+
+    # Resume the way main.py does: a brain seeded from the meta, fast-forwarded through the record
+    resumed = main.load_resumed_game(meta, player_repo, bot_repo, state_repo, CLASSIC,
+                                     BotBrain(seed=meta.bot_seed), fast_start=False)
+    assert resumed.bot_brain.rng.getstate() == manager.bot_brain.rng.getstate()
+    play_turns(resumed, 20, state_repo)
+
+    meta_repo = CsvGameMetaRepository(tmp_path / "game_meta.csv")
+    meta_repo.save(meta)
+    engine = ReplayEngine.from_repositories(meta_repo, player_repo, bot_repo, state_repo, verify=True)
+    assert engine.seek(40).turn_number == 40
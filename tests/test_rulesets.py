@@ -0,0 +1,101 @@
+import pytest
+
+from src.domain import Fleet, FogBoard, ShotOutcome, Ship
+from src.engine.bot_brain import BotBrain
+from src.engine.game_manager import GameManager
+from src.engine.placements import remaining_ship_sizes, sunk_ship_sizes
+from src.placement.bot_setup import RandomFleetGenerator
+from src.ruleset import BATTLESHIP, CLASSIC, Ruleset, get_ruleset
+from src.validators.fleet_validator import validate_fleet_or_raise
+from tests.support import bot_only_shots, make_meta
+
+TOUCHING = Ruleset(name="touching", board_size=6, ship_sizes=(3, 2), allow_touching=True)
+
+
+def touching_fleet() -> Fleet:
+    # A 3-ship on row 0 and a 2-ship right below it
+    cell = TOUCHING.cell_at
+    return Fleet(ships=[Ship([cell(0, 0), cell(0, 1), cell(0, 2)]), Ship([cell(1, 0), cell(1, 1)])])
+
+
+def test_placement_tables_are_cached_per_ruleset():
+    assert len(CLASSIC.placements(4)) == 2 * 10 * 7
+    assert CLASSIC.placements(4) is CLASSIC.placements(4)
+    assert Ruleset.from_meta(make_meta(BATTLESHIP)) is BATTLESHIP
+    with pytest.raises(ValueError):
+        get_ruleset("nope")
+
+
+def test_touching_rule_is_enforced_by_the_validator():
+    validate_fleet_or_raise(touching_fleet(), TOUCHING)
+    strict = Ruleset(name="strict", board_size=6, ship_sizes=(3, 2))
+    with pytest.raises(ValueError):
+        validate_fleet_or_raise(touching_fleet(), strict)
+
+
+def test_touching_sunk_ships_are_counted_separately():
+    fleet = touching_fleet()
+    manager = GameManager(fleet, fleet, bot_brain=BotBrain(seed=1, ruleset=TOUCHING), ruleset=TOUCHING)
+    for ship in fleet.ships:
+        for cell in ship.cells:
+            manager.apply_bot_shot(cell)
+
+    view = manager.state.bot_view
+    assert sorted(sunk_ship_sizes(view)) == [2, 3]
+    assert remaining_ship_sizes(view, TOUCHING.ship_sizes) == []
+    # Boards without ship records (decoded from a file) fall back to connected SUNK cells
+    decoded = FogBoard(size=6, shots=dict(view.shots))
+    assert sunk_ship_sizes(decoded) == [5]
+
+
+def test_bot_keeps_hunting_hits_on_a_touching_ship_after_a_sink():
+    fleet = touching_fleet()
+    brain = BotBrain(seed=1, ruleset=TOUCHING)
+    manager = GameManager(fleet, fleet, bot_brain=brain, ruleset=TOUCHING)
+    cell = TOUCHING.cell_at
+    manager.apply_bot_shot(cell(1, 0))  # hit on the 2-ship
+    for target in (cell(0, 0), cell(0, 1)):
+        assert manager.apply_bot_shot(target)[1] == ShotOutcome.HIT
+    assert manager.apply_bot_shot(cell(0, 2))[1] == ShotOutcome.SUNK
+
+    assert [cluster.hit_cells for cluster in brain.clusters] == [[cell(1, 0)]]
+    assert manager.choose_bot_target() in {cell(1, 1), cell(2, 0)}
+
+
+def test_touching_wrecks_still_thin_the_hunt_lattice():
+    ruleset = Ruleset(name="touching-pairs", board_size=6, ship_sizes=(3, 2, 2), allow_touching=True)
+    cell = ruleset.cell_at
+    fleet = Fleet(ships=[Ship([cell(0, 0), cell(0, 1)]), Ship([cell(1, 0), cell(1, 1)]),
+                         Ship([cell(4, 0), cell(4, 1), cell(4, 2)])])
+    brain = BotBrain(seed=1, ruleset=ruleset)
+    manager = GameManager(fleet, fleet, bot_brain=brain, ruleset=ruleset)
+    for ship in fleet.ships[:2]:
+        for target in ship.cells:
+            manager.apply_bot_shot(target)
+
+    # Both 2-ships are gone although their wrecks form one 2x2 block
+    assert brain.hunt.remaining == [3]
+
+
+def test_salvo_hits_on_two_ships_are_targeted_separately():
+    fleet = touching_fleet()
+    brain = BotBrain(seed=1, ruleset=TOUCHING)
+    manager = GameManager(fleet, fleet, bot_brain=brain, ruleset=TOUCHING)
+    cell = TOUCHING.cell_at
+    # One salvo hits the 3-ship twice and the 2-ship once
+    for target in (cell(0, 1), cell(0, 2), cell(1, 1)):
+        assert manager.apply_bot_shot(target)[1] == ShotOutcome.HIT
+    assert sorted(cluster.axis or "" for cluster in brain.clusters) == ["", "h"]
+
+    assert manager.apply_bot_shot(cell(0, 0))[1] == ShotOutcome.SUNK
+    assert [cluster.hit_cells for cluster in brain.clusters] == [[cell(1, 1)]]
+    assert set(brain.choose_salvo(manager.state.bot_view, 3)) == {cell(1, 0), cell(2, 1), cell(1, 2)}
+
+
+def test_battleship_games_do_not_degenerate_into_full_board_sweeps():
+    shots = []
+    for seed in range(30):
+        fleet = RandomFleetGenerator(seed=seed, ruleset=BATTLESHIP).generate()
+        manager = GameManager(fleet, fleet, bot_brain=BotBrain(seed=seed, ruleset=BATTLESHIP), ruleset=BATTLESHIP)
+        shots.append(bot_only_shots(manager))
+    assert max(shots) < 80
@@ -0,0 +1,50 @@
+import pytest
+
+from src.domain import ShotOutcome
+from src.engine.replay import ReplayEngine
+from src.ruleset import SALVO
+from src.storage.csv_storage import CsvGameStateRepository
+from tests.support import make_game, make_meta, play_salvo_turns
+
+
+def test_a_salvo_that_finishes_a_ship_reports_sunk_on_the_last_hit():
+    manager = make_game(make_meta(SALVO), SALVO)
+    ship = min(manager.bot_fleet.ships, key=lambda ship: len(ship.cells))
+    other = next(ship for ship in manager.bot_fleet.ships if len(ship.cells) >= 3)
+    assert manager.salvo_size("player") == len(manager.player_fleet.ships)
+    assert manager.salvo_size("bot") == len(manager.bot_fleet.ships)
+
+    targets = [other.cells[0]] + list(ship.cells)
+    outcomes = manager.apply_shots(targets)
+    assert outcomes == [ShotOutcome.HIT] * len(ship.cells) + [ShotOutcome.SUNK]
+    assert manager.salvo_size("bot") == len(manager.bot_fleet.ships) - 1
+
+
+def test_invalid_salvos_are_rejected():
+    manager = make_game(make_meta(SALVO), SALVO)
+    cells = list(SALVO.cells())
+    with pytest.raises(ValueError, match="Too many shots"):
+        manager.apply_shots(cells[:manager.salvo_size("player") + 1])
+    with pytest.raises(ValueError, match="same cell twice"):
+        manager.apply_shots([cells[0], cells[0]])
+    manager.apply_shots([cells[0]])
+    with pytest.raises(ValueError, match="already shot"):
+        manager.apply_shots([cells[0], cells[1]])
+
+
+def test_salvo_games_round_trip_and_replay(tmp_path):
+    meta = make_meta(SALVO)
+    manager = make_game(meta, SALVO)
+    repo = CsvGameStateRepository(tmp_path / "game_state.csv")
+    repo.init_new(manager.state)
+    play_salvo_turns(manager, 200, repo)
+    assert manager.is_game_over().winner is not None
+    turns = manager.state.turn_number
+    assert any(len(bot_side) > 1 for _, bot_side in manager.state.turn_history)
+
+    loaded = repo.load()
+    assert list(loaded.turn_history) == list(manager.state.turn_history)
+    engine = ReplayEngine(meta, manager.player_fleet, manager.bot_fleet, loaded.turn_history, verify=True)
+    state = engine.seek(turns)
+    assert state.player_view.shots == manager.state.player_view.shots
+    assert state.bot_view.shots == manager.state.bot_view.shots
@@ -0,0 +1,35 @@
+import pytest
+
+from src.placement.bot_setup import RandomFleetGenerator
+from src.ruleset import BATTLESHIP, CLASSIC
+from src.simulation.batch import SimulationBatch
+from src.simulation.shared_pool import SharedGamePool
+
+
+def ship_cells(fleet):
+    return sorted(sorted(ship.cells) for ship in fleet.ships)
+
+
+def test_pool_slots_round_trip_through_an_attached_view():
+    fleets = [RandomFleetGenerator(seed=seed).generate() for seed in range(3)]
+    with SharedGamePool(CLASSIC, capacity=3) as pool:
+        for slot, fleet in enumerate(fleets):
+            pool.put(slot, fleet, bot_seed=1000 + slot)
+        with SharedGamePool.attach(pool.name, CLASSIC, 3) as attached:
+            for slot, fleet in enumerate(fleets):
+                assert ship_cells(attached.fleet(slot)) == ship_cells(fleet)
+                assert attached.bot_seed(slot) == 1000 + slot
+                attached.set_result(slot, 40 + slot)
+        assert pool.results(3) == [40, 41, 42]
+        with pytest.raises(ValueError, match="ship sizes"):
+            pool.put(0, RandomFleetGenerator(seed=1, ruleset=BATTLESHIP).generate(), 0)
+    pool.unlink()
+
+
+def test_parallel_batch_matches_a_serial_one():
+    serial = SimulationBatch(games=12, seed=3, checkpoint_every=5).run()
+    played = []
+    parallel = SimulationBatch(games=12, seed=3, checkpoint_every=5, workers=2).run(
+        on_game=lambda game_id, shots: played.append(game_id))
+    assert parallel == serial
+    assert played == list(range(12))
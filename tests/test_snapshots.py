@@ -0,0 +1,53 @@
+import copy
+
+import pytest
+
+from tests.support import make_game, make_meta, play_turns
+
+
+def observable(manager):
+    state = manager.state
+    return (
+        state.turn_number, list(state.turn_history),
+        dict(state.player_view.shots), dict(state.bot_view.shots),
+        list(state.player_view.sunk_ships), list(state.bot_view.sunk_ships),
+        set(manager.player_hits_on_bot), set(manager.bot_hits_on_player),
+        manager.bot_brain.rng.getstate(),
+    )
+
+
+def test_restore_undoes_every_change_since_the_snapshot():
+    manager = make_game(make_meta())
+    play_turns(manager, 15)
+    before = observable(manager)
+    reference = copy.deepcopy(manager)
+
+    snapshot = manager.snapshot()
+    play_turns(manager, 40)  # sinks ships on both sides
+    assert manager.state.player_view.sunk_ships != before[4]
+    manager.restore(snapshot)
+    manager.release(snapshot)
+    assert observable(manager) == before
+
+    # The restored game plays on exactly like an untouched copy
+    play_turns(manager, 30)
+    play_turns(reference, 30)
+    assert observable(manager) == observable(reference)
+
+
+def test_nested_branches_roll_back_in_order():
+    manager = make_game(make_meta())
+    play_turns(manager, 5)
+    outer_start = observable(manager)
+    outer = manager.snapshot()
+    play_turns(manager, 5)
+    inner_start = observable(manager)
+    with manager.branch():
+        play_turns(manager, 10)
+    assert observable(manager) == inner_start
+
+    manager.restore(outer)
+    manager.release(outer)
+    assert observable(manager) == outer_start
+    with pytest.raises(ValueError):
+        manager.release(outer)
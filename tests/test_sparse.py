@@ -0,0 +1,57 @@
+import random
+
+from src.domain import FogBoard
+from src.engine.bot_brain import BotBrain
+from src.engine.game_manager import GameManager
+from src.engine.sampling import UnshotSampler
+from src.placement.bot_setup import RandomFleetGenerator
+from src.ruleset import LARGE, Ruleset
+from src.storage.csv_storage import SparseCsvGameStateRepository
+from src.ui.console_renderer import VIEWPORT, ConsoleRenderer
+
+MEDIUM = Ruleset(name="medium", board_size=80, ship_sizes=(4, 3, 3, 2, 2, 2, 1, 1, 1, 1))
+
+
+def test_sampler_draws_every_unshot_cell_once():
+    view = FogBoard(size=4)
+    view.set_miss(MEDIUM.cell_at(0, 0))
+    sampler = UnshotSampler(4, random.Random(1))
+    drawn = []
+    while (cell := sampler.sample(view)) is not None:
+        drawn.append(cell)
+        view.set_miss(cell)
+    assert len(drawn) == 15 and len(set(drawn)) == 15
+
+
+def test_sparse_log_round_trip(tmp_path):
+    fleet = RandomFleetGenerator(seed=3, ruleset=MEDIUM).generate()
+    manager = GameManager(fleet, fleet, bot_brain=BotBrain(seed=3, ruleset=MEDIUM), ruleset=MEDIUM)
+    repo = SparseCsvGameStateRepository(tmp_path / "game_state.csv", board_size=MEDIUM.board_size)
+    repo.init_new(manager.state)
+    repo.follow(manager.events, manager.state)
+    for ship in fleet.ships[:4]:
+        for cell in ship.cells:
+            outcome = manager.apply_player_shot(cell)
+            bot_target, bot_outcome = manager.apply_bot_shot()
+            manager.commit_turn(cell, outcome, bot_target, bot_outcome)
+            repo.append_turn(manager.state)
+
+    loaded = repo.load()
+    assert loaded.turn_number == manager.state.turn_number
+    assert loaded.player_view.shots == manager.state.player_view.shots
+    assert loaded.bot_view.shots == manager.state.bot_view.shots
+
+
+def test_large_board_frame_shows_windows_not_the_whole_board():
+    fleet = RandomFleetGenerator(seed=1, ruleset=LARGE).generate()
+    manager = GameManager(fleet, fleet, bot_brain=BotBrain(seed=1, ruleset=LARGE), ruleset=LARGE)
+    target = LARGE.cell_at(500, 500)
+    outcome = manager.apply_player_shot(target)
+    bot_target, bot_outcome = manager.apply_bot_shot()
+    manager.commit_turn(target, outcome, bot_target, bot_outcome)
+
+    lines = ConsoleRenderer(LARGE).frame_lines(manager.state, fleet)
+    board_rows = [line for line in lines if line.strip()[:1].isdigit()]
+    assert len(board_rows) == VIEWPORT
+    assert any("near " + LARGE.cell_label(target) in line for line in lines)
+    assert "200 of 200 ships afloat" in "\n".join(lines)
@@ -0,0 +1,152 @@
+import asyncio
+import socket
+import struct
+import time
+
+from src.domain import ShotOutcome
+from src.engine.bot_brain import BotBrain
+from src.engine.game_manager import GameManager
+from src.placement.bot_setup import RandomFleetGenerator
+from src.ruleset import LARGE
+from src.ui.spectator import (DELTA, GAME_OVER, HELLO, KEYFRAME, PROTOCOL_VERSION, SHIP, SpectatorHub,
+                              SpectatorServer)
+from tests.support import make_game, make_meta, play_turns
+
+BOARD = struct.Struct("<IBIIII")
+CELL = struct.Struct("<IB")
+CODES = {ShotOutcome.MISS: 1, ShotOutcome.HIT: 2, ShotOutcome.SUNK: 3}
+
+
+def decode(stream: bytes):
+    """Replays a binary spectator stream into (fog per actor, ship cells, kinds seen, winner)."""
+    fog = {"player": {}, "bot": {}}
+    ships, kinds, winner = set(), [], None
+    offset = 0
+    while offset < len(stream):
+        length, kind = struct.unpack_from("<IB", stream, offset)
+        kinds.append(kind)
+        if kind == HELLO:
+            assert stream[offset + 5] == PROTOCOL_VERSION
+        elif kind == GAME_OVER:
+            winner = ("player", "bot")[struct.unpack_from("<IBIB", stream, offset)[3]]
+        else:
+            _, _, _, player, bot, ship_count = BOARD.unpack_from(stream, offset)
+            cells = offset + BOARD.size
+            for position in range(player + bot + ship_count):
+                index, code = CELL.unpack_from(stream, cells + CELL.size * position)
+                if code == SHIP:
+                    ships.add(index)
+                else:
+                    fog["player" if position < player else "bot"][index] = code
+        offset += 4 + length
+    return fog, ships, kinds, winner
+
+
+def fog_of(view):
+    return {cell.row * view.size + cell.col: CODES[outcome] for cell, outcome in view.shots.items()}
+
+
+def test_a_binary_spectator_joining_mid_game_sees_the_whole_game():
+    manager = make_game(make_meta())
+    play_turns(manager, 5)
+    server = SpectatorServer(manager, port=0)
+    server.start()
+    client = socket.create_connection(("127.0.0.1", server.port))
+    client.sendall(b"binary\n")
+    deadline = time.monotonic() + 5
+    while server.hub.spectators == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    play_turns(manager, 200)
+    server.stop()
+    received = b""
+    while chunk := client.recv(65536):
+        received += chunk
+    client.close()
+
+    fog, ships, kinds, winner = decode(received)
+    assert kinds[:2] == [HELLO, KEYFRAME] and kinds[-1] == GAME_OVER
+    assert kinds.count(DELTA) == manager.state.turn_number - 5
+    assert fog == {"player": fog_of(manager.state.player_view), "bot": fog_of(manager.state.bot_view)}
+    assert len(ships) == sum(len(ship.cells) for ship in manager.player_fleet.ships)
+    assert winner == manager.is_game_over().winner
+
+
+class Collector:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class StalledWriter:
+    def __init__(self):
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        pass
+
+    async def drain(self) -> None:
+        await asyncio.sleep(3600)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_spectators_that_do_not_drain_are_dropped():
+    async def scenario():
+        manager = make_game(make_meta())
+        hub = SpectatorHub(manager, asyncio.get_running_loop(), drain_timeout=0.05)
+        writer = StalledWriter()
+        await asyncio.wait_for(hub.stream(writer, binary=True), 1.0)
+        hub.close()
+        return hub, writer
+
+    hub, writer = asyncio.run(scenario())
+    assert hub.dropped == 1 and hub.spectators == 0 and writer.closed
+
+
+def test_spectators_that_fall_out_of_the_backlog_are_dropped():
+    async def scenario():
+        manager = make_game(make_meta())
+        hub = SpectatorHub(manager, asyncio.get_running_loop(), backlog=2)
+        task = asyncio.create_task(hub.stream(Collector(), binary=True))
+        await asyncio.sleep(0)
+        # Several turns land before the spectator runs again
+        play_turns(manager, 4)
+        await asyncio.wait_for(task, 1.0)
+        hub.close()
+        return hub
+
+    hub = asyncio.run(scenario())
+    assert hub.dropped == 1
+
+
+def test_keyframes_of_boards_with_more_than_65535_shots():
+    fleet = RandomFleetGenerator(seed=1, ruleset=LARGE).generate()
+    manager = GameManager(fleet, fleet, bot_brain=BotBrain(seed=1, ruleset=LARGE), ruleset=LARGE)
+    view = manager.state.player_view
+    for index in range(70_000):
+        view.set_miss(LARGE.cell_at(index // LARGE.board_size, index % LARGE.board_size))
+
+    async def scenario():
+        hub = SpectatorHub(manager, asyncio.get_running_loop())
+        writer = Collector()
+        task = asyncio.create_task(hub.stream(writer, binary=True))
+        # Let the spectator get past its first drain and wait for a turn
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        hub.close()
+        return writer.data
+
+    fog, ships, kinds, _ = decode(asyncio.run(scenario()))
+    assert kinds == [HELLO, KEYFRAME]
+    assert len(fog["player"]) == 70_000 and set(fog["player"].values()) == {1}
+    assert len(ships) == LARGE.fleet_cells